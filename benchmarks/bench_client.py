@@ -0,0 +1,211 @@
+"""
+Measure throughput, latency and memory of the API client against the local fake PSP.
+
+Run with `python -m benchmarks.bench_client`; see `--help` for the options. Save the results with `--output` and pass
+them as `--baseline` to a later run to fail on regressions beyond `--tolerance`.
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+import tracemalloc
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+from typing import Dict
+from typing import List
+
+from benchmarks.fake_psp import FakePsp
+from ginger_sdk import Ginger
+from ginger_sdk.api_client import ApiClient
+from ginger_sdk.api_client import HttpRequestError
+from ginger_sdk.api_client import ServerError
+
+ORDER_ID = 'fcbfdd3a-ea2c-4240-96b2-613d49b79a55'
+ORDER_DATA = {'amount': 995, 'currency': 'EUR', 'description': 'Benchmark order'}
+
+OPERATIONS: Dict[str, Callable] = {
+    'get_order': lambda client: client.get_order(ORDER_ID),
+    'create_order': lambda client: client.create_order(ORDER_DATA),
+    'get_ideal_issuers': lambda client: client.get_ideal_issuers(),
+}
+
+
+def percentile(latencies: List[float], fraction: float) -> float:
+    if not latencies:
+        return 0.0
+
+    ordered = sorted(latencies)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def summarize(latencies: List[float], errors: int, duration: float, cpu_time: float, peak_memory: int) -> dict:
+    return {
+        'requests': len(latencies),
+        'errors': errors,
+        'throughput': len(latencies) / duration if duration else 0.0,
+        'p50_ms': percentile(latencies, 0.5) * 1000,
+        'p99_ms': percentile(latencies, 0.99) * 1000,
+        'cpu_us': cpu_time / len(latencies) * 1e6 if latencies else 0.0,
+        'peak_memory_kib': peak_memory / 1024,
+    }
+
+
+def timed_call(operation: Callable, client: object, latencies: List[float]) -> bool:
+    start = time.perf_counter()
+
+    try:
+        operation(client)
+        return True
+    except (HttpRequestError, ServerError):
+        return False
+    finally:
+        latencies.append(time.perf_counter() - start)
+
+
+def run_sequential(client: ApiClient, operation: Callable, count: int, latencies: List[float]) -> List[bool]:
+    return [timed_call(operation, client, latencies) for _ in range(count)]
+
+
+def run_threaded(client: ApiClient, operation: Callable, count: int, latencies: List[float],
+                 concurrency: int) -> List[bool]:
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        return list(executor.map(lambda _: timed_call(operation, client, latencies), range(count)))
+
+
+def run_async(endpoint: str, operation_name: str, count: int, latencies: List[float], concurrency: int) -> List[bool]:
+    async def call(client, semaphore) -> bool:
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                await getattr(client, operation_name)(*_arguments(operation_name))
+                return True
+            except (HttpRequestError, ServerError):
+                return False
+            finally:
+                latencies.append(time.perf_counter() - start)
+
+    async def main() -> List[bool]:
+        semaphore = asyncio.Semaphore(concurrency)
+        async with Ginger.create_async_client(endpoint, 'benchmark-key', limit=concurrency) as client:
+            return await asyncio.gather(*(call(client, semaphore) for _ in range(count)))
+
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(main())
+    finally:
+        loop.close()
+
+
+def _arguments(operation_name: str) -> tuple:
+    return {'get_order': (ORDER_ID,), 'create_order': (ORDER_DATA,), 'get_ideal_issuers': ()}[operation_name]
+
+
+def benchmark(mode: str, endpoint: str, operation_name: str, count: int, concurrency: int,
+              transport: str = 'requests') -> dict:
+    """
+    `cpu_us` in the result is the CPU time of this process (client and fake PSP together) per request.
+    """
+    operation = OPERATIONS[operation_name]
+
+    def run(run_count: int, latencies: List[float]) -> List[bool]:
+        if mode == 'async':
+            return run_async(endpoint, operation_name, run_count, latencies, concurrency)
+
+        with Ginger.create_client(endpoint, 'benchmark-key', pool_maxsize=concurrency, transport=transport) as client:
+            operation(client)  # Warm up the connection pool.
+
+            if mode == 'sequential':
+                return run_sequential(client, operation, run_count, latencies)
+
+            return run_threaded(client, operation, run_count, latencies, concurrency)
+
+    latencies: List[float] = []
+    start = time.perf_counter()
+    cpu_start = time.process_time()
+    outcomes = run(count, latencies)
+    cpu_time = time.process_time() - cpu_start
+    duration = time.perf_counter() - start
+
+    # Memory is measured in a separate, shorter run, as tracing allocations slows everything down.
+    tracemalloc.start()
+    run(min(count, 200), [])
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return summarize(latencies, outcomes.count(False), duration, cpu_time, peak_memory)
+
+
+def find_regressions(results: dict, baseline: dict, tolerance: float) -> List[str]:
+    regressions = []
+
+    for mode, result in results.items():
+        previous = baseline.get(mode)
+        if not previous:
+            continue
+
+        if result['throughput'] < previous['throughput'] * (1 - tolerance):
+            regressions.append('{}: throughput {:.0f}/s < baseline {:.0f}/s'.format(
+                mode, result['throughput'], previous['throughput']
+            ))
+
+        if result['p99_ms'] > previous['p99_ms'] * (1 + tolerance):
+            regressions.append('{}: p99 {:.2f}ms > baseline {:.2f}ms'.format(
+                mode, result['p99_ms'], previous['p99_ms']
+            ))
+
+    return regressions
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--requests', type=int, default=1000, help='Requests per mode')
+    parser.add_argument('--concurrency', type=int, default=16, help='Requests in flight in threaded and async mode')
+    parser.add_argument('--modes', default='sequential,threaded,async', help='Comma separated modes to run')
+    parser.add_argument('--operation', choices=sorted(OPERATIONS), default='get_order')
+    parser.add_argument('--transport', choices=sorted(Ginger.TRANSPORTS), default='requests',
+                        help='HTTP library of the sequential and threaded modes')
+    parser.add_argument('--latency', type=float, default=0.0, help='Seconds the fake PSP delays every response')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of requests the fake PSP fails')
+    parser.add_argument('--transactions', type=int, default=3, help='Transactions per order returned')
+    parser.add_argument('--output', help='Write the results as JSON to this file')
+    parser.add_argument('--baseline', help='Compare with results previously written with --output')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='Allowed relative regression')
+    args = parser.parse_args(argv)
+
+    results = {}
+
+    with FakePsp(latency=args.latency, error_rate=args.error_rate, transactions=args.transactions, seed=1) as psp:
+        for mode in args.modes.split(','):
+            results[mode] = benchmark(
+                mode, psp.endpoint, args.operation, args.requests, args.concurrency, args.transport
+            )
+
+    print('{:<12}{:>10}{:>8}{:>14}{:>10}{:>10}{:>10}{:>14}'.format(
+        'mode', 'requests', 'errors', 'req/s', 'p50 ms', 'p99 ms', 'CPU us', 'peak KiB'
+    ))
+    for mode, result in results.items():
+        print('{:<12}{:>10}{:>8}{:>14.0f}{:>10.2f}{:>10.2f}{:>10.0f}{:>14.0f}'.format(
+            mode, result['requests'], result['errors'], result['throughput'], result['p50_ms'], result['p99_ms'],
+            result['cpu_us'], result['peak_memory_kib'],
+        ))
+
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump(results, output, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as baseline:
+            regressions = find_regressions(results, json.load(baseline), args.tolerance)
+
+        for regression in regressions:
+            print('REGRESSION', regression)
+
+        return 1 if regressions else 0
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
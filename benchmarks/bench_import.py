@@ -0,0 +1,83 @@
+"""
+Measure how long `import ginger_sdk` takes, using `python -X importtime`.
+
+Run with `python -m benchmarks.bench_import [--budget MS] [--runs N]`. Exits with a non-zero status when the median
+import time exceeds the budget, or when importing the SDK imports one of `LAZY_MODULES`, which are only needed once a
+client is created or used.
+
+Needs Python 3.7 or later, the first version with `-X importtime`.
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+
+from typing import Dict
+from typing import List
+
+LAZY_MODULES = ('requests', 'aiohttp', 'orjson', 'concurrent.futures', 'platform')
+
+
+def measure_import(module: str = 'ginger_sdk') -> Dict[str, int]:
+    """
+    Import `module` in a fresh interpreter and return the cumulative import time of every module it imported, in
+    microseconds.
+
+    :raises RuntimeError: On Python versions without `-X importtime`.
+    """
+    if sys.version_info < (3, 7):
+        raise RuntimeError('Measuring import times needs Python 3.7 or later')
+
+    process = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import {}'.format(module)],
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+    )
+
+    times = {}
+    for line in process.stderr.splitlines():
+        if not line.startswith('import time:') or '|' not in line:
+            continue
+
+        _, cumulative, name = line[len('import time:'):].split('|')
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+
+    return times
+
+
+def check(budget_ms: float, runs: int) -> List[str]:
+    """
+    :return: Descriptions of the budget violations; empty when the import is fast enough.
+    """
+    samples = [measure_import() for _ in range(runs)]
+    median_ms = statistics.median(sample['ginger_sdk'] for sample in samples) / 1000
+    print('import ginger_sdk: {:.1f} ms (median of {} runs, budget {:.1f} ms)'.format(median_ms, runs, budget_ms))
+
+    problems = []
+    if median_ms > budget_ms:
+        problems.append('import took {:.1f} ms, budget is {:.1f} ms'.format(median_ms, budget_ms))
+
+    for module in LAZY_MODULES:
+        if module in samples[0]:
+            problems.append('{} is imported eagerly'.format(module))
+
+    return problems
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--budget', type=float, default=50.0, help='maximum median import time in milliseconds')
+    parser.add_argument('--runs', type=int, default=5)
+    arguments = parser.parse_args()
+
+    problems = check(arguments.budget, arguments.runs)
+    for problem in problems:
+        print('FAIL: ' + problem)
+
+    sys.exit(1 if problems else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+"""
+Compare memory use and construction time of typed models against plain order dicts.
+
+Run with `python -m benchmarks.bench_models [number of orders]`.
+"""
+import json
+import sys
+import time
+import tracemalloc
+
+from typing import Callable
+
+from ginger_sdk.models import Order
+
+
+def make_order_data(index: int, transactions: int = 3) -> dict:
+    return {
+        'id': 'fcbfdd3a-ea2c-4240-96b2-{:012d}'.format(index),
+        'merchant_order_id': 'order-{}'.format(index),
+        'project_id': '1ef558ed-d77d-470d-b43b-c0f4a131bcef',
+        'created': '2020-01-01T12:00:00.000000+00:00',
+        'modified': '2020-01-01T12:05:00.000000+00:00',
+        'completed': '2020-01-01T12:05:00.000000+00:00',
+        'currency': 'EUR',
+        'amount': 995,
+        'status': 'completed',
+        'description': 'Order {}'.format(index),
+        'return_url': 'https://www.example.com/return',
+        'webhook_url': 'https://www.example.com/hook',
+        'flags': [],
+        'transactions': [
+            {
+                'id': 'ddc76c84-3fc2-4a16-85b9-{:012d}'.format(index * 10 + number),
+                'created': '2020-01-01T12:00:00.000000+00:00',
+                'modified': '2020-01-01T12:05:00.000000+00:00',
+                'completed': '2020-01-01T12:05:00.000000+00:00',
+                'status': 'completed',
+                'currency': 'EUR',
+                'amount': 995,
+                'balance': 'internal',
+                'payment_method': 'ideal',
+                'payment_method_details': {'issuer_id': 'INGBNL2A'},
+                'payment_url': 'https://www.example.com/pay',
+                'product_type': 'kassa',
+                'flags': [],
+                'events': [],
+            }
+            for number in range(transactions)
+        ],
+    }
+
+
+def measure_memory(build: Callable[[str], object], bodies: list) -> int:
+    tracemalloc.start()
+    objects = [build(body) for body in bodies]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objects
+    return size
+
+
+def measure_time(build: Callable[[str], object], bodies: list, repeat: int = 5) -> float:
+    """
+    Return the fastest of `repeat` runs, since a single run is easily disturbed by the rest of the machine.
+    """
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for body in bodies:
+            build(body)
+        durations.append(time.perf_counter() - start)
+    return min(durations)
+
+
+def main(count: int) -> None:
+    bodies = [json.dumps(make_order_data(index)) for index in range(count)]
+
+    candidates = [
+        ('dict', json.loads),
+        ('Order', lambda body: Order(json.loads(body))),
+        ('Order (transactions read)', lambda body: _read_transactions(Order(json.loads(body)))),
+    ]
+
+    print('{} orders with 3 transactions each'.format(count))
+    print('{:<28}{:>16}{:>20}'.format('representation', 'memory (MiB)', 'construction (ms)'))
+
+    for name, build in candidates:
+        memory = measure_memory(build, bodies)
+        duration = measure_time(build, bodies)
+        print('{:<28}{:>16.1f}{:>20.1f}'.format(name, memory / 2 ** 20, duration * 1000))
+
+
+def _read_transactions(order: Order) -> Order:
+    order.transactions
+    return order
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
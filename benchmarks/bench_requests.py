@@ -0,0 +1,132 @@
+"""
+Measure the time and memory the SDK itself spends building a request, with the network stubbed out.
+
+The transports' connections are replaced by stubs that return a canned response immediately, so what is measured is
+the work of `ApiClient`, the transport and the HTTP library: building the path, headers and options, preparing the
+request, encoding the body and decoding the response. Run with `python -m benchmarks.bench_requests [number of calls]`.
+"""
+import sys
+import time
+import tracemalloc
+
+from typing import Callable
+from typing import Dict
+from typing import TYPE_CHECKING
+
+from ginger_sdk import Ginger
+from ginger_sdk.api_client import ApiClient
+from ginger_sdk.codec import StdlibJsonCodec
+
+if TYPE_CHECKING:  # pragma: no cover
+    import requests
+
+ENDPOINT = 'https://api.example.com'
+ORDER_ID = 'fcbfdd3a-ea2c-4240-96b2-613d49b79a55'
+ORDER_DATA = {'amount': 995, 'currency': 'EUR', 'description': 'Benchmark order'}
+RESPONSE_BODY = b'{"id": "fcbfdd3a-ea2c-4240-96b2-613d49b79a55", "status": "new"}'
+
+OPERATIONS: Dict[str, Callable[[ApiClient], object]] = {
+    'get_order': lambda client: client.get_order(ORDER_ID),
+    'create_order': lambda client: client.create_order(ORDER_DATA),
+    'capture': lambda client: client.capture_order_transaction(ORDER_ID, ORDER_ID),
+}
+
+
+class _StubRaw(object):
+    """
+    Just enough of a urllib3 response for the transports.
+    """
+    status = 200
+    headers = {'Content-Type': 'application/json'}
+
+    def tell(self) -> int:
+        return len(RESPONSE_BODY)
+
+    def read(self) -> bytes:
+        return RESPONSE_BODY
+
+    def get_redirect_location(self) -> bool:
+        return False
+
+    def release_conn(self) -> None:
+        pass
+
+
+def _respond_requests(request: 'requests.PreparedRequest', **_) -> 'requests.Response':
+    import requests
+
+    response = requests.Response()
+    response.status_code = 200
+    response.headers = requests.structures.CaseInsensitiveDict(_StubRaw.headers)
+    response.raw = _StubRaw()
+    response._content = RESPONSE_BODY
+    response.request = request
+    response.url = request.url
+
+    return response
+
+
+def _respond_urllib3(*_, **__) -> _StubRaw:
+    return _StubRaw()
+
+
+def create_client(transport: str) -> ApiClient:
+    """
+    Create a client whose transport returns a canned response instead of sending requests. Only the connection is
+    stubbed out, so the work `requests` or urllib3 does to prepare a request is measured too.
+    """
+    client = Ginger.create_client(ENDPOINT, 'api-key', transport=transport, codec=StdlibJsonCodec())
+    http_client = client._http_client
+
+    if transport == 'requests':
+        http_client._session.get_adapter(ENDPOINT).send = _respond_requests
+    else:
+        http_client._pool.connection_from_url(ENDPOINT).urlopen = _respond_urllib3
+
+    return client
+
+
+def measure(operation: Callable[[ApiClient], object], client: ApiClient, calls: int) -> dict:
+    """
+    Measure the time per call, and the memory allocated during a call (the peak, which includes objects that are freed
+    again before the call returns).
+    """
+    for _ in range(100):
+        operation(client)
+
+    start = time.perf_counter()
+    for _ in range(calls):
+        operation(client)
+    duration = time.perf_counter() - start
+
+    # Tracing is restarted for every call to reset the peak, since tracemalloc.reset_peak() needs Python 3.9.
+    allocated = 0
+    for _ in range(100):
+        tracemalloc.start()
+        operation(client)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        allocated += peak
+
+    return {
+        'us_per_call': duration / calls * 1e6,
+        'bytes_per_call': allocated / 100,
+    }
+
+
+def main(calls: int) -> None:
+    print('{} calls per operation, network stubbed out'.format(calls))
+    print('{:<12}{:<16}{:>14}{:>18}'.format('transport', 'operation', 'us per call', 'bytes per call'))
+
+    for transport in sorted(Ginger.TRANSPORTS):
+        client = create_client(transport)
+
+        for name, operation in OPERATIONS.items():
+            result = measure(operation, client, calls)
+            print('{:<12}{:<16}{:>14.1f}{:>18.0f}'.format(
+                transport, name, result['us_per_call'], result['bytes_per_call']
+            ))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
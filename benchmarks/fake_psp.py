@@ -0,0 +1,234 @@
+"""
+A local stand-in for the PSP API, for benchmarks and load tests.
+
+It implements the endpoints the SDK uses, under the `/v1` prefix that `Ginger.create_client` adds, and can add latency,
+fail a fraction of the requests and return orders with any number of transactions. Run it on its own with
+`python -m benchmarks.fake_psp [port]`.
+"""
+import gzip
+import json
+import random
+import re
+import socketserver
+import sys
+import threading
+import time
+import uuid
+
+from http.server import BaseHTTPRequestHandler
+from http.server import HTTPServer
+from typing import List
+from typing import Optional
+from typing import Tuple
+from urllib.parse import parse_qs
+from urllib.parse import urlsplit
+
+_ORDER = re.compile(r'^/v1/orders/([^/]+)/$')
+_REFUNDS = re.compile(r'^/v1/orders/([^/]+)/refunds/$')
+_CAPTURES = re.compile(r'^/v1/orders/([^/]+)/transactions/([^/]+)/captures/$')
+
+
+class _ThreadingHTTPServer(socketserver.ThreadingMixIn, HTTPServer):
+    # Equivalent to http.server.ThreadingHTTPServer, which is only available from Python 3.7 on.
+    daemon_threads = True
+
+
+class FakePsp(object):
+    """
+    Fake PSP API server running on a background thread.
+
+    :param float latency: Seconds every request is delayed.
+    :param float error_rate: Fraction of requests (0-1) answered with a 503 API error.
+    :param int transactions: Number of transactions in every returned order.
+    :param int issuers: Number of iDEAL issuers returned.
+    :param int orders: Number of orders the order listing starts with; created orders are added to it.
+    :param bool compress: Gzip responses for clients that accept it. Gzipped request bodies are always accepted.
+    """
+    latency: float
+    error_rate: float
+    transactions: int
+    issuers: int
+    compress: bool
+    requests: int
+
+    _order_ids: List[str]
+
+    _server: Optional[_ThreadingHTTPServer]
+    _thread: Optional[threading.Thread]
+
+    def __init__(self, latency: float = 0.0, error_rate: float = 0.0, transactions: int = 1, issuers: int = 10,
+                 seed: int = None, compress: bool = False, orders: int = 100) -> None:
+        self.latency = latency
+        self.error_rate = error_rate
+        self.transactions = transactions
+        self.issuers = issuers
+        self.compress = compress
+        self.requests = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._order_ids = [self._new_id() for _ in range(orders)]
+        self._server = None
+        self._thread = None
+
+    @property
+    def endpoint(self) -> str:
+        """
+        The URL to pass to `Ginger.create_client`, without the API version.
+        """
+        host, port = self._server.server_address[:2]
+        return 'http://{}:{}'.format(host, port)
+
+    def start(self, port: int = 0) -> 'FakePsp':
+        psp = self
+
+        class Handler(_Handler):
+            fake_psp = psp
+
+        self._server = _ThreadingHTTPServer(('127.0.0.1', port), Handler)
+        self._thread = threading.Thread(target=self._server.serve_forever, name='fake-psp', daemon=True)
+        self._thread.start()
+
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> 'FakePsp':
+        return self.start()
+
+    def __exit__(self, *_) -> None:
+        self.stop()
+
+    def handle(self, method: str, url: str, body: bytes) -> Tuple[int, Optional[object]]:
+        with self._lock:
+            self.requests += 1
+            failed = self._random.random() < self.error_rate
+
+        if self.latency:
+            time.sleep(self.latency)
+
+        if failed:
+            return 503, {'error': {'status': '503', 'type': 'ServiceUnavailable', 'value': 'Simulated failure'}}
+
+        parts = urlsplit(url)
+        path = parts.path
+        data = json.loads(body) if body else {}
+
+        if method == 'GET' and path == '/v1/ideal/issuers/':
+            return 200, [
+                {'id': 'BANKNL2{:03d}'.format(index), 'list_type': 'Nederland', 'name': 'Bank {}'.format(index)}
+                for index in range(self.issuers)
+            ]
+
+        if path == '/v1/orders/':
+            if method == 'POST':
+                order_id = self._new_id()
+                with self._lock:
+                    self._order_ids.append(order_id)
+                return 201, self.order(order_id, data)
+
+            if method == 'GET':
+                query = parse_qs(parts.query)
+                limit = int(query.get('limit', ['100'])[0])
+                offset = int(query.get('offset', ['0'])[0])
+                with self._lock:
+                    order_ids = self._order_ids[offset:offset + limit]
+                return 200, [self.order(order_id) for order_id in order_ids]
+
+        match = _ORDER.match(path)
+        if match and method in ('GET', 'PUT'):
+            return 200, self.order(match.group(1), data)
+
+        match = _REFUNDS.match(path)
+        if match and method == 'POST':
+            return 201, self.order(self._new_id(), {**data, 'flags': ['is-refund']})
+
+        if _CAPTURES.match(path) and method == 'POST':
+            return 201, None
+
+        return 404, {'error': {'status': '404', 'type': 'NotFound', 'value': 'No such resource'}}
+
+    def _new_id(self) -> str:
+        with self._lock:
+            return str(uuid.UUID(int=self._random.getrandbits(128), version=4))
+
+    def order(self, id: str, data: dict = None) -> dict:
+        return {
+            'id': id,
+            'merchant_order_id': 'order-{}'.format(id[:8]),
+            'project_id': '1ef558ed-d77d-470d-b43b-c0f4a131bcef',
+            'created': '2020-01-01T12:00:00.000000+00:00',
+            'modified': '2020-01-01T12:05:00.000000+00:00',
+            'currency': 'EUR',
+            'amount': 995,
+            'status': 'completed',
+            'description': 'Benchmark order',
+            'flags': [],
+            **(data or {}),
+            'transactions': [
+                {
+                    'id': '{}-{:04d}'.format(id[:31], number),
+                    'created': '2020-01-01T12:00:00.000000+00:00',
+                    'status': 'completed',
+                    'currency': 'EUR',
+                    'amount': 995,
+                    'payment_method': 'ideal',
+                    'payment_method_details': {'issuer_id': 'INGBNL2A'},
+                    'payment_url': 'https://www.example.com/pay',
+                    'events': [],
+                }
+                for number in range(self.transactions)
+            ],
+        }
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+    fake_psp: FakePsp
+
+    def do_GET(self) -> None:
+        self._respond()
+
+    def do_POST(self) -> None:
+        self._respond()
+
+    def do_PUT(self) -> None:
+        self._respond()
+
+    def log_message(self, *_) -> None:
+        pass
+
+    def _respond(self) -> None:
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length) if length else b''
+        if self.headers.get('Content-Encoding') == 'gzip':
+            body = gzip.decompress(body)
+
+        status, result = self.fake_psp.handle(self.command, self.path, body)
+        payload = json.dumps(result).encode() if result is not None else b''
+        compress = self.fake_psp.compress and payload and 'gzip' in self.headers.get('Accept-Encoding', '')
+
+        if compress:
+            payload = gzip.compress(payload, compresslevel=6)
+
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        if compress:
+            self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+if __name__ == '__main__':
+    server = FakePsp().start(int(sys.argv[1]) if len(sys.argv) > 1 else 8080)
+    print('Fake PSP listening on', server.endpoint)
+
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.stop()
@@ -1,9 +1,40 @@
 import json
+import time
 
+from collections import deque
+from typing import Any
+from typing import Callable
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import NamedTuple
 from typing import Optional
+from typing import Tuple
 from typing import Union
+from urllib.parse import urlencode
 
+from .cache import OrderCache
+from .cache import OrderSnapshot
+from .cache import TtlCache
+from .codec import JsonCodec
+from .codec import StdlibJsonCodec
+from .hooks import RequestEvent
+from .hooks import RequestHook
+from .hooks import call_hooks
 from .http_client import HttpClient
+from .http_client import HttpStream
+from .http_client import Response
+from .http_client import response_status
+from .models import Issuer
+from .models import Order
+from .models import Refund
+from .pagination import PageIterator
+from .single_flight import SingleFlight
+from .streaming import JsonItemParser
+
+
+# Marks the end of the items of a bulk operation, since None may be one of the items.
+_END = object()
 
 
 class HttpRequestError(Exception):
@@ -21,102 +52,523 @@ class ServerError(Exception):
         ))
 
 
+class OrderResult(NamedTuple):
+    """
+    Outcome of a single order in a bulk operation: either `order` or `error` is set.
+
+    `id` is the order ID for lookups, and the merchant order ID for creations (None when the order has none).
+    """
+    id: Optional[str]
+    order: Union[dict, Order, None] = None
+    error: Optional[Exception] = None
+
+
 class ApiClient(object):
+    IDEAL_ISSUERS_CACHE_KEY = 'ginger:ideal_issuers'
+
     _http_client: HttpClient
+    _cache: Optional[TtlCache]
+    _order_cache: Optional[OrderCache]
+    _single_flight: Optional[SingleFlight]
+    _compress_above: Optional[int]
+    _codec: JsonCodec
+    _models: bool
+    _hooks: List[RequestHook]
 
-    def __init__(self, http_client: HttpClient) -> None:
+    def __init__(self, http_client: HttpClient, cache: TtlCache = None, codec: JsonCodec = None,
+                 models: bool = False, hooks: List[RequestHook] = None, order_cache: OrderCache = None,
+                 coalesce_gets: bool = False, compress_requests_above: int = None) -> None:
+        """
+        :param HttpClient http_client: The HTTP client to send requests with.
+        :param TtlCache cache: Optional cache for rarely changing data, such as the iDEAL issuers.
+        :param OrderCache order_cache: Optional cache of order snapshots for `get_order` to revalidate.
+        :param bool coalesce_gets: Let concurrent identical GET requests share a single request to the API.
+        :param JsonCodec codec: Codec to encode request data and decode responses; defaults to the standard library.
+        :param bool models: Return orders, refunds and issuers as `ginger_sdk.models` objects instead of dicts.
+        :param hooks: Request hooks to instrument requests with, e.g. a `ginger_sdk.metrics.MetricsCollector`.
+        """
         self._http_client = http_client
+        self._cache = cache
+        self._order_cache = order_cache
+        self._single_flight = SingleFlight() if coalesce_gets else None
+        self._compress_above = compress_requests_above
+        self._codec = codec if codec is not None else StdlibJsonCodec()
+        self._models = models
+        self._hooks = list(hooks or [])
+
+    def add_hook(self, hook: RequestHook) -> None:
+        """
+        Register a hook that is called before and after every request.
+        """
+        self._hooks = self._hooks + [hook]
+
+    def close(self) -> None:
+        """
+        Close the underlying HTTP client and release its pooled connections.
+        """
+        self._http_client.close()
+
+    def __enter__(self) -> 'ApiClient':
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
 
-    def get_ideal_issuers(self) -> list:
+    def get_ideal_issuers(self, timeout: float = None) -> List[Union[dict, Issuer]]:
         """
         Get a list of possible iDEAL issuers.
 
+        When the client has a cache, the issuers are served from it.
+
+        :param float timeout: Maximum number of seconds the request may take.
         :raises HttpRequestError: When an error occurred while processing the request.
         :raises json.JSONDecodeError: When the response data could not be decoded.
         """
-        return self.send('GET', '/ideal/issuers/')
+        if self._cache is not None:
+            issuers = self._cache.get_or_load(
+                self.IDEAL_ISSUERS_CACHE_KEY,
+                lambda: self.send('GET', '/ideal/issuers/', timeout=timeout)
+            )
+        else:
+            issuers = self.send('GET', '/ideal/issuers/', timeout=timeout)
+
+        if not self._models or not isinstance(issuers, list):
+            return issuers
+
+        return [self._to_model(Issuer, issuer) for issuer in issuers]
 
-    def get_order(self, id: str) -> dict:
+    def get_order(self, id: str, timeout: float = None) -> Union[dict, Order]:
         """
         Get an order.
 
+        When the client has an order cache, a cached order is only fetched again when it changed.
+
         :param str id: The order ID.
+        :param float timeout: Maximum number of seconds the request may take.
         :return: The order.
         :raises HttpRequestError: When an error occurred while processing the request.
         :raises json.JSONDecodeError: When the response data could not be decoded.
         """
-        return self.send('GET', '/orders/{}/'.format(id))
+        path = '/orders/{}/'.format(id)
+
+        if self._order_cache is None:
+            return self._to_model(Order, self.send('GET', path, timeout=timeout))
+
+        def fetch(headers: dict) -> Optional[OrderSnapshot]:
+            order, response = self._send('GET', path, timeout=timeout, headers=headers)
+
+            # The API answers a conditional request for an unchanged order with an empty 304 response.
+            if not isinstance(order, dict):
+                return None
+
+            response_headers = getattr(response, 'headers', {})
+            return OrderSnapshot(order, response_headers.get('ETag'), response_headers.get('Last-Modified'))
+
+        return self._to_model(Order, self._order_cache.get_or_fetch(id, fetch))
+
+    def get_orders(self, ids: Iterable[str], max_concurrency: int = 10, ordered: bool = True) -> Iterator[OrderResult]:
+        """
+        Get many orders, running up to `max_concurrency` lookups at the same time.
+
+        Results are streamed back as they become available; failed lookups are reported in the result instead of
+        aborting the whole batch. Keep `max_concurrency` at or below the connection pool size of the HTTP client so all
+        workers can reuse pooled connections.
+
+        :param ids: The order IDs.
+        :param int max_concurrency: Maximum number of lookups in flight.
+        :param bool ordered: Yield results in the order of `ids`; otherwise yield them as they complete.
+        :return: An iterator of `OrderResult`.
+        """
+        return self._run_bounded(ids, self._get_order_result, max_concurrency, max_concurrency * 2, ordered)
+
+    def create_orders(self, orders: Iterable[dict], max_in_flight: int = 10, ordered: bool = False,
+                      max_rate: float = None, timeout: float = None) -> Iterator[OrderResult]:
+        """
+        Create many orders, with up to `max_in_flight` requests at the same time.
+
+        The `orders` iterable is consumed lazily: a new order is only taken from it when a request slot is free, so a
+        generator feeding this method is slowed down to the speed of the API. Every result carries the
+        `merchant_order_id` of its input order as `id`. Failed creations are reported in the result instead of aborting
+        the batch.
+
+        Each request is sent with an `Idempotency-Key` header derived from the `merchant_order_id`, so submitting the
+        same order again (e.g. when re-running a failed batch, or by a `RetryPolicy`) does not create it twice.
+
+        :param orders: Dictionaries with attributes and values to create, each with a unique `merchant_order_id`.
+        :param int max_in_flight: Maximum number of requests in flight.
+        :param bool ordered: Yield results in the order of `orders`; otherwise yield them as they complete.
+        :param float max_rate: Maximum number of orders to submit per second, to stay within the API's rate limit.
+        :param float timeout: Maximum number of seconds each request may take.
+        :return: An iterator of `OrderResult`.
+        """
+        def create(order_data: dict) -> OrderResult:
+            if not isinstance(order_data, dict):
+                return OrderResult(None, error=ValueError('Expected an order dictionary, got {!r}'.format(order_data)))
+
+            merchant_order_id = order_data.get('merchant_order_id')
+            headers = {'Idempotency-Key': 'order-{}'.format(merchant_order_id)} if merchant_order_id else {}
+
+            try:
+                order = self._to_model(
+                    Order,
+                    self.send('POST', '/orders/', order_data, timeout=timeout, headers=headers)
+                )
+                return OrderResult(merchant_order_id, order=order)
+            except (HttpRequestError, ServerError) as exception:
+                return OrderResult(merchant_order_id, error=exception)
+
+        return self._run_bounded(
+            orders,
+            create,
+            max_in_flight,
+            max_in_flight,
+            ordered,
+            1 / max_rate if max_rate else 0.0
+        )
+
+    def iter_orders(self, filters: dict = None, page_size: int = 100, offset: int = 0, prefetch: bool = True,
+                    timeout: float = None) -> PageIterator:
+        """
+        Iterate over orders, fetching them a page at a time.
+
+        Pages are only fetched when needed, and the next page is fetched in the background while the current one is
+        consumed. To resume an interrupted iteration, pass the `offset` attribute of the returned iterator as `offset`.
+        The iteration ends when the API returns an empty page, so it also works when the API returns fewer orders per
+        page than `page_size`.
+
+        :param dict filters: Query parameters to filter the orders by.
+        :param int page_size: Number of orders to ask for per request.
+        :param int offset: Number of orders to skip.
+        :param bool prefetch: Fetch the next page while the current one is consumed.
+        :param float timeout: Maximum number of seconds each page request may take.
+        :return: An iterator of orders.
+        :raises HttpRequestError: When an error occurred while processing a request.
+        :raises json.JSONDecodeError: When the response data could not be decoded.
+        """
+        filters = dict(filters or {})
+
+        def fetch_page(page_offset: int, limit: int) -> list:
+            query = urlencode({**filters, 'limit': limit, 'offset': page_offset}, doseq=True)
+            orders = self.send('GET', '/orders/?' + query, timeout=timeout) or []
+            return [self._to_model(Order, order) for order in orders]
+
+        return PageIterator(fetch_page, page_size=page_size, offset=offset, prefetch=prefetch)
+
+    def _get_order_result(self, id: str) -> OrderResult:
+        if not id:
+            return OrderResult(id, error=ValueError('Expected an order ID, got {!r}'.format(id)))
+
+        try:
+            return OrderResult(id, order=self.get_order(id))
+        except (HttpRequestError, ServerError) as exception:
+            return OrderResult(id, error=exception)
+
+    @staticmethod
+    def _run_bounded(items: Iterable[Any], call: Callable[[Any], OrderResult], max_concurrency: int, window: int,
+                     ordered: bool, interval: float = 0.0) -> Iterator[OrderResult]:
+        """
+        Run `call` for every item on a pool of `max_concurrency` threads.
+
+        At most `window` items are taken from `items` before their results have been yielded, so neither memory nor
+        the producer of `items` runs ahead of the consumer. Submissions are spaced at least `interval` seconds apart.
+        """
+        if max_concurrency < 1:
+            raise ValueError('max_concurrency must be at least 1')
+
+        # concurrent.futures pulls in logging, so it is only imported by the bulk operations that need a thread pool.
+        from concurrent.futures import FIRST_COMPLETED
+        from concurrent.futures import ThreadPoolExecutor
+        from concurrent.futures import wait
+
+        items = iter(items)
+        pending: deque = deque()
+        executor = ThreadPoolExecutor(max_workers=max_concurrency)
+        next_submit = time.monotonic()
+
+        def submit() -> bool:
+            nonlocal next_submit
+
+            item = next(items, _END)
+            if item is _END:
+                return False
+
+            if interval:
+                delay = next_submit - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                next_submit = max(next_submit, time.monotonic()) + interval
 
-    def create_order(self, order_data: dict) -> dict:
+            pending.append(executor.submit(call, item))
+            return True
+
+        try:
+            while len(pending) < window and submit():
+                pass
+
+            while pending:
+                if ordered:
+                    future = pending.popleft()
+                else:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    future = next(iter(done))
+                    pending.remove(future)
+
+                submit()
+                yield future.result()
+        finally:
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=True)
+
+    def create_order(self, order_data: dict, timeout: float = None) -> Union[dict, Order]:
         """
         Create a new order.
 
         :param dict order_data: Dictionary with attributes and values to create.
+        :param float timeout: Maximum number of seconds the request may take.
         :return: The newly created order.
         :raises HttpRequestError: When an error occurred while processing the request.
         :raises json.JSONDecodeError: When the response data could not be decoded.
         """
-        return self.send('POST', '/orders/', order_data)
+        return self._to_model(Order, self.send('POST', '/orders/', order_data, timeout=timeout))
 
-    def update_order(self, id: str, order_data: dict) -> dict:
+    def update_order(self, id: str, order_data: dict, timeout: float = None) -> Union[dict, Order]:
         """
         Update an order.
 
         :param str id: The ID of the order to update.
         :param dict order_data: Dictionary with attributes and values to update.
+        :param float timeout: Maximum number of seconds the request may take.
         :return: The newly updated order.
         :raises HttpRequestError: When an error occurred while processing the request.
         :raises json.JSONDecodeError: When the response data could not be decoded.
         """
-        return self.send('PUT', '/orders/{}/'.format(id), order_data)
+        try:
+            return self._to_model(Order, self.send('PUT', '/orders/{}/'.format(id), order_data, timeout=timeout))
+        finally:
+            self._invalidate_order(id)
 
-    def refund_order(self, id: str, order_data: dict) -> dict:
+    def refund_order(self, id: str, order_data: dict, timeout: float = None) -> Union[dict, Refund]:
         """
         Refund an order.
 
         :param str id: The ID of the order to refund.
         :param dict order_data: Refund data.
+        :param float timeout: Maximum number of seconds the request may take.
         :return: The newly created refund.
         :raises HttpRequestError: When an error occurred while processing the request.
         :raises json.JSONDecodeError: When the response data could not be decoded.
         """
-        return self.send('POST', '/orders/{}/refunds/'.format(id), order_data)
+        try:
+            return self._to_model(
+                Refund,
+                self.send('POST', '/orders/{}/refunds/'.format(id), order_data, timeout=timeout)
+            )
+        finally:
+            self._invalidate_order(id)
 
-    def capture_order_transaction(self, order_id: str, transaction_id: str) -> None:
+    def capture_order_transaction(self, order_id: str, transaction_id: str, timeout: float = None) -> None:
         """
         Capture an order transaction.
 
         :param str order_id: The ID of the order.
         :param str transaction_id: The ID of the transaction to capture.
+        :param float timeout: Maximum number of seconds the request may take.
         :raises HttpRequestError: When an error occurred while processing the request.
         :raises json.JSONDecodeError: When the response data could not be decoded.
         """
-        self.send('POST', '/orders/{}/transactions/{}/captures/'.format(order_id, transaction_id))
+        try:
+            self.send(
+                'POST',
+                '/orders/{}/transactions/{}/captures/'.format(order_id, transaction_id),
+                timeout=timeout
+            )
+        finally:
+            self._invalidate_order(order_id)
 
-    def send(self, method: str, path: str, data: dict = None) -> Union[dict, list, None]:
+    def send(self, method: str, path: str, data: dict = None, timeout: float = None,
+             headers: dict = None) -> Union[dict, list, None]:
         """
         Send a request to the API.
 
+        When the client coalesces GET requests, a GET request without a body waits for an identical one that is in
+        progress and returns the same result (or raises the same exception); the result is shared and should not be
+        modified.
+
         :param str method: HTTP request method
         :param str path: URL path to call
         :param str data: Request data to send
+        :param float timeout: Maximum number of seconds the request may take, including retries
+        :param dict headers: Additional request headers
         :raises HttpRequestError: When an error occurred while processing the request.
         :raises json.JSONDecodeError: When the response data could not be decoded.
         """
+        return self._send(method, path, data, timeout, headers)[0]
+
+    def _send(self, method: str, path: str, data: dict = None, timeout: float = None,
+              headers: dict = None) -> Tuple[Union[dict, list, None], Union[str, bytes, None]]:
+        """
+        Like `send`, but also return the raw response, for its status and headers.
+        """
+        options = {} if timeout is None else {'timeout': timeout}
+        body, body_size, request_headers = self._prepare_request(data, headers)
+
+        # The key leaves out the body, so a request with a body is never coalesced, like in the asynchronous client.
+        if self._single_flight is not None and method == 'GET' and not body:
+            key = (path, tuple(sorted(request_headers.items())))
+
+            try:
+                return self._single_flight.do(
+                    key,
+                    lambda: self._exchange(method, path, request_headers, body, options, body_size),
+                    timeout
+                )
+            except TimeoutError as exception:
+                raise HttpRequestError(exception) from exception
+
+        return self._exchange(method, path, request_headers, body, options, body_size)
+
+    def stream(self, method: str, path: str, data: dict = None, timeout: float = None,
+               headers: dict = None) -> Iterator[Any]:
+        """
+        Send a request to the API and parse the response while it is read: when it is a JSON array, its elements are
+        yielded one at a time, so memory use does not grow with the size of the response. Any other response is
+        yielded as a single item.
+
+        The request is sent when the iteration starts. Close the iterator when it is not read to the end, to release the
+        connection. Streamed requests are never coalesced, and the client's `models` setting does not apply to them.
+
+        :param float timeout: Maximum number of seconds to wait for the response, and for every chunk of it
+        :raises HttpRequestError: When an error occurred while processing the request.
+        :raises ServerError: When the API responded with an error.
+        :raises json.JSONDecodeError: When the response data could not be decoded.
+        """
+        options = {} if timeout is None else {'timeout': timeout}
+        body, body_size, request_headers = self._prepare_request(data, headers)
+        event = RequestEvent(method, path, body_size, len(body) if body else 0)
+        call_hooks(self._hooks, 'before_request', event)
+        start = time.perf_counter()
+        response: Optional[HttpStream] = None
+        error: Optional[Exception] = None
+
         try:
-            response = self._http_client.request(
-                method,
-                path,
-                {'Content-Type': 'application/json'} if data else {},
-                json.dumps(data) if data else None
-            )
+            response = self._request(self._http_client.stream, method, path, request_headers, body, options)
+            event.status = response.status_code
+            event.ttfb = response.elapsed
+            items = JsonItemParser(response)
+
+            for item in items:
+                if not items.is_array and isinstance(item, dict) and 'error' in item:
+                    raise ServerError.from_result(item)
+
+                yield item
+        except (HttpRequestError, ServerError, json.JSONDecodeError) as exception:
+            error = exception
+            raise
+        except Exception as exception:
+            error = HttpRequestError(exception)
+            raise error from exception
+        finally:
+            if response is not None:
+                response.close()
+                event.response_bytes = event.response_wire_bytes = response.size
+
+            event.total = time.perf_counter() - start
+
+            if error is None:
+                call_hooks(self._hooks, 'after_response', event)
+            else:
+                call_hooks(self._hooks, 'on_error', event, error)
+
+    def _prepare_request(self, data: Optional[dict],
+                         headers: Optional[dict]) -> Tuple[Union[str, bytes, None], int, dict]:
+        """
+        Encode (and compress) the request data, and collect the request headers. The headers are a new dict for every
+        request, since HTTP clients may add to them.
+
+        :raises HttpRequestError: When the request data could not be encoded.
+        """
+        try:
+            body = self._codec.encode(data) if data else None
+        except Exception as exception:
+            raise HttpRequestError(exception) from exception
+
+        body_size = len(body) if body else 0
+        request_headers = {'Content-Type': 'application/json'} if body else {}
+
+        if body is not None and self._compress_above is not None and body_size > self._compress_above:
+            body = self._compress(body)
+            request_headers['Content-Encoding'] = 'gzip'
+
+        if headers:
+            request_headers.update(headers)
+
+        return body, body_size, request_headers
+
+    def _exchange(self, method: str, path: str, headers: dict, body: Union[str, bytes, None], options: dict,
+                  body_size: int) -> Tuple[Union[dict, list, None], Union[str, bytes, None]]:
+        if self._hooks:
+            return self._send_instrumented(method, path, headers, body, options, body_size)
+
+        response = self._request(self._http_client.request, method, path, headers, body, options)
+        return self._interpret_response(response, self._codec), response
+
+    def _invalidate_order(self, id: str) -> None:
+        if self._order_cache is not None:
+            self._order_cache.invalidate(id)
+
+    def _request(self, send: Callable[..., Response], method: str, path: str, headers: dict,
+                 body: Union[str, bytes, None], options: dict) -> Response:
+        """
+        Send a request with `send`, the `request` or `stream` method of the HTTP client.
+
+        :raises HttpRequestError:
+        """
+        try:
+            return send(method, path, headers, body, **options)
+        except HttpRequestError:
+            raise
         except Exception as exception:
             raise HttpRequestError(exception) from exception
 
-        return self._interpret_response(response)
+    def _send_instrumented(self, method: str, path: str, headers: dict, body: Union[str, bytes, None], options: dict,
+                           body_size: int) -> Tuple[Union[dict, list, None], Union[str, bytes, None]]:
+        event = RequestEvent(method, path, body_size, len(body) if body else 0)
+        call_hooks(self._hooks, 'before_request', event)
+        start = time.perf_counter()
+
+        try:
+            response = self._request(self._http_client.request, method, path, headers, body, options)
+            event.status = response_status(response)
+            event.response_bytes = len(response) if response else 0
+            wire_size = getattr(response, 'wire_size', None)
+            event.response_wire_bytes = wire_size if wire_size is not None else event.response_bytes
+            event.ttfb = getattr(response, 'elapsed', None)
+            result = self._interpret_response(response, self._codec)
+        except Exception as exception:
+            event.total = time.perf_counter() - start
+            call_hooks(self._hooks, 'on_error', event, exception)
+            raise
+
+        event.total = time.perf_counter() - start
+        call_hooks(self._hooks, 'after_response', event)
+
+        return result, response
+
+    @staticmethod
+    def _compress(body: Union[str, bytes]) -> bytes:
+        import gzip
+
+        return gzip.compress(body.encode('utf-8') if isinstance(body, str) else body, compresslevel=6)
+
+    def _to_model(self, model: type, result: Any) -> Any:
+        if not self._models or not isinstance(result, dict):
+            return result
+
+        return model(result)
 
     @staticmethod
-    def _interpret_response(response: Optional[str]) -> Optional[dict]:
+    def _interpret_response(response: Union[str, bytes, None], codec: JsonCodec) -> Optional[dict]:
         """
         :raises HttpRequestError:
         :raises json.JSONDecodeError:
@@ -124,7 +576,7 @@ class ApiClient(object):
         if not response:
             return None
 
-        result = json.loads(response)
+        result = codec.decode(response)
 
         if 'error' in result:
             raise ServerError.from_result(result)
@@ -0,0 +1,137 @@
+from typing import Optional
+from typing import Union
+
+from .api_client import ApiClient
+from .api_client import HttpRequestError
+from .async_http_client import AsyncHttpClient
+from .codec import JsonCodec
+from .codec import StdlibJsonCodec
+from .single_flight import AsyncSingleFlight
+
+
+class AsyncApiClient(object):
+    """
+    Coroutine-based counterpart of `ApiClient`, for use from an asyncio event loop.
+    """
+    _http_client: AsyncHttpClient
+    _codec: JsonCodec
+    _single_flight: Optional[AsyncSingleFlight]
+
+    def __init__(self, http_client: AsyncHttpClient, codec: JsonCodec = None, coalesce_gets: bool = False) -> None:
+        """
+        :param AsyncHttpClient http_client: The HTTP client to send requests with.
+        :param JsonCodec codec: Codec to encode request data and decode responses; defaults to the standard library.
+        :param bool coalesce_gets: Let concurrent identical GET requests share a single request to the API.
+        """
+        self._http_client = http_client
+        self._codec = codec if codec is not None else StdlibJsonCodec()
+        self._single_flight = AsyncSingleFlight() if coalesce_gets else None
+
+    async def close(self) -> None:
+        """
+        Close the underlying HTTP client and release its pooled connections.
+        """
+        await self._http_client.close()
+
+    async def __aenter__(self) -> 'AsyncApiClient':
+        return self
+
+    async def __aexit__(self, *_) -> None:
+        await self.close()
+
+    async def get_ideal_issuers(self) -> list:
+        """
+        Get a list of possible iDEAL issuers.
+
+        :raises HttpRequestError: When an error occurred while processing the request.
+        :raises json.JSONDecodeError: When the response data could not be decoded.
+        """
+        return await self.send('GET', '/ideal/issuers/')
+
+    async def get_order(self, id: str) -> dict:
+        """
+        Get an order.
+
+        :param str id: The order ID.
+        :return: The order.
+        :raises HttpRequestError: When an error occurred while processing the request.
+        :raises json.JSONDecodeError: When the response data could not be decoded.
+        """
+        return await self.send('GET', '/orders/{}/'.format(id))
+
+    async def create_order(self, order_data: dict) -> dict:
+        """
+        Create a new order.
+
+        :param dict order_data: Dictionary with attributes and values to create.
+        :return: The newly created order.
+        :raises HttpRequestError: When an error occurred while processing the request.
+        :raises json.JSONDecodeError: When the response data could not be decoded.
+        """
+        return await self.send('POST', '/orders/', order_data)
+
+    async def update_order(self, id: str, order_data: dict) -> dict:
+        """
+        Update an order.
+
+        :param str id: The ID of the order to update.
+        :param dict order_data: Dictionary with attributes and values to update.
+        :return: The newly updated order.
+        :raises HttpRequestError: When an error occurred while processing the request.
+        :raises json.JSONDecodeError: When the response data could not be decoded.
+        """
+        return await self.send('PUT', '/orders/{}/'.format(id), order_data)
+
+    async def refund_order(self, id: str, order_data: dict) -> dict:
+        """
+        Refund an order.
+
+        :param str id: The ID of the order to refund.
+        :param dict order_data: Refund data.
+        :return: The newly created refund.
+        :raises HttpRequestError: When an error occurred while processing the request.
+        :raises json.JSONDecodeError: When the response data could not be decoded.
+        """
+        return await self.send('POST', '/orders/{}/refunds/'.format(id), order_data)
+
+    async def capture_order_transaction(self, order_id: str, transaction_id: str) -> None:
+        """
+        Capture an order transaction.
+
+        :param str order_id: The ID of the order.
+        :param str transaction_id: The ID of the transaction to capture.
+        :raises HttpRequestError: When an error occurred while processing the request.
+        :raises json.JSONDecodeError: When the response data could not be decoded.
+        """
+        await self.send('POST', '/orders/{}/transactions/{}/captures/'.format(order_id, transaction_id))
+
+    async def send(self, method: str, path: str, data: dict = None) -> Union[dict, list, None]:
+        """
+        Send a request to the API.
+
+        When the client coalesces GET requests, a GET request waits for an identical one that is in progress and
+        returns the same result (or raises the same exception); the result is shared and should not be modified.
+
+        :param str method: HTTP request method
+        :param str path: URL path to call
+        :param str data: Request data to send
+        :raises HttpRequestError: When an error occurred while processing the request.
+        :raises json.JSONDecodeError: When the response data could not be decoded.
+        """
+        if self._single_flight is not None and method == 'GET' and not data:
+            return await self._single_flight.do(path, lambda: self._exchange(method, path, data))
+
+        return await self._exchange(method, path, data)
+
+    async def _exchange(self, method: str, path: str, data: dict = None) -> Union[dict, list, None]:
+        try:
+            response = await self._http_client.request(
+                method,
+                path,
+                {'Content-Type': 'application/json'} if data else {},
+                self._codec.encode(data) if data else None
+            )
+        except Exception as exception:
+            raise HttpRequestError(exception) from exception
+
+        return ApiClient._interpret_response(response, self._codec)
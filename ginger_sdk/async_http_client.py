@@ -0,0 +1,128 @@
+import base64
+import importlib.util
+
+from abc import ABC
+from abc import abstractmethod
+from typing import Optional
+from typing import TYPE_CHECKING
+from typing import Union
+
+from .http_client import HttpException
+from .http_client import HttpResponse
+
+if TYPE_CHECKING:  # pragma: no cover
+    import aiohttp
+
+
+class AsyncHttpClient(ABC):
+    @abstractmethod
+    async def request(self, method: str, path: str, headers: dict = {},
+                      data: Union[str, bytes] = None) -> Union[str, bytes, None]:
+        raise NotImplementedError()
+
+    async def close(self) -> None:
+        """
+        Release any resources (e.g. pooled connections) held by the client.
+        """
+        pass
+
+    async def __aenter__(self) -> 'AsyncHttpClient':
+        return self
+
+    async def __aexit__(self, *_) -> None:
+        await self.close()
+
+
+class AiohttpHttpClient(AsyncHttpClient):
+    DEFAULT_LIMIT = 100
+    DEFAULT_LIMIT_PER_HOST = 0
+
+    _endpoint: str
+    _api_key: str
+    _default_headers: dict
+    _default_request_options: dict
+    _limit: int
+    _limit_per_host: int
+    _session: Optional['aiohttp.ClientSession']
+
+    def __init__(self, endpoint: str, api_key: str, default_headers: dict = {},
+                 default_request_options: dict = {}, limit: int = DEFAULT_LIMIT,
+                 limit_per_host: int = DEFAULT_LIMIT_PER_HOST) -> None:
+        """
+        :param int limit: Maximum number of simultaneous connections; 0 means unlimited.
+        :param int limit_per_host: Maximum number of simultaneous connections per host; 0 means unlimited.
+        """
+        # aiohttp is slow to import, so it is only imported once the client sends its first request.
+        if importlib.util.find_spec('aiohttp') is None:
+            raise ImportError('AiohttpHttpClient requires aiohttp; install it with `pip install ginger-sdk[async]`')
+
+        self._endpoint = endpoint
+        self._api_key = api_key
+        self._default_headers = default_headers
+        self._default_request_options = default_request_options
+        self._limit = limit
+        self._limit_per_host = limit_per_host
+        self._session = None
+
+    async def request(self, method: str, path: str, headers: dict = {},
+                      data: Union[str, bytes] = None) -> HttpResponse:
+        import aiohttp
+
+        options = self._create_request_options(method, path, headers, data)
+
+        try:
+            async with self._get_session().request(**options) as response:
+                body = await response.read()
+        except aiohttp.ClientError as exception:
+            raise HttpException('aiohttp error: {} ({}) for {}'.format(
+                str(exception),
+                type(exception).__name__,
+                path
+            )) from exception
+
+        # aiohttp decompresses while reading, so the compressed size is only known from the headers.
+        content_length = response.headers.get('Content-Length')
+        wire_size = int(content_length) if content_length and content_length.isdigit() else None
+
+        return HttpResponse(body, response.status, response.headers, wire_size=wire_size)
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def _get_session(self) -> 'aiohttp.ClientSession':
+        """
+        The session is created on first use, as aiohttp binds it to the running event loop.
+        """
+        import aiohttp
+
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self._limit, limit_per_host=self._limit_per_host),
+                cookie_jar=aiohttp.DummyCookieJar(),
+                headers={'Authorization': 'Basic ' + base64.b64encode((self._api_key + ':').encode()).decode('ascii')},
+            )
+
+        return self._session
+
+    def _create_request_options(self, method: str, path: str, headers: dict = {},
+                                data: Union[str, bytes] = None) -> dict:
+        options: dict = {
+            **self._default_request_options,
+            'method': method,
+            'url': self._endpoint + path,
+        }
+
+        headers = {
+            **self._default_headers,
+            **headers,
+        }
+
+        if data:
+            options['data'] = data
+
+        if headers:
+            options['headers'] = headers
+
+        return options
@@ -0,0 +1,272 @@
+import threading
+import time
+
+from abc import ABC
+from abc import abstractmethod
+from collections import OrderedDict
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import FrozenSet
+from typing import Iterable
+from typing import NamedTuple
+from typing import Optional
+
+from .single_flight import SingleFlight
+
+
+class CacheEntry(NamedTuple):
+    value: Any
+    stored_at: float
+
+
+class CacheBackend(ABC):
+    """
+    Storage for cached API responses. Implement this to share a cache between processes (e.g. on Redis or memcached);
+    `stored_at` is a wall clock timestamp, so entries can be compared across hosts.
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[CacheEntry]:
+        raise NotImplementedError()
+
+    @abstractmethod
+    def set(self, key: str, entry: CacheEntry) -> None:
+        raise NotImplementedError()
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        raise NotImplementedError()
+
+
+class MemoryCacheBackend(CacheBackend):
+    _entries: Dict[str, CacheEntry]
+
+    def __init__(self) -> None:
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            return self._entries.get(key)
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        with self._lock:
+            self._entries[key] = entry
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+
+class TtlCache(object):
+    """
+    Time-based cache for API responses.
+
+    Entries younger than `ttl` seconds are served from the cache. For another `stale_ttl` seconds the stale entry is
+    still served, while a background thread refreshes it. Concurrent misses for the same key share a single load.
+    Cached values are shared between callers and should not be modified.
+    """
+    hits: int
+    stale_hits: int
+    misses: int
+    refreshes: int
+
+    _ttl: float
+    _stale_ttl: float
+    _backend: CacheBackend
+    _flights: SingleFlight
+
+    def __init__(self, ttl: float = 3600, stale_ttl: float = 0, backend: CacheBackend = None) -> None:
+        """
+        :param float ttl: Number of seconds an entry is fresh.
+        :param float stale_ttl: Number of seconds an expired entry may still be served while it is refreshed.
+        :param CacheBackend backend: Where to store entries; defaults to an in-memory backend.
+        """
+        self._ttl = ttl
+        self._stale_ttl = stale_ttl
+        self._backend = backend if backend is not None else MemoryCacheBackend()
+        self._flights = SingleFlight()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+
+    @property
+    def stats(self) -> dict:
+        return {
+            'hits': self.hits,
+            'stale_hits': self.stale_hits,
+            'misses': self.misses,
+            'refreshes': self.refreshes,
+        }
+
+    def get_or_load(self, key: str, loader: Callable[[], Any]) -> Any:
+        """
+        Get the value for `key`, calling `loader` to (re)load it when needed.
+
+        :raises Exception: Whatever `loader` raises when no usable entry is cached.
+        """
+        entry = self._backend.get(key)
+
+        if entry is not None:
+            age = time.time() - entry.stored_at
+
+            if age < self._ttl:
+                self._count('hits')
+                return entry.value
+
+            if age < self._ttl + self._stale_ttl:
+                self._count('stale_hits')
+                self._refresh_in_background(key, loader)
+                return entry.value
+
+        self._count('misses')
+        return self._load(key, loader)
+
+    def invalidate(self, key: str) -> None:
+        self._backend.delete(key)
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def _load(self, key: str, loader: Callable[[], Any]) -> Any:
+        def load() -> Any:
+            value = loader()
+            self._backend.set(key, CacheEntry(value, time.time()))
+            return value
+
+        return self._flights.do(key, load)
+
+    def _refresh_in_background(self, key: str, loader: Callable[[], Any]) -> None:
+        with self._lock:
+            if key in self._flights:
+                return
+            self.refreshes += 1
+
+        def refresh() -> None:
+            try:
+                self._load(key, loader)
+            except Exception:
+                # The stale entry keeps being served until a refresh succeeds or it expires.
+                pass
+
+        threading.Thread(target=refresh, name='ginger-cache-refresh', daemon=True).start()
+
+
+class OrderSnapshot(NamedTuple):
+    """
+    The last known state of an order, with the validators to ask the API whether it changed since.
+    """
+    order: dict
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+    def conditional_headers(self) -> dict:
+        headers = {}
+
+        if self.etag is not None:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified is not None:
+            headers['If-Modified-Since'] = self.last_modified
+
+        return headers
+
+
+class OrderCache(object):
+    """
+    Keeps the last fetched snapshot of up to `max_size` orders, evicting the least recently used ones.
+
+    `ApiClient.get_order` revalidates cached orders with a conditional request when the API sent an `ETag` or
+    `Last-Modified` header, so an unchanged order is not transferred and parsed again. Orders with a status in
+    `immutable_statuses` are served from the cache without asking the API at all; use `TERMINAL_STATUSES` when orders
+    in those statuses are not changed from elsewhere (e.g. refunded from the dashboard). Changes made through the same
+    `ApiClient` invalidate the order. Cached orders are shared between callers and should not be modified.
+    """
+    TERMINAL_STATUSES: FrozenSet[str] = frozenset({'completed', 'cancelled', 'expired', 'error'})
+
+    hits: int
+    revalidations: int
+    misses: int
+
+    _max_size: int
+    _immutable_statuses: FrozenSet[str]
+    _snapshots: 'OrderedDict[str, OrderSnapshot]'
+    _generation: int
+
+    def __init__(self, max_size: int = 1000, immutable_statuses: Iterable[str] = ()) -> None:
+        """
+        :param int max_size: Maximum number of orders to keep.
+        :param immutable_statuses: Statuses in which orders are assumed to never change.
+        """
+        if max_size < 1:
+            raise ValueError('max_size must be at least 1')
+
+        self._max_size = max_size
+        self._immutable_statuses = frozenset(immutable_statuses)
+        self._snapshots = OrderedDict()
+        self._generation = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.revalidations = 0
+        self.misses = 0
+
+    @property
+    def stats(self) -> dict:
+        return {
+            'hits': self.hits,
+            'revalidations': self.revalidations,
+            'misses': self.misses,
+        }
+
+    def __len__(self) -> int:
+        return len(self._snapshots)
+
+    def get_or_fetch(self, id: str, fetch: Callable[[dict], Optional[OrderSnapshot]]) -> Optional[dict]:
+        """
+        Get an order, calling `fetch` with the conditional request headers for the cached snapshot (if any) unless the
+        order is immutable. `fetch` returns the new snapshot, or None when the API reported the order was not modified.
+
+        :raises Exception: Whatever `fetch` raises.
+        """
+        with self._lock:
+            snapshot = self._snapshots.get(id)
+            generation = self._generation
+
+            if snapshot is not None:
+                self._snapshots.move_to_end(id)
+
+                if snapshot.order.get('status') in self._immutable_statuses:
+                    self.hits += 1
+                    return snapshot.order
+
+        fetched = fetch(snapshot.conditional_headers() if snapshot is not None else {})
+
+        with self._lock:
+            if fetched is None:
+                self.revalidations += 1
+                return snapshot.order if snapshot is not None else None
+
+            self.misses += 1
+
+            # Do not store what was fetched while a change through this client invalidated the order.
+            if generation == self._generation:
+                self._snapshots[id] = fetched
+                self._snapshots.move_to_end(id)
+
+                while len(self._snapshots) > self._max_size:
+                    self._snapshots.popitem(last=False)
+
+            return fetched.order
+
+    def invalidate(self, id: str) -> None:
+        with self._lock:
+            self._snapshots.pop(id, None)
+            self._generation += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._snapshots.clear()
+            self._generation += 1
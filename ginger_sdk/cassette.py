@@ -0,0 +1,264 @@
+import itertools
+import json
+import mmap
+import os
+import struct
+import threading
+import time
+
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import NamedTuple
+from typing import Optional
+from typing import Tuple
+from typing import Union
+
+from .hooks import path_template
+from .http_client import HttpClient
+from .http_client import HttpException
+from .http_client import HttpResponse
+from .http_client import response_status
+
+MAGIC = b'GCS1'
+
+# Per interaction: status, elapsed, and the lengths of the method, path, request body, response headers and body.
+_RECORD = struct.Struct('<HdBHIII')
+_NO_BODY = 0xFFFFFFFF
+
+
+class Interaction(NamedTuple):
+    """
+    A recorded request and its response. `body` is None when the response had no body.
+    """
+    method: str
+    path: str
+    request_body: bytes
+    status: Optional[int]
+    headers: Dict[str, str]
+    body: Optional[bytes]
+    elapsed: Optional[float]
+
+
+def _encode(interaction: Interaction) -> bytes:
+    method = interaction.method.encode('ascii')
+    path = interaction.path.encode('utf-8')
+    headers = json.dumps(interaction.headers, separators=(',', ':')).encode('utf-8') if interaction.headers else b''
+    body = interaction.body if interaction.body is not None else b''
+
+    return b''.join([
+        _RECORD.pack(
+            interaction.status or 0,
+            interaction.elapsed if interaction.elapsed is not None else -1.0,
+            len(method),
+            len(path),
+            len(interaction.request_body),
+            len(headers),
+            len(body) if interaction.body is not None else _NO_BODY,
+        ),
+        method,
+        path,
+        interaction.request_body,
+        headers,
+        body,
+    ])
+
+
+def read_cassette(path: str) -> Iterator[Interaction]:
+    """
+    Read the interactions recorded in a cassette file, in the order they were recorded.
+
+    :raises ValueError: When the file is not a cassette.
+    """
+    with open(path, 'rb') as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return
+
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            for _, interaction in _scan(data):
+                yield interaction
+
+
+def _scan(data: Union[bytes, mmap.mmap]) -> Iterator[Tuple[int, Interaction]]:
+    """
+    Parse the interactions in cassette data, with the offset of each response body.
+    """
+    if data[:len(MAGIC)] != MAGIC:
+        raise ValueError('Not a cassette file')
+
+    offset = len(MAGIC)
+    size = len(data)
+
+    while offset + _RECORD.size <= size:
+        status, elapsed, method_size, path_size, request_size, headers_size, body_size = \
+            _RECORD.unpack_from(data, offset)
+        has_body = body_size != _NO_BODY
+        body_size = body_size if has_body else 0
+
+        if offset + _RECORD.size + method_size + path_size + request_size + headers_size + body_size > size:
+            # A record cut short by a crash while recording.
+            return
+
+        offset += _RECORD.size
+        method = data[offset:offset + method_size].decode('ascii')
+        offset += method_size
+        path = data[offset:offset + path_size].decode('utf-8')
+        offset += path_size
+        request_body = data[offset:offset + request_size]
+        offset += request_size
+        headers = json.loads(data[offset:offset + headers_size]) if headers_size else {}
+        offset += headers_size
+        body_offset = offset
+        body = data[offset:offset + body_size] if has_body else None
+        offset += body_size
+
+        yield body_offset, Interaction(
+            method,
+            path,
+            request_body,
+            status or None,
+            headers,
+            body,
+            elapsed if elapsed >= 0 else None,
+        )
+
+
+class RecordingHttpClient(HttpClient):
+    """
+    Wraps another HTTP client and appends every request and its response to a cassette file, for `ReplayHttpClient`.
+
+    Recording appends to an existing cassette, and each interaction is written with a single write, so an interrupted
+    recording leaves all earlier interactions readable. Request bodies are stored as sent, so a cassette can contain
+    customer data; authentication headers are not part of the recorded requests.
+    """
+    _http_client: HttpClient
+    _path: str
+
+    def __init__(self, http_client: HttpClient, path: str) -> None:
+        """
+        :param HttpClient http_client: The HTTP client to send requests with.
+        :param str path: The cassette file to append to; it is created when it does not exist.
+        """
+        self._http_client = http_client
+        self._path = path
+        self._file = open(path, 'ab')
+        self._lock = threading.Lock()
+
+        if self._file.tell() == 0:
+            self._file.write(MAGIC)
+            self._file.flush()
+
+    def request(self, method: str, path: str, headers: dict = {}, data: Union[str, bytes] = None,
+                timeout: float = None) -> Union[str, bytes, None]:
+        options = {} if timeout is None else {'timeout': timeout}
+        response = self._http_client.request(method, path, headers, data, **options)
+
+        if response is None:
+            body = None
+        else:
+            body = response.encode('utf-8') if isinstance(response, str) else bytes(response)
+
+        record = _encode(Interaction(
+            method,
+            path,
+            data.encode('utf-8') if isinstance(data, str) else (data or b''),
+            response_status(response),
+            dict(getattr(response, 'headers', {})),
+            body,
+            getattr(response, 'elapsed', None),
+        ))
+
+        with self._lock:
+            self._file.write(record)
+            self._file.flush()
+
+        return response
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+
+        self._http_client.close()
+
+
+class ReplayHttpClient(HttpClient):
+    """
+    Serves the responses recorded in a cassette instead of sending requests.
+
+    Requests are matched on method and path, or on method and path template (e.g. `/orders/{id}/`) with
+    `match_templates`, so recorded responses can be replayed for other orders. When a request was recorded more than
+    once, its responses are served in turn, starting over after the last one. The cassette is memory-mapped, so large
+    captures are not read into memory; each response body is copied out when it is served.
+    """
+    _latency: Optional[float]
+    _recorded_latency: bool
+    _match_templates: bool
+    _responses: Dict[Tuple[str, str], List[Tuple[Optional[int], Dict[str, str], int, Optional[int], Optional[float]]]]
+    _turns: Dict[Tuple[str, str], Iterator[int]]
+
+    def __init__(self, path: str, latency: float = None, recorded_latency: bool = False,
+                 match_templates: bool = False) -> None:
+        """
+        :param str path: The cassette file to replay.
+        :param float latency: Seconds to delay every response.
+        :param bool recorded_latency: Delay every response as long as it took when it was recorded.
+        :param bool match_templates: Match requests on their path template instead of the exact path.
+        :raises ValueError: When the file is not a cassette.
+        """
+        self._latency = latency
+        self._recorded_latency = recorded_latency
+        self._match_templates = match_templates
+        self._responses = {}
+        self._turns = {}
+
+        with open(path, 'rb') as file:
+            size = os.fstat(file.fileno()).st_size
+            self._data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) if size else b''
+
+        for body_offset, interaction in _scan(self._data):
+            self._responses.setdefault(self._key(interaction.method, interaction.path), []).append((
+                interaction.status,
+                interaction.headers,
+                body_offset,
+                len(interaction.body) if interaction.body is not None else None,
+                interaction.elapsed,
+            ))
+
+        for key, responses in self._responses.items():
+            self._turns[key] = itertools.cycle(range(len(responses)))
+
+    def __len__(self) -> int:
+        return sum(len(responses) for responses in self._responses.values())
+
+    def request(self, method: str, path: str, headers: dict = {}, data: Union[str, bytes] = None,
+                timeout: float = None) -> Optional[HttpResponse]:
+        """
+        :raises HttpException: When no response was recorded for the request, or its delay exceeds `timeout`.
+        """
+        key = self._key(method, path)
+        responses = self._responses.get(key)
+
+        if responses is None:
+            raise HttpException('No recorded response for {} {}'.format(method, path))
+
+        status, response_headers, offset, size, elapsed = responses[next(self._turns[key])]
+        delay = elapsed if self._recorded_latency else self._latency
+
+        if delay and timeout is not None and delay > timeout:
+            time.sleep(timeout)
+            raise HttpException('Replayed response for {} {} took longer than the timeout'.format(method, path))
+
+        if delay:
+            time.sleep(delay)
+
+        if size is None:
+            return None
+
+        return HttpResponse(self._data[offset:offset + size], status, response_headers, elapsed)
+
+    def close(self) -> None:
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+
+    def _key(self, method: str, path: str) -> Tuple[str, str]:
+        return method, path_template(path) if self._match_templates else path
@@ -0,0 +1,181 @@
+import threading
+import time
+
+from collections import deque
+from typing import Callable
+from typing import Deque
+from typing import Optional
+from typing import Union
+
+from .api_client import HttpRequestError
+from .http_client import HttpClient
+from .http_client import HttpException
+from .http_client import HttpStream
+from .http_client import Response
+from .http_client import response_status
+
+
+class CircuitOpenError(HttpRequestError):
+    """
+    Raised instead of sending a request while the circuit breaker is open.
+    """
+    pass
+
+
+class CircuitBreaker(object):
+    """
+    Tracks the outcome of recent requests and stops sending requests while too many of them fail.
+
+    The breaker is closed while the failure rate over the last `window_size` requests stays below
+    `failure_rate_threshold`. Once it is exceeded the breaker opens and rejects requests for `open_timeout` seconds.
+    It then goes half-open and lets `half_open_max_calls` trial requests through: if they all succeed it closes again,
+    otherwise it opens for another `open_timeout` seconds.
+    """
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half-open'
+
+    _failure_rate_threshold: float
+    _minimum_calls: int
+    _open_timeout: float
+    _half_open_max_calls: int
+    _outcomes: Deque[bool]
+    _state: str
+    _opened_at: float
+    _half_open_calls: int
+    _half_open_successes: int
+
+    def __init__(self, failure_rate_threshold: float = 0.5, window_size: int = 20, minimum_calls: int = 10,
+                 open_timeout: float = 30.0, half_open_max_calls: int = 1) -> None:
+        """
+        :param float failure_rate_threshold: Fraction of failed requests (0-1) at which the breaker opens.
+        :param int window_size: Number of most recent requests the failure rate is computed over.
+        :param int minimum_calls: Number of requests needed in the window before the breaker can open.
+        :param float open_timeout: Seconds the breaker stays open before letting trial requests through.
+        :param int half_open_max_calls: Number of successful trial requests needed to close the breaker.
+        """
+        self._failure_rate_threshold = failure_rate_threshold
+        self._minimum_calls = min(minimum_calls, window_size)
+        self._open_timeout = open_timeout
+        self._half_open_max_calls = half_open_max_calls
+        self._outcomes = deque(maxlen=window_size)
+        self._state = self.CLOSED
+        self._opened_at = 0.0
+        self._half_open_calls = 0
+        self._half_open_successes = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            self._update_state()
+            return self._state
+
+    def allow_request(self) -> bool:
+        with self._lock:
+            self._update_state()
+
+            if self._state == self.CLOSED:
+                return True
+
+            if self._state == self.HALF_OPEN and self._half_open_calls < self._half_open_max_calls:
+                self._half_open_calls += 1
+                return True
+
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._state == self.HALF_OPEN:
+                self._half_open_successes += 1
+                if self._half_open_successes >= self._half_open_max_calls:
+                    self._state = self.CLOSED
+                    self._outcomes.clear()
+                return
+
+            self._outcomes.append(True)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            if self._state == self.HALF_OPEN:
+                self._open()
+                return
+
+            self._outcomes.append(False)
+
+            if len(self._outcomes) >= self._minimum_calls:
+                failure_rate = self._outcomes.count(False) / len(self._outcomes)
+                if failure_rate >= self._failure_rate_threshold:
+                    self._open()
+
+    def record_ignored(self) -> None:
+        """
+        Record a request whose outcome says nothing about the API, e.g. one that was never sent. A trial request the
+        breaker let through while half-open is given back.
+        """
+        with self._lock:
+            if self._state == self.HALF_OPEN and self._half_open_calls > 0:
+                self._half_open_calls -= 1
+
+    def _open(self) -> None:
+        self._state = self.OPEN
+        self._opened_at = time.monotonic()
+
+    def _update_state(self) -> None:
+        if self._state == self.OPEN and time.monotonic() - self._opened_at >= self._open_timeout:
+            self._state = self.HALF_OPEN
+            self._half_open_calls = 0
+            self._half_open_successes = 0
+
+
+class CircuitBreakerHttpClient(HttpClient):
+    """
+    Wraps another HTTP client and fails fast with `CircuitOpenError` while its `CircuitBreaker` is open.
+
+    Transport errors (`HttpException`, `OSError`) and 5xx responses count as failures. Other exceptions, such as the
+    `RateLimitExceeded` of a rate limiter, do not count at all.
+    """
+    _http_client: HttpClient
+    _breaker: CircuitBreaker
+
+    def __init__(self, http_client: HttpClient, breaker: CircuitBreaker = None) -> None:
+        self._http_client = http_client
+        self._breaker = breaker if breaker is not None else CircuitBreaker()
+
+    def request(self, method: str, path: str, headers: dict = {}, data: Union[str, bytes] = None,
+                timeout: float = None) -> Union[str, bytes, None]:
+        return self._send(self._http_client.request, method, path, headers, data, timeout)
+
+    def stream(self, method: str, path: str, headers: dict = {}, data: Union[str, bytes] = None,
+               timeout: float = None) -> HttpStream:
+        """
+        Like `request`; only the response status counts, errors while the body is read do not.
+        """
+        return self._send(self._http_client.stream, method, path, headers, data, timeout)
+
+    def close(self) -> None:
+        self._http_client.close()
+
+    def _send(self, send: Callable[..., Response], method: str, path: str, headers: dict,
+              data: Union[str, bytes, None], timeout: Optional[float]) -> Response:
+        if not self._breaker.allow_request():
+            raise CircuitOpenError('Circuit breaker is open; not sending {} {}'.format(method, path))
+
+        options = {} if timeout is None else {'timeout': timeout}
+
+        try:
+            response = send(method, path, headers, data, **options)
+        except (HttpException, OSError):
+            self._breaker.record_failure()
+            raise
+        except Exception:
+            self._breaker.record_ignored()
+            raise
+
+        status = response_status(response)
+        if status is not None and status >= 500:
+            self._breaker.record_failure()
+        else:
+            self._breaker.record_success()
+
+        return response
@@ -0,0 +1,216 @@
+import threading
+
+from collections import OrderedDict
+from typing import Dict
+from typing import List
+from typing import NamedTuple
+from typing import Optional
+from typing import Union
+
+from .api_client import ApiClient
+from .circuit_breaker import CircuitBreaker
+from .circuit_breaker import CircuitBreakerHttpClient
+from .codec import JsonCodec
+from .codec import default_codec
+from .hooks import RequestHook
+from .http_client import HttpClient
+from .http_client import HttpStream
+from .http_client import basic_authorization
+from .metrics import MetricsCollector
+from .rate_limit import RateLimitedHttpClient
+from .rate_limit import RateLimiter
+from .rate_limit import TokenBucket
+from .retry import RetryPolicy
+from .retry import RetryingHttpClient
+
+
+class MerchantHttpClient(HttpClient):
+    """
+    A view of a shared HTTP client that authenticates every request with the API key of one merchant.
+
+    The shared client must be created without an API key. Closing the view leaves the shared client open.
+    """
+    _http_client: HttpClient
+    _authorization: str
+
+    def __init__(self, http_client: HttpClient, api_key: str) -> None:
+        self._http_client = http_client
+        self._authorization = basic_authorization(api_key)
+
+    def request(self, method: str, path: str, headers: dict = {}, data: Union[str, bytes] = None,
+                timeout: float = None) -> Union[str, bytes, None]:
+        options = {} if timeout is None else {'timeout': timeout}
+        headers = {**headers, 'Authorization': self._authorization}
+
+        return self._http_client.request(method, path, headers, data, **options)
+
+    def stream(self, method: str, path: str, headers: dict = {}, data: Union[str, bytes] = None,
+               timeout: float = None) -> HttpStream:
+        options = {} if timeout is None else {'timeout': timeout}
+        headers = {**headers, 'Authorization': self._authorization}
+
+        return self._http_client.stream(method, path, headers, data, **options)
+
+    def close(self) -> None:
+        pass
+
+
+class _Merchant(NamedTuple):
+    api_key: str
+    client: ApiClient
+    metrics: Optional[MetricsCollector]
+
+
+class ClientPool(object):
+    """
+    Hands out API clients for many merchants, each with its own API key, that all send their requests through one
+    shared HTTP client and its connection pool.
+
+    Creating a merchant's client only wraps the shared HTTP client, so it is cheap; the most recently used `max_clients`
+    clients are kept for reuse, together with their rate limiter and metrics. A client that is evicted keeps working,
+    but the next `client()` call for its merchant creates a new one with a fresh rate limit and empty metrics.
+
+    The retry policy (with its retry budget) and circuit breaker are shared by all merchants, since they protect the
+    API rather than a single merchant.
+    """
+    _http_client: HttpClient
+    _max_clients: int
+    _rate_limit: Optional[float]
+    _burst: Optional[float]
+    _metrics: bool
+    _codec: JsonCodec
+    _models: bool
+    _hooks: List[RequestHook]
+    _retry_policy: Optional[RetryPolicy]
+    _circuit_breaker: Optional[CircuitBreaker]
+    _merchants: 'OrderedDict[str, _Merchant]'
+    _stats: Dict[str, int]
+
+    def __init__(self, http_client: HttpClient, max_clients: int = 1000, rate_limit: float = None,
+                 burst: float = None, metrics: bool = False, codec: JsonCodec = None, models: bool = False,
+                 hooks: List[RequestHook] = None, retry_policy: RetryPolicy = None,
+                 circuit_breaker: CircuitBreaker = None) -> None:
+        """
+        :param HttpClient http_client: The shared HTTP client, created without an API key.
+        :param int max_clients: Maximum number of merchant clients to keep.
+        :param float rate_limit: Maximum number of requests per second per merchant; None for no limit.
+        :param float burst: Number of requests a merchant may send at once; defaults to `rate_limit`.
+        :param bool metrics: Keep a `MetricsCollector` per merchant, available through `metrics()`.
+        :param JsonCodec codec: JSON codec to use; defaults to the fastest one available.
+        :param bool models: Return orders, refunds and issuers as `ginger_sdk.models` objects instead of dicts.
+        :param hooks: Request hooks to instrument the requests of all merchants with.
+        :param RetryPolicy retry_policy: Optional policy to retry failed requests with.
+        :param CircuitBreaker circuit_breaker: Optional circuit breaker to fail fast while the API is unhealthy.
+        """
+        if max_clients < 1:
+            raise ValueError('max_clients must be at least 1')
+
+        self._http_client = http_client
+        self._max_clients = max_clients
+        self._rate_limit = rate_limit
+        self._burst = burst
+        self._metrics = metrics
+        self._codec = codec if codec is not None else default_codec()
+        self._models = models
+        self._hooks = list(hooks or [])
+        self._retry_policy = retry_policy
+        self._circuit_breaker = circuit_breaker
+        self._merchants = OrderedDict()
+        self._stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._merchants)
+
+    def __contains__(self, merchant_id: str) -> bool:
+        return merchant_id in self._merchants
+
+    @property
+    def stats(self) -> dict:
+        with self._lock:
+            return dict(self._stats)
+
+    def client(self, merchant_id: str, api_key: str) -> ApiClient:
+        """
+        Get the API client of a merchant. A new client is created when the merchant has none, or when its API key
+        changed.
+        """
+        with self._lock:
+            merchant = self._merchants.get(merchant_id)
+
+            if merchant is not None and merchant.api_key == api_key:
+                self._merchants.move_to_end(merchant_id)
+                self._stats['hits'] += 1
+                return merchant.client
+
+            self._stats['misses'] += 1
+
+        # Created outside the lock; when two threads race, the last one to finish is kept.
+        merchant = self._create(api_key)
+
+        with self._lock:
+            self._merchants[merchant_id] = merchant
+            self._merchants.move_to_end(merchant_id)
+
+            while len(self._merchants) > self._max_clients:
+                self._merchants.popitem(last=False)
+                self._stats['evictions'] += 1
+
+        return merchant.client
+
+    def metrics(self, merchant_id: str) -> Optional[MetricsCollector]:
+        """
+        Get the metrics of a merchant, or None when the pool keeps no metrics or has no client for the merchant.
+        """
+        merchant = self._merchants.get(merchant_id)
+        return merchant.metrics if merchant is not None else None
+
+    def remove(self, merchant_id: str) -> None:
+        """
+        Forget the client of a merchant, e.g. when its API key was revoked.
+        """
+        with self._lock:
+            self._merchants.pop(merchant_id, None)
+
+    def close(self) -> None:
+        """
+        Close the shared HTTP client and release its pooled connections.
+        """
+        with self._lock:
+            self._merchants.clear()
+
+        self._http_client.close()
+
+    def __enter__(self) -> 'ClientPool':
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def _create(self, api_key: str) -> _Merchant:
+        http_client: HttpClient = MerchantHttpClient(self._http_client, api_key)
+
+        # A merchant's rate limit goes outside the shared circuit breaker, so one merchant running into its own limit
+        # does not open the breaker for everyone.
+        if self._circuit_breaker is not None:
+            http_client = CircuitBreakerHttpClient(http_client, self._circuit_breaker)
+
+        if self._rate_limit is not None:
+            bucket = TokenBucket(self._rate_limit, self._burst)
+            http_client = RateLimitedHttpClient(http_client, RateLimiter(bucket))
+
+        if self._retry_policy is not None:
+            http_client = RetryingHttpClient(http_client, self._retry_policy)
+
+        metrics = MetricsCollector() if self._metrics else None
+
+        return _Merchant(
+            api_key,
+            ApiClient(
+                http_client,
+                codec=self._codec,
+                models=self._models,
+                hooks=self._hooks + [metrics] if metrics is not None else self._hooks,
+            ),
+            metrics,
+        )
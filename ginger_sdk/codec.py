@@ -0,0 +1,70 @@
+import importlib.util
+import json
+
+from abc import ABC
+from abc import abstractmethod
+from typing import Any
+from typing import Union
+
+
+class JsonCodec(ABC):
+    """
+    Encodes request data to and decodes response bodies from JSON.
+
+    Decode errors must be raised as `json.JSONDecodeError` (or a subclass of it).
+    """
+
+    @abstractmethod
+    def encode(self, data: Any) -> Union[str, bytes]:
+        raise NotImplementedError()
+
+    @abstractmethod
+    def decode(self, body: Union[str, bytes]) -> Any:
+        raise NotImplementedError()
+
+
+class StdlibJsonCodec(JsonCodec):
+    def encode(self, data: Any) -> str:
+        return json.dumps(data)
+
+    def decode(self, body: Union[str, bytes]) -> Any:
+        return json.loads(body)
+
+
+class OrjsonCodec(JsonCodec):
+    """
+    Codec on top of orjson, which encodes straight to UTF-8 bytes and parses bytes without decoding them to `str`.
+
+    orjson is only imported once a codec is created, so importing the SDK stays fast.
+    """
+
+    def __init__(self) -> None:
+        try:
+            import orjson
+        except ImportError as exception:
+            raise ImportError(
+                'OrjsonCodec requires orjson; install it with `pip install ginger-sdk[fast-json]`'
+            ) from exception
+
+        self._dumps = orjson.dumps
+        self._loads = orjson.loads
+
+    def encode(self, data: Any) -> bytes:
+        return self._dumps(data)
+
+    def decode(self, body: Union[str, bytes]) -> Any:
+        if isinstance(body, bytes) and type(body) is not bytes:
+            # orjson only accepts exact bytes; a memoryview passes subclasses such as HttpResponse without a copy.
+            return self._loads(memoryview(body))
+
+        return self._loads(body)
+
+
+def default_codec() -> JsonCodec:
+    """
+    Get the fastest codec available: orjson when it is installed, the standard library otherwise.
+    """
+    if importlib.util.find_spec('orjson') is not None:
+        return OrjsonCodec()
+
+    return StdlibJsonCodec()
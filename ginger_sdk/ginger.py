@@ -1,31 +1,209 @@
-import platform
+from typing import List
+from typing import Optional
 
 from .api_client import ApiClient
+from .async_api_client import AsyncApiClient
+from .async_http_client import AiohttpHttpClient
+from .cache import OrderCache
+from .cache import TtlCache
+from .circuit_breaker import CircuitBreaker
+from .circuit_breaker import CircuitBreakerHttpClient
+from .client_pool import ClientPool
+from .codec import JsonCodec
+from .codec import default_codec
+from .hooks import RequestHook
+from .http_client import HttpClient
 from .http_client import RequestsHttpClient
+from .http_client import Urllib3HttpClient
+from .rate_limit import RateLimitedHttpClient
+from .rate_limit import RateLimiter
+from .retry import RetryPolicy
+from .retry import RetryingHttpClient
 
 
 class Ginger(object):
     CLIENT_VERSION = '2.1.3'
     API_VERSION = 'v1'
+    TRANSPORTS = {
+        'requests': RequestsHttpClient,
+        'urllib3': Urllib3HttpClient,
+    }
+
+    _USER_AGENT: Optional[str] = None
 
     @staticmethod
-    def create_client(endpoint: str, api_key: str, default_headers: dict = {}) -> ApiClient:
+    def create_client(endpoint: str, api_key: str, default_headers: dict = {},
+                      pool_connections: int = RequestsHttpClient.DEFAULT_POOL_CONNECTIONS,
+                      pool_maxsize: int = RequestsHttpClient.DEFAULT_POOL_MAXSIZE,
+                      connect_timeout: Optional[float] = RequestsHttpClient.DEFAULT_CONNECT_TIMEOUT,
+                      read_timeout: Optional[float] = RequestsHttpClient.DEFAULT_READ_TIMEOUT,
+                      cache: TtlCache = None, retry_policy: RetryPolicy = None,
+                      circuit_breaker: CircuitBreaker = None, codec: JsonCodec = None,
+                      models: bool = False, hooks: List[RequestHook] = None,
+                      rate_limiter: RateLimiter = None, transport: str = 'requests',
+                      order_cache: OrderCache = None, coalesce_gets: bool = False,
+                      compress_requests_above: int = None) -> ApiClient:
         """
         Create a new API client.
+
+        The client keeps its connections alive between calls; call `close()` on it (or use it as a context manager)
+        when it is no longer needed.
+
+        :param int pool_connections: Number of per-host connection pools to keep.
+        :param int pool_maxsize: Maximum number of keep-alive connections to keep per host.
+        :param float connect_timeout: Seconds to wait for a connection to be established; None to wait forever.
+        :param float read_timeout: Seconds to wait for the server to send data; None to wait forever.
+        :param TtlCache cache: Optional cache for rarely changing data, such as the iDEAL issuers.
+        :param RetryPolicy retry_policy: Optional policy to retry failed requests with.
+        :param CircuitBreaker circuit_breaker: Optional circuit breaker to fail fast while the API is unhealthy.
+        :param JsonCodec codec: JSON codec to use; defaults to the fastest one available.
+        :param bool models: Return orders, refunds and issuers as `ginger_sdk.models` objects instead of dicts.
+        :param hooks: Request hooks to instrument requests with, e.g. a `ginger_sdk.metrics.MetricsCollector`.
+        :param RateLimiter rate_limiter: Optional rate limiter to pace requests with; retries are paced as well.
+        :param str transport: HTTP library to send requests with: 'requests', or 'urllib3' for less overhead per
+            request.
+        :param OrderCache order_cache: Optional cache of orders, which `get_order` only fetches again when they changed.
+        :param bool coalesce_gets: Let concurrent identical GET requests share a single request to the API.
+        :param int compress_requests_above: Gzip request bodies larger than this number of bytes; only use this when
+            the API accepts compressed requests.
+        :raises ValueError: When the transport is unknown.
         """
+        if transport not in Ginger.TRANSPORTS:
+            raise ValueError('Unknown transport {!r}; use one of {}'.format(transport, ', '.join(Ginger.TRANSPORTS)))
+
+        http_client: HttpClient = Ginger.TRANSPORTS[transport](
+            endpoint + '/' + Ginger.API_VERSION,
+            api_key,
+            {
+                **default_headers,
+                **{'User-Agent': Ginger._user_agent()}
+            },
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            connect_timeout=connect_timeout,
+            read_timeout=read_timeout,
+        )
+
+        # The rate limiter goes outside the circuit breaker, so requests it holds back are not counted as failures.
+        if circuit_breaker is not None:
+            http_client = CircuitBreakerHttpClient(http_client, circuit_breaker)
+
+        if rate_limiter is not None:
+            http_client = RateLimitedHttpClient(http_client, rate_limiter)
+
+        if retry_policy is not None:
+            http_client = RetryingHttpClient(http_client, retry_policy)
+
         return ApiClient(
-            RequestsHttpClient(
+            http_client,
+            cache=cache,
+            codec=codec if codec is not None else default_codec(),
+            models=models,
+            hooks=hooks,
+            order_cache=order_cache,
+            coalesce_gets=coalesce_gets,
+            compress_requests_above=compress_requests_above,
+        )
+
+    @staticmethod
+    def create_client_pool(endpoint: str, default_headers: dict = {}, max_clients: int = 1000,
+                           pool_connections: int = RequestsHttpClient.DEFAULT_POOL_CONNECTIONS,
+                           pool_maxsize: int = RequestsHttpClient.DEFAULT_POOL_MAXSIZE,
+                           connect_timeout: Optional[float] = RequestsHttpClient.DEFAULT_CONNECT_TIMEOUT,
+                           read_timeout: Optional[float] = RequestsHttpClient.DEFAULT_READ_TIMEOUT,
+                           transport: str = 'requests', rate_limit: float = None, burst: float = None,
+                           metrics: bool = False, codec: JsonCodec = None, models: bool = False,
+                           hooks: List[RequestHook] = None, retry_policy: RetryPolicy = None,
+                           circuit_breaker: CircuitBreaker = None) -> ClientPool:
+        """
+        Create a pool of API clients for many merchants, which share one HTTP client and its connections. Get the
+        client of a merchant with `pool.client(merchant_id, api_key)`.
+
+        Close the pool when it is no longer needed, or use it as a context manager.
+
+        :param int max_clients: Maximum number of merchant clients to keep.
+        :param int pool_connections: Number of per-host connection pools to keep.
+        :param int pool_maxsize: Maximum number of keep-alive connections to keep per host, for all merchants together.
+        :param float connect_timeout: Seconds to wait for a connection to be established; None to wait forever.
+        :param float read_timeout: Seconds to wait for the server to send data; None to wait forever.
+        :param str transport: HTTP library to send requests with: 'requests' or 'urllib3'.
+        :param float rate_limit: Maximum number of requests per second per merchant; None for no limit.
+        :param float burst: Number of requests a merchant may send at once; defaults to `rate_limit`.
+        :param bool metrics: Keep a `MetricsCollector` per merchant, available through `pool.metrics(merchant_id)`.
+        :param JsonCodec codec: JSON codec to use; defaults to the fastest one available.
+        :param bool models: Return orders, refunds and issuers as `ginger_sdk.models` objects instead of dicts.
+        :param hooks: Request hooks to instrument the requests of all merchants with.
+        :param RetryPolicy retry_policy: Optional policy to retry failed requests with, shared by all merchants.
+        :param CircuitBreaker circuit_breaker: Optional circuit breaker, shared by all merchants.
+        :raises ValueError: When the transport is unknown.
+        """
+        if transport not in Ginger.TRANSPORTS:
+            raise ValueError('Unknown transport {!r}; use one of {}'.format(transport, ', '.join(Ginger.TRANSPORTS)))
+
+        return ClientPool(
+            Ginger.TRANSPORTS[transport](
+                endpoint + '/' + Ginger.API_VERSION,
+                None,
+                {
+                    **default_headers,
+                    **{'User-Agent': Ginger._user_agent()}
+                },
+                pool_connections=pool_connections,
+                pool_maxsize=pool_maxsize,
+                connect_timeout=connect_timeout,
+                read_timeout=read_timeout,
+            ),
+            max_clients=max_clients,
+            rate_limit=rate_limit,
+            burst=burst,
+            metrics=metrics,
+            codec=codec,
+            models=models,
+            hooks=hooks,
+            retry_policy=retry_policy,
+            circuit_breaker=circuit_breaker,
+        )
+
+    @staticmethod
+    def create_async_client(endpoint: str, api_key: str, default_headers: dict = {},
+                            limit: int = AiohttpHttpClient.DEFAULT_LIMIT,
+                            limit_per_host: int = AiohttpHttpClient.DEFAULT_LIMIT_PER_HOST,
+                            codec: JsonCodec = None, coalesce_gets: bool = False) -> AsyncApiClient:
+        """
+        Create a new asyncio API client. Requires the aiohttp package.
+
+        The client keeps its HTTP connections alive between calls; await `close()` on it (or use it as an async
+        context manager) when it is no longer needed.
+
+        :param int limit: Maximum number of simultaneous connections; 0 means unlimited.
+        :param int limit_per_host: Maximum number of simultaneous connections per host; 0 means unlimited.
+        :param JsonCodec codec: JSON codec to use; defaults to the fastest one available.
+        :param bool coalesce_gets: Let concurrent identical GET requests share a single request to the API.
+        """
+        return AsyncApiClient(
+            AiohttpHttpClient(
                 endpoint + '/' + Ginger.API_VERSION,
                 api_key,
                 {
                     **default_headers,
-                    **{
-                        'User-Agent': 'Ginger-Python/{} ({}; Python {})'.format(
-                            Ginger.CLIENT_VERSION,
-                            platform.system(),
-                            platform.python_version(),
-                        )
-                    }
-                }
-            )
+                    **{'User-Agent': Ginger._user_agent()}
+                },
+                limit=limit,
+                limit_per_host=limit_per_host,
+            ),
+            codec=codec if codec is not None else default_codec(),
+            coalesce_gets=coalesce_gets,
         )
+
+    @staticmethod
+    def _user_agent() -> str:
+        if Ginger._USER_AGENT is None:
+            import platform
+
+            Ginger._USER_AGENT = 'Ginger-Python/{} ({}; Python {})'.format(
+                Ginger.CLIENT_VERSION,
+                platform.system(),
+                platform.python_version(),
+            )
+
+        return Ginger._USER_AGENT
@@ -0,0 +1,79 @@
+import logging
+import re
+
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+_ID_SEGMENT = re.compile(r'/(?:[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}|\d+)(?=/|$)')
+
+
+def path_template(path: str) -> str:
+    """
+    Get the template of an API path, with IDs replaced by `{id}` and the query string removed, so requests to the same
+    endpoint can be grouped. E.g. `/orders/fcbfdd3a-ea2c-4240-96b2-613d49b79a55/refunds/` becomes
+    `/orders/{id}/refunds/`.
+    """
+    return _ID_SEGMENT.sub('/{id}', path.split('?', 1)[0])
+
+
+class RequestEvent(object):
+    """
+    Describes a request sent by `ApiClient.send`; hooks receive the same event in every callback for a request.
+
+    `ttfb` is the time until the response headers were received, when the HTTP client reports it (the built-in clients
+    do); `total` includes reading and decoding the response. Both are in seconds.
+
+    `request_bytes` and `response_bytes` are the sizes of the uncompressed bodies; `request_wire_bytes` and
+    `response_wire_bytes` are the sizes that were actually transferred, which are smaller when a body was compressed.
+    """
+    __slots__ = ('method', 'path', 'path_template', 'status', 'request_bytes', 'response_bytes', 'request_wire_bytes',
+                 'response_wire_bytes', 'ttfb', 'total')
+
+    method: str
+    path: str
+    path_template: str
+    status: Optional[int]
+    request_bytes: int
+    response_bytes: int
+    request_wire_bytes: int
+    response_wire_bytes: int
+    ttfb: Optional[float]
+    total: Optional[float]
+
+    def __init__(self, method: str, path: str, request_bytes: int = 0, request_wire_bytes: int = None) -> None:
+        self.method = method
+        self.path = path
+        self.path_template = path_template(path)
+        self.status = None
+        self.request_bytes = request_bytes
+        self.response_bytes = 0
+        self.request_wire_bytes = request_wire_bytes if request_wire_bytes is not None else request_bytes
+        self.response_wire_bytes = 0
+        self.ttfb = None
+        self.total = None
+
+
+class RequestHook(object):
+    """
+    Base class for request instrumentation; override the callbacks you need.
+
+    Exceptions raised by hooks are logged and otherwise ignored, so instrumentation can never fail a request.
+    """
+
+    def before_request(self, event: RequestEvent) -> None:
+        pass
+
+    def after_response(self, event: RequestEvent) -> None:
+        pass
+
+    def on_error(self, event: RequestEvent, exception: Exception) -> None:
+        pass
+
+
+def call_hooks(hooks: list, callback: str, *args) -> None:
+    for hook in hooks:
+        try:
+            getattr(hook, callback)(*args)
+        except Exception:
+            logger.exception('Request hook %r failed in %s', hook, callback)
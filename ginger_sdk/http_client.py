@@ -1,68 +1,571 @@
+import base64
+import importlib
+import json
+import time
+
 from abc import ABC
 from abc import abstractmethod
+from typing import Any
+from typing import Callable
+from typing import Iterable
+from typing import Iterator
+from typing import Mapping
 from typing import Optional
+from typing import TYPE_CHECKING
+from typing import TypeVar
+from typing import Union
+
+if TYPE_CHECKING:  # pragma: no cover
+    import http.cookiejar
+
+    import requests
+    import urllib3
+
 
-import requests
+def __getattr__(name: str) -> Any:
+    # requests takes longer to import than the rest of the SDK together, so it is only imported once a
+    # RequestsHttpClient is used; `ginger_sdk.http_client.requests` keeps working for code that patches it. Python 3.6
+    # does not call a module's `__getattr__`, so there the attribute is only set once a RequestsHttpClient is created.
+    if name == 'requests':
+        return importlib.import_module('requests')
+
+    raise AttributeError('module {!r} has no attribute {!r}'.format(__name__, name))
 
 
 class HttpException(Exception):
     pass
 
 
+class HttpResponse(bytes):
+    """
+    Raw response body as returned by `HttpClient.request`, with the response status and headers attached.
+
+    It is plain `bytes` for everything that only needs the body; wrappers such as the retrying client use the extra
+    attributes when they are available.
+    """
+    status_code: Optional[int]
+    headers: Mapping[str, str]
+    elapsed: Optional[float]
+    wire_size: Optional[int]
+
+    def __new__(cls, body: bytes, status_code: int = None, headers: Mapping[str, str] = None,
+                elapsed: float = None, wire_size: int = None) -> 'HttpResponse':
+        """
+        :param float elapsed: Seconds between sending the request and receiving the response headers.
+        :param int wire_size: Number of body bytes received before decompression, when known.
+        """
+        response = super().__new__(cls, body)
+        response.status_code = status_code
+        response.headers = headers if headers is not None else {}
+        response.elapsed = elapsed
+        response.wire_size = wire_size
+        return response
+
+
+class HttpStream(object):
+    """
+    Response as returned by `HttpClient.stream`: the status and headers are available right away, while the body is
+    only read as the stream is iterated over, in chunks of bytes.
+
+    Close the stream (or use it as a context manager) to release the connection, also when the body was not read to the
+    end. `size` is the number of body bytes read so far.
+    """
+    CHUNK_SIZE = 64 * 1024
+
+    status_code: Optional[int]
+    headers: Mapping[str, str]
+    elapsed: Optional[float]
+    size: int
+
+    _chunks: Iterable[bytes]
+    _close: Optional[Callable[[], None]]
+
+    def __init__(self, chunks: Iterable[bytes], status_code: int = None, headers: Mapping[str, str] = None,
+                 elapsed: float = None, close: Callable[[], None] = None) -> None:
+        """
+        :param chunks: The body, in chunks of bytes.
+        :param float elapsed: Seconds between sending the request and receiving the response headers.
+        :param close: Called once to release the connection when the stream is closed.
+        """
+        self.status_code = status_code
+        self.headers = headers if headers is not None else {}
+        self.elapsed = elapsed
+        self.size = 0
+        self._chunks = chunks
+        self._close = close
+
+    @classmethod
+    def from_response(cls, response: Union[str, bytes, None]) -> 'HttpStream':
+        """
+        Wrap a response returned by `HttpClient.request` as a stream of a single chunk.
+        """
+        body = response.encode('utf-8') if isinstance(response, str) else response
+
+        return cls(
+            [bytes(body)] if body else [],
+            response_status(response),
+            getattr(response, 'headers', None),
+            getattr(response, 'elapsed', None),
+        )
+
+    def __iter__(self) -> Iterator[bytes]:
+        for chunk in self._chunks:
+            self.size += len(chunk)
+            yield chunk
+
+    def close(self) -> None:
+        close, self._close = self._close, None
+
+        if close is not None:
+            close()
+
+    def __enter__(self) -> 'HttpStream':
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+
+# A response of `HttpClient.request` or `HttpClient.stream`, for wrappers that return what the wrapped client returns.
+Response = TypeVar('Response', bound=Union[str, bytes, HttpStream, None])
+
+
+def response_status(response: Union[str, bytes, HttpStream, None]) -> Optional[int]:
+    """
+    Get the status of a response returned by `HttpClient.request` or `HttpClient.stream`: the HTTP status when the
+    client provides one, or the status reported in an API error otherwise.
+    """
+    if response is None:
+        return None
+
+    status = getattr(response, 'status_code', None)
+    if status is not None or isinstance(response, HttpStream):
+        return status
+
+    if not (b'"error"' in response if isinstance(response, bytes) else '"error"' in response):
+        return None
+
+    try:
+        return int(json.loads(response)['error']['status'])
+    except (ValueError, TypeError, KeyError):
+        return None
+
+
+def response_retry_after(response: Union[str, bytes, HttpStream, None]) -> Optional[float]:
+    """
+    Get the number of seconds the `Retry-After` header of a response asks to wait, when the HTTP client provides it.
+    """
+    value = getattr(response, 'headers', {}).get('Retry-After')
+    if value is None:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    import email.utils
+
+    try:
+        return max(0.0, email.utils.parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
 class HttpClient(ABC):
     @abstractmethod
-    def request(self, method: str, path: str, headers: dict = {}, data: str = None) -> str:
+    def request(self, method: str, path: str, headers: dict = {},
+                data: Union[str, bytes] = None) -> Union[str, bytes, None]:
+        """
+        Send a request and return the response body, as text or as raw bytes. Clients that return an `HttpResponse`
+        should return an empty one rather than None for an empty body, so wrappers still see its status.
+
+        Callers that want to bound how long the request may take also pass a `timeout` keyword argument in seconds;
+        clients that support it should accept `timeout: float = None`.
+        """
         raise NotImplementedError()
 
+    def stream(self, method: str, path: str, headers: dict = {}, data: Union[str, bytes] = None,
+               timeout: float = None) -> HttpStream:
+        """
+        Send a request and return the response as an `HttpStream`, so a large body can be processed as it arrives.
+
+        This implementation reads the whole body with `request()`; clients that can read a body incrementally override
+        it.
+        """
+        options = {} if timeout is None else {'timeout': timeout}
+        return HttpStream.from_response(self.request(method, path, headers, data, **options))
+
+    def close(self) -> None:
+        """
+        Release any resources (e.g. pooled connections) held by the client.
+        """
+        pass
+
+    def __enter__(self) -> 'HttpClient':
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+
+def _block_all_cookies() -> 'http.cookiejar.CookiePolicy':
+    """
+    Create a cookie policy that never stores or sends cookies, so a shared session stays stateless between calls.
+    """
+    import http.cookiejar
+
+    class BlockAllCookies(http.cookiejar.CookiePolicy):
+        netscape = True
+        rfc2965 = False
+        hide_cookie2 = False
+
+        def set_ok(self, cookie, request) -> bool:
+            return False
+
+        def return_ok(self, cookie, request) -> bool:
+            return False
+
+        def domain_return_ok(self, domain, request) -> bool:
+            return False
+
+        def path_return_ok(self, path, request) -> bool:
+            return False
+
+    return BlockAllCookies()
+
+
+def basic_authorization(api_key: str) -> str:
+    """
+    Build the `Authorization` header value that authenticates with an API key.
+    """
+    return 'Basic ' + base64.b64encode((api_key + ':').encode('utf-8')).decode('ascii')
+
+
+def _keep_authorization(request: 'requests.PreparedRequest') -> 'requests.PreparedRequest':
+    """
+    Authenticate a request with the `Authorization` header it already has, instead of credentials from `~/.netrc`.
+    """
+    return request
+
+
+def _bytes_read(raw: Any) -> Optional[int]:
+    """
+    Get the number of body bytes a urllib3 response read from the connection, before decompression.
+    """
+    size = getattr(raw, 'tell', lambda: None)()
+    return size if isinstance(size, int) else None
+
+
+def _cap_timeout(configured: Optional[float], limit: Optional[float]) -> Optional[float]:
+    if limit is None:
+        return configured
+
+    if configured is None:
+        return limit
+
+    return min(configured, limit)
+
 
 class RequestsHttpClient(HttpClient):
+    DEFAULT_POOL_CONNECTIONS = 10
+    DEFAULT_POOL_MAXSIZE = 10
+    DEFAULT_CONNECT_TIMEOUT = 5.0
+    DEFAULT_READ_TIMEOUT = 30.0
+
     _endpoint: str
-    _api_key: str
+    _api_key: Optional[str]
     _default_headers: dict
     _default_requests_options: dict
+    _session: 'requests.Session'
+    _connect_timeout: Optional[float]
+    _read_timeout: Optional[float]
+    _base_options: dict
+
+    def __init__(self, endpoint: str, api_key: Optional[str], default_headers: dict = {},
+                 default_requests_options: dict = {}, pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+                 pool_maxsize: int = DEFAULT_POOL_MAXSIZE, connect_timeout: Optional[float] = DEFAULT_CONNECT_TIMEOUT,
+                 read_timeout: Optional[float] = DEFAULT_READ_TIMEOUT) -> None:
+        """
+        :param str api_key: The API key to authenticate with; None when every request carries its own `Authorization`
+            header.
+        :param int pool_connections: Number of per-host connection pools to keep.
+        :param int pool_maxsize: Maximum number of keep-alive connections to keep per host.
+        :param float connect_timeout: Seconds to wait for a connection to be established; None to wait forever.
+        :param float read_timeout: Seconds to wait for the server to send data; None to wait forever.
+        """
+        global requests
+        import requests
 
-    def __init__(self, endpoint: str, api_key: str, default_headers: dict = {},
-                 default_requests_options: dict = {}) -> None:
         self._endpoint = endpoint
         self._api_key = api_key
         self._default_headers = default_headers
         self._default_requests_options = default_requests_options
+        self._session = self._create_session(endpoint, pool_connections, pool_maxsize)
+        self._connect_timeout = connect_timeout
+        self._read_timeout = read_timeout
+
+        # Everything that is the same for every request is worked out once: the Authorization header is sent as a
+        # default header rather than built by `requests` for every request, and each request only copies these options.
+        if api_key is not None:
+            self._default_headers = {**default_headers, 'Authorization': basic_authorization(api_key)}
+
+        self._base_options = {
+            'timeout': (connect_timeout, read_timeout),
+            **default_requests_options,
+            'auth': _keep_authorization,
+        }
+
+    def request(self, method: str, path: str, headers: dict = {}, data: Union[str, bytes] = None,
+                timeout: float = None) -> HttpResponse:
+        """
+        :param float timeout: Upper bound in seconds for the connect and read timeouts of this request.
+        :return: The raw response body; it is not decoded to text, so it can be parsed straight from bytes. An empty
+            body is returned as an empty `HttpResponse`, so its status is kept.
+        """
+        import requests
 
-    def request(self, method: str, path: str, headers: dict = {}, data: str = None) -> Optional[str]:
-        options = self._create_requests_options(method, path, headers, data)
+        options = self._create_requests_options(method, path, headers, data, timeout)
 
         try:
-            response = requests.request(**options)
+            response = self._session.request(**options)
         except requests.RequestException as exception:
-            raise HttpException('Requests error: {}: {} ({}) for {}'.format(
-                exception.errno,
-                str(exception),
-                'see https://requests.kennethreitz.org/en/master/api/#exceptions',
-                path
-            )) from exception
-
-        if not response.text:
-            return None
+            raise self._error(exception, path) from exception
 
-        return response.text
+        return HttpResponse(
+            response.content,
+            response.status_code,
+            response.headers,
+            response.elapsed.total_seconds(),
+            _bytes_read(response.raw),
+        )
 
-    def _create_requests_options(self, method: str, path: str, headers: dict = {}, data: str = None) -> dict:
-        options: dict = {
-            **self._default_requests_options,
-            'method': method,
-            'url': self._endpoint + path,
-            'auth': (self._api_key, ''),
-        }
+    def stream(self, method: str, path: str, headers: dict = {}, data: Union[str, bytes] = None,
+               timeout: float = None) -> HttpStream:
+        """
+        :param float timeout: Upper bound in seconds for the connect timeout and for the wait for every chunk.
+        """
+        import requests
 
-        headers = {
-            **self._default_headers,
-            **headers,
-        }
+        options = self._create_requests_options(method, path, headers, data, timeout)
+
+        try:
+            response = self._session.request(stream=True, **options)
+        except requests.RequestException as exception:
+            raise self._error(exception, path) from exception
+
+        def chunks() -> Iterator[bytes]:
+            try:
+                yield from response.iter_content(HttpStream.CHUNK_SIZE)
+            except requests.RequestException as exception:
+                raise self._error(exception, path) from exception
+
+        return HttpStream(
+            chunks(),
+            response.status_code,
+            response.headers,
+            response.elapsed.total_seconds(),
+            response.close,
+        )
+
+    def close(self) -> None:
+        self._session.close()
+
+    @staticmethod
+    def _error(exception: 'requests.RequestException', path: str) -> HttpException:
+        return HttpException('Requests error: {}: {} ({}) for {}'.format(
+            exception.errno,
+            str(exception),
+            'see https://requests.kennethreitz.org/en/master/api/#exceptions',
+            path
+        ))
+
+    @staticmethod
+    def _create_session(endpoint: str, pool_connections: int, pool_maxsize: int) -> 'requests.Session':
+        """
+        Create a keep-alive session that can safely be shared between threads.
+
+        The proxy and CA bundle settings of the environment are read once, for the endpoint, instead of by `requests`
+        for every request (which goes through all environment variables each time).
+        """
+        import requests
+        import requests.adapters
+
+        session = requests.Session()
+        session.cookies.set_policy(_block_all_cookies())
+
+        settings = session.merge_environment_settings(endpoint, {}, False, None, None)
+        session.proxies.update(settings['proxies'])
+        session.verify = settings['verify']
+        session.trust_env = False
+
+        adapter = requests.adapters.HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+
+        return session
+
+    def _create_requests_options(self, method: str, path: str, headers: dict = {}, data: Union[str, bytes] = None,
+                                 timeout: float = None) -> dict:
+        options = self._base_options.copy()
+        options['method'] = method
+        options['url'] = self._endpoint + path
+
+        if timeout is not None:
+            # The configured timeout may come from the default options, as one number or a (connect, read) tuple.
+            configured = self._base_options['timeout']
+            connect, read = configured if isinstance(configured, (tuple, list)) else (configured, configured)
+            options['timeout'] = (_cap_timeout(connect, timeout), _cap_timeout(read, timeout))
 
         if data:
             options['data'] = data
 
         if headers:
-            options['headers'] = headers
+            options['headers'] = {**self._default_headers, **headers}
+        elif self._default_headers:
+            options['headers'] = self._default_headers
 
         return options
+
+
+class Urllib3HttpClient(HttpClient):
+    """
+    HTTP client on top of a urllib3 connection pool, which `requests` is built on.
+
+    It sends requests the same way as `RequestsHttpClient`, but skips the per-request work of `requests` (preparing a
+    request object, dispatching hooks, handling cookies and redirects), so it spends less CPU time per request. It does
+    not follow redirects and does not pick up proxy settings from the environment.
+    """
+    _endpoint: str
+    _default_headers: dict
+    _pool: 'urllib3.PoolManager'
+    _connect_timeout: Optional[float]
+    _read_timeout: Optional[float]
+    _timeout: 'urllib3.Timeout'
+
+    def __init__(self, endpoint: str, api_key: Optional[str], default_headers: dict = {},
+                 pool_connections: int = RequestsHttpClient.DEFAULT_POOL_CONNECTIONS,
+                 pool_maxsize: int = RequestsHttpClient.DEFAULT_POOL_MAXSIZE,
+                 connect_timeout: Optional[float] = RequestsHttpClient.DEFAULT_CONNECT_TIMEOUT,
+                 read_timeout: Optional[float] = RequestsHttpClient.DEFAULT_READ_TIMEOUT,
+                 ca_certs: str = None) -> None:
+        """
+        :param str api_key: The API key to authenticate with; None when every request carries its own `Authorization`
+            header.
+        :param int pool_connections: Number of per-host connection pools to keep.
+        :param int pool_maxsize: Maximum number of keep-alive connections to keep per host.
+        :param float connect_timeout: Seconds to wait for a connection to be established; None to wait forever.
+        :param float read_timeout: Seconds to wait for the server to send data; None to wait forever.
+        :param str ca_certs: Path to a CA bundle to verify the API's certificate with; defaults to the one of certifi
+            when it is installed, and to the system's otherwise.
+        """
+        import urllib3
+
+        self._endpoint = endpoint
+        self._default_headers = {
+            **urllib3.util.make_headers(
+                basic_auth=api_key + ':' if api_key is not None else None,
+                accept_encoding=True,
+            ),
+            **default_headers,
+        }
+        self._pool = urllib3.PoolManager(
+            num_pools=pool_connections,
+            maxsize=pool_maxsize,
+            retries=False,
+            ca_certs=ca_certs if ca_certs is not None else self._default_ca_certs(),
+        )
+        self._connect_timeout = connect_timeout
+        self._read_timeout = read_timeout
+        self._timeout = urllib3.Timeout(connect=connect_timeout, read=read_timeout)
+
+    def request(self, method: str, path: str, headers: dict = {}, data: Union[str, bytes] = None,
+                timeout: float = None) -> HttpResponse:
+        """
+        :param float timeout: Upper bound in seconds for the connect and read timeouts of this request.
+        :return: The raw response body; it is not decoded to text, so it can be parsed straight from bytes.
+        """
+        import urllib3
+
+        start = time.perf_counter()
+        response = self._urlopen(method, path, headers, data, timeout)
+        elapsed = time.perf_counter() - start
+
+        try:
+            body = response.read()
+        except urllib3.exceptions.HTTPError as exception:
+            raise self._error(exception, path) from exception
+        finally:
+            response.release_conn()
+
+        return HttpResponse(body, response.status, response.headers, elapsed, _bytes_read(response))
+
+    def stream(self, method: str, path: str, headers: dict = {}, data: Union[str, bytes] = None,
+               timeout: float = None) -> HttpStream:
+        """
+        :param float timeout: Upper bound in seconds for the connect timeout and for the wait for every chunk.
+        """
+        import urllib3
+
+        start = time.perf_counter()
+        response = self._urlopen(method, path, headers, data, timeout)
+        elapsed = time.perf_counter() - start
+        complete = False
+
+        def chunks() -> Iterator[bytes]:
+            nonlocal complete
+
+            try:
+                yield from response.stream(HttpStream.CHUNK_SIZE)
+            except urllib3.exceptions.HTTPError as exception:
+                raise self._error(exception, path) from exception
+
+            complete = True
+
+        def close() -> None:
+            # A connection with unread data cannot be reused, so it is closed before it is returned to the pool.
+            if not complete:
+                response.close()
+
+            response.release_conn()
+
+        return HttpStream(chunks(), response.status, response.headers, elapsed, close)
+
+    def close(self) -> None:
+        self._pool.clear()
+
+    @staticmethod
+    def _default_ca_certs() -> Optional[str]:
+        try:
+            import certifi
+        except ImportError:  # pragma: no cover
+            return None
+
+        return certifi.where()
+
+    def _urlopen(self, method: str, path: str, headers: dict, data: Union[str, bytes, None],
+                 timeout: Optional[float]) -> 'urllib3.BaseHTTPResponse':
+        import urllib3
+
+        try:
+            return self._pool.urlopen(
+                method,
+                self._endpoint + path,
+                body=data.encode('utf-8') if isinstance(data, str) else data,
+                headers={**self._default_headers, **headers} if headers else self._default_headers,
+                timeout=self._timeout if timeout is None else urllib3.Timeout(
+                    connect=_cap_timeout(self._connect_timeout, timeout),
+                    read=_cap_timeout(self._read_timeout, timeout),
+                ),
+                preload_content=False,
+            )
+        except urllib3.exceptions.HTTPError as exception:
+            raise self._error(exception, path) from exception
+
+    @staticmethod
+    def _error(exception: 'urllib3.exceptions.HTTPError', path: str) -> HttpException:
+        return HttpException('urllib3 error: {} ({}) for {}'.format(
+            str(exception),
+            type(exception).__name__,
+            path
+        ))
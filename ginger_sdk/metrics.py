@@ -0,0 +1,144 @@
+import bisect
+import threading
+
+from typing import Dict
+from typing import List
+from typing import Tuple
+
+from .hooks import RequestEvent
+from .hooks import RequestHook
+
+
+class LatencyHistogram(object):
+    __slots__ = ('buckets', 'counts', 'count', 'sum')
+
+    buckets: Tuple[float, ...]
+    counts: List[int]
+    count: int
+    sum: float
+
+    def __init__(self, buckets: Tuple[float, ...]) -> None:
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, quantile: float) -> float:
+        """
+        Estimate a quantile (0-1) as the upper bound of the bucket it falls in.
+        """
+        rank = quantile * self.count
+        seen = 0
+
+        for index, count in enumerate(self.counts):
+            seen += count
+            if count and seen >= rank:
+                return self.buckets[index] if index < len(self.buckets) else float('inf')
+
+        return 0.0
+
+
+class MetricsCollector(RequestHook):
+    """
+    Request hook that keeps per-endpoint latency histograms, error counts and transferred bytes in memory.
+
+    `bytes_sent` and `bytes_received` count uncompressed bodies, `wire_bytes_sent` and `wire_bytes_received` the bytes
+    actually transferred, so their difference shows what compression saves.
+
+    Endpoints are keyed by method and path template, e.g. `('GET', '/orders/{id}/')`. Read the metrics with
+    `snapshot()`, or with `to_prometheus()` to expose them to a Prometheus scraper.
+    """
+    DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+    _buckets: Tuple[float, ...]
+    _latencies: Dict[Tuple[str, str], LatencyHistogram]
+    _errors: Dict[Tuple[str, str], int]
+    _bytes_sent: Dict[Tuple[str, str], int]
+    _bytes_received: Dict[Tuple[str, str], int]
+    _wire_bytes_sent: Dict[Tuple[str, str], int]
+    _wire_bytes_received: Dict[Tuple[str, str], int]
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        self._buckets = tuple(sorted(buckets))
+        self._latencies = {}
+        self._errors = {}
+        self._bytes_sent = {}
+        self._bytes_received = {}
+        self._wire_bytes_sent = {}
+        self._wire_bytes_received = {}
+        self._lock = threading.Lock()
+
+    def after_response(self, event: RequestEvent) -> None:
+        self._record(event, error=False)
+
+    def on_error(self, event: RequestEvent, exception: Exception) -> None:
+        self._record(event, error=True)
+
+    def snapshot(self) -> Dict[Tuple[str, str], dict]:
+        with self._lock:
+            return {
+                endpoint: {
+                    'count': histogram.count,
+                    'errors': self._errors.get(endpoint, 0),
+                    'latency_sum': histogram.sum,
+                    'latency_p50': histogram.quantile(0.5),
+                    'latency_p99': histogram.quantile(0.99),
+                    'bytes_sent': self._bytes_sent.get(endpoint, 0),
+                    'bytes_received': self._bytes_received.get(endpoint, 0),
+                    'wire_bytes_sent': self._wire_bytes_sent.get(endpoint, 0),
+                    'wire_bytes_received': self._wire_bytes_received.get(endpoint, 0),
+                }
+                for endpoint, histogram in self._latencies.items()
+            }
+
+    def to_prometheus(self, prefix: str = 'ginger_client') -> str:
+        """
+        Render the metrics in the Prometheus text exposition format.
+        """
+        lines = [
+            '# TYPE {}_request_duration_seconds histogram'.format(prefix),
+            '# TYPE {}_request_errors_total counter'.format(prefix),
+        ]
+
+        with self._lock:
+            for (method, template), histogram in sorted(self._latencies.items()):
+                labels = 'method="{}",path="{}"'.format(method, template)
+                cumulative = 0
+
+                for bound, count in zip(self._buckets + (float('inf'),), histogram.counts):
+                    cumulative += count
+                    lines.append('{}_request_duration_seconds_bucket{{{},le="{}"}} {}'.format(
+                        prefix, labels, '+Inf' if bound == float('inf') else bound, cumulative
+                    ))
+
+                lines.append('{}_request_duration_seconds_sum{{{}}} {}'.format(prefix, labels, histogram.sum))
+                lines.append('{}_request_duration_seconds_count{{{}}} {}'.format(prefix, labels, histogram.count))
+                lines.append('{}_request_errors_total{{{}}} {}'.format(
+                    prefix, labels, self._errors.get((method, template), 0)
+                ))
+
+        return '\n'.join(lines) + '\n'
+
+    def _record(self, event: RequestEvent, error: bool) -> None:
+        endpoint = (event.method, event.path_template)
+
+        with self._lock:
+            histogram = self._latencies.get(endpoint)
+            if histogram is None:
+                histogram = self._latencies[endpoint] = LatencyHistogram(self._buckets)
+
+            histogram.observe(event.total or 0.0)
+            self._bytes_sent[endpoint] = self._bytes_sent.get(endpoint, 0) + event.request_bytes
+            self._bytes_received[endpoint] = self._bytes_received.get(endpoint, 0) + event.response_bytes
+            self._wire_bytes_sent[endpoint] = self._wire_bytes_sent.get(endpoint, 0) + event.request_wire_bytes
+            self._wire_bytes_received[endpoint] = (
+                self._wire_bytes_received.get(endpoint, 0) + event.response_wire_bytes
+            )
+
+            if error:
+                self._errors[endpoint] = self._errors.get(endpoint, 0) + 1
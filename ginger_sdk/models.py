@@ -0,0 +1,203 @@
+from typing import Any
+from typing import Dict
+from typing import FrozenSet
+from typing import Iterator
+from typing import Optional
+from typing import Tuple
+
+_MISSING = object()
+
+
+class _ModelList(list):
+    """
+    Marks a list of nested objects that has already been converted to models.
+    """
+    __slots__ = ()
+
+
+class _LazyModels(object):
+    """
+    Descriptor for a list of nested objects, which are only converted to models when the attribute is first read.
+    """
+    _model: type
+    _slot: str
+
+    def __init__(self, model: type) -> None:
+        self._model = model
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self._slot = '_' + name
+
+    def __get__(self, instance: Optional['Model'], owner: type) -> Any:
+        if instance is None:
+            return self
+
+        value = getattr(instance, self._slot, None)
+
+        if type(value) is list:
+            value = _ModelList(self._model(item) if isinstance(item, dict) else item for item in value)
+            setattr(instance, self._slot, value)
+
+        return value
+
+    def __set__(self, instance: 'Model', value: Any) -> None:
+        setattr(instance, self._slot, value)
+
+    def raw(self, instance: 'Model') -> Any:
+        value = getattr(instance, self._slot, _MISSING)
+
+        if type(value) is _ModelList:
+            return [item.to_dict() if isinstance(item, Model) else item for item in value]
+
+        return value
+
+
+class Model(object):
+    """
+    Base class of the typed API objects.
+
+    Known fields are stored in `__slots__` and available as attributes (None when the API did not return them). Fields
+    the model does not know about are kept in `unknown_fields`. Models also support read access by key like the
+    original dict, and `to_dict()` returns the data the model was created from.
+    """
+    __slots__ = ('_unknown',)
+
+    _fields: FrozenSet[str] = frozenset()
+
+    _unknown: Optional[Dict[str, Any]]
+
+    def __init__(self, data: dict) -> None:
+        fields = self._fields
+        unknown = None
+
+        for key, value in data.items():
+            if key in fields:
+                setattr(self, key, value)
+            else:
+                if unknown is None:
+                    unknown = {}
+                unknown[key] = value
+
+        self._unknown = unknown
+
+    def __getattr__(self, name: str) -> Any:
+        # Only called for fields whose slot was never set, i.e. that the API did not return.
+        if name in self._fields:
+            return None
+
+        raise AttributeError('{!r} object has no attribute {!r}'.format(type(self).__name__, name))
+
+    @property
+    def unknown_fields(self) -> Dict[str, Any]:
+        return self._unknown if self._unknown is not None else {}
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._fields:
+            value = self._get_field(key)
+            if value is not _MISSING:
+                return getattr(self, key)
+        elif self._unknown is not None and key in self._unknown:
+            return self._unknown[key]
+
+        raise KeyError(key)
+
+    def __contains__(self, key: str) -> bool:
+        try:
+            self[key]
+        except KeyError:
+            return False
+
+        return True
+
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def to_dict(self) -> dict:
+        return dict(self._items())
+
+    def __eq__(self, other: Any) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+
+        return self.to_dict() == other.to_dict()
+
+    def __repr__(self) -> str:
+        return '{}(id={!r})'.format(type(self).__name__, self['id'] if 'id' in self else None)
+
+    def _items(self) -> Iterator[Tuple[str, Any]]:
+        for key in self._fields:
+            value = self._get_field(key)
+            if value is not _MISSING:
+                yield key, value
+
+        if self._unknown is not None:
+            yield from self._unknown.items()
+
+    def _get_field(self, key: str) -> Any:
+        """
+        Get the raw value of a known field, or `_MISSING` when it is not set.
+        """
+        descriptor = getattr(type(self), key)
+
+        if isinstance(descriptor, _LazyModels):
+            return descriptor.raw(self)
+
+        try:
+            return object.__getattribute__(self, key)
+        except AttributeError:
+            return _MISSING
+
+
+class Issuer(Model):
+    _fields = frozenset(('id', 'name', 'list_type'))
+    __slots__ = tuple(sorted(_fields))
+
+    id: Optional[str]
+    name: Optional[str]
+    list_type: Optional[str]
+
+
+class Transaction(Model):
+    _fields = frozenset((
+        'id', 'amount', 'balance', 'completed', 'created', 'credit_debit', 'currency', 'description', 'events',
+        'expiration_period', 'flags', 'is_capturable', 'merchant_id', 'modified', 'order_id', 'payment_method',
+        'payment_method_brand', 'payment_method_details', 'payment_url', 'product_type', 'project_id', 'reason',
+        'settlement_status', 'status',
+    ))
+    __slots__ = tuple(sorted(_fields))
+
+    id: Optional[str]
+    amount: Optional[int]
+    currency: Optional[str]
+    status: Optional[str]
+    payment_method: Optional[str]
+    payment_url: Optional[str]
+
+
+class Order(Model):
+    _fields = frozenset((
+        'id', 'amount', 'client', 'completed', 'created', 'currency', 'customer', 'description', 'expiration_period',
+        'extra', 'flags', 'last_transaction_added', 'merchant_id', 'merchant_order_id', 'modified', 'order_lines',
+        'order_url', 'project_id', 'reason', 'return_url', 'status', 'transactions', 'webhook_url',
+    ))
+    __slots__ = tuple(sorted(_fields - {'transactions'})) + ('_transactions',)
+
+    id: Optional[str]
+    amount: Optional[int]
+    currency: Optional[str]
+    status: Optional[str]
+    merchant_order_id: Optional[str]
+    order_url: Optional[str]
+
+    # A list of `Transaction` models.
+    transactions = _LazyModels(Transaction)
+
+
+class Refund(Order):
+    """
+    A refund, which the API returns as an order of its own.
+    """
+    __slots__ = ()
@@ -0,0 +1,95 @@
+import threading
+
+from collections import deque
+from typing import Callable
+from typing import Deque
+from typing import Iterator
+from typing import Optional
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:  # pragma: no cover
+    from concurrent.futures import Future
+
+
+class PageIterator(Iterator[dict]):
+    """
+    Lazily iterates over the items of a paginated list endpoint, one page in memory at a time.
+
+    While the items of a page are consumed, the next page is fetched in the background. The `offset` attribute is the
+    position of the next item to be returned: store it to resume the iteration later, e.g. after a crash.
+
+    The iteration ends at the first empty page. A short page does not end it, since the API may return fewer items than
+    asked for when it caps the page size.
+    """
+    offset: int
+
+    _fetch_page: Callable[[int, int], list]
+    _page_size: int
+    _prefetch: bool
+    _items: Deque[dict]
+    _next_page: Optional['Future']
+    _next_page_offset: int
+    _exhausted: bool
+
+    def __init__(self, fetch_page: Callable[[int, int], list], page_size: int = 100, offset: int = 0,
+                 prefetch: bool = True) -> None:
+        """
+        :param fetch_page: Called with an offset and a limit; returns the items of that page.
+        :param int page_size: Number of items to fetch per page.
+        :param int offset: Position of the first item to return.
+        :param bool prefetch: Fetch the next page in the background while the current one is consumed.
+        """
+        if page_size < 1:
+            raise ValueError('page_size must be at least 1')
+
+        self.offset = offset
+        self._fetch_page = fetch_page
+        self._page_size = page_size
+        self._prefetch = prefetch
+        self._items = deque()
+        self._next_page = None
+        self._next_page_offset = offset
+        self._exhausted = False
+
+    def __iter__(self) -> 'PageIterator':
+        return self
+
+    def __next__(self) -> dict:
+        while not self._items:
+            if self._exhausted:
+                raise StopIteration
+            self._load_next_page()
+
+        item = self._items.popleft()
+        self.offset += 1
+        return item
+
+    def _load_next_page(self) -> None:
+        if self._next_page is not None:
+            future, self._next_page = self._next_page, None
+            page = future.result()
+        else:
+            page = self._fetch_page(self._next_page_offset, self._page_size)
+
+        self._items.extend(page)
+        self._next_page_offset += len(page)
+
+        if not page:
+            self._exhausted = True
+        elif self._prefetch:
+            self._next_page = self._fetch_in_background(self._next_page_offset)
+
+    def _fetch_in_background(self, offset: int) -> 'Future':
+        from concurrent.futures import Future
+
+        future: Future = Future()
+
+        def fetch() -> None:
+            try:
+                future.set_result(self._fetch_page(offset, self._page_size))
+            except BaseException as exception:
+                future.set_exception(exception)
+
+        threading.Thread(target=fetch, name='ginger-page-prefetch', daemon=True).start()
+
+        return future
@@ -0,0 +1,311 @@
+import os
+import struct
+import threading
+import time
+
+from abc import ABC
+from abc import abstractmethod
+from typing import Callable
+from typing import List
+from typing import NamedTuple
+from typing import Optional
+from typing import Tuple
+from typing import TypeVar
+from typing import Union
+
+from .api_client import HttpRequestError
+from .hooks import path_template
+from .http_client import HttpClient
+from .http_client import HttpStream
+from .http_client import Response
+from .http_client import response_retry_after
+from .http_client import response_status
+
+try:
+    import fcntl
+    _HAS_FCNTL = True
+except ImportError:  # pragma: no cover
+    _HAS_FCNTL = False
+
+T = TypeVar('T')
+
+
+class RateLimitExceeded(HttpRequestError):
+    """
+    Raised instead of sending a request when no rate limit token could be acquired in time.
+    """
+    pass
+
+
+class BucketState(NamedTuple):
+    tokens: float
+    updated: float
+    rate_factor: float
+    paused_until: float
+
+
+class BucketStore(ABC):
+    """
+    Storage for the state of a token bucket, which it reads and updates atomically.
+    """
+
+    @abstractmethod
+    def now(self) -> float:
+        """
+        Current time on the clock the stored timestamps are based on.
+        """
+        raise NotImplementedError()
+
+    @abstractmethod
+    def update(self, update: Callable[[Optional[BucketState]], Tuple[BucketState, T]]) -> T:
+        """
+        Replace the state with the one returned by `update` (called with None when there is no state yet) and return
+        the second value `update` returned, without other threads or processes updating the state in between.
+        """
+        raise NotImplementedError()
+
+
+class MemoryBucketStore(BucketStore):
+    """
+    Keeps the bucket state in memory, shared by the threads of a single process.
+    """
+    _state: Optional[BucketState]
+
+    def __init__(self) -> None:
+        self._state = None
+        self._lock = threading.Lock()
+
+    def now(self) -> float:
+        return time.monotonic()
+
+    def update(self, update: Callable[[Optional[BucketState]], Tuple[BucketState, T]]) -> T:
+        with self._lock:
+            self._state, result = update(self._state)
+            return result
+
+
+class FileBucketStore(BucketStore):
+    """
+    Keeps the bucket state in a small file guarded by an exclusive `flock`, so all processes on a host that use the
+    same path (e.g. the workers of a gunicorn server) share one bucket. Only available on Unix.
+    """
+    _FORMAT = struct.Struct('<4d')
+
+    _path: str
+    _fd: Optional[int]
+    _pid: int
+
+    def __init__(self, path: str) -> None:
+        if not _HAS_FCNTL:
+            raise ImportError('FileBucketStore requires fcntl, which is only available on Unix')
+
+        self._path = path
+        self._fd = None
+        self._pid = 0
+        self._lock = threading.Lock()
+
+    def now(self) -> float:
+        # Timestamps are compared between processes, so they come from the wall clock.
+        return time.time()
+
+    def update(self, update: Callable[[Optional[BucketState]], Tuple[BucketState, T]]) -> T:
+        with self._lock:
+            fd = self._open()
+            fcntl.flock(fd, fcntl.LOCK_EX)
+
+            try:
+                data = os.pread(fd, self._FORMAT.size, 0)
+                state = BucketState(*self._FORMAT.unpack(data)) if len(data) == self._FORMAT.size else None
+                state, result = update(state)
+                os.pwrite(fd, self._FORMAT.pack(*state), 0)
+                return result
+            finally:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+
+    def _open(self) -> int:
+        # flock locks belong to the open file, which a forked child would share with its parent: reopen after a fork.
+        if self._fd is None or self._pid != os.getpid():
+            self._fd = os.open(self._path, os.O_RDWR | os.O_CREAT, 0o600)
+            self._pid = os.getpid()
+
+        return self._fd
+
+
+class TokenBucket(object):
+    """
+    Token bucket allowing `rate` requests per second on average, with bursts of up to `capacity` requests.
+
+    When the API still answers that the rate limit is exceeded (HTTP 429), `slow_down()` halves the rate and stops
+    handing out tokens for as long as the response's `Retry-After` asks; the rate then recovers by `recovery` of the
+    configured rate per second.
+    """
+    rate: float
+    capacity: float
+
+    _store: BucketStore
+    _min_rate_factor: float
+    _recovery: float
+
+    def __init__(self, rate: float, capacity: float = None, store: BucketStore = None, min_rate_factor: float = 0.1,
+                 recovery: float = 0.05) -> None:
+        """
+        :param float rate: Number of tokens added per second.
+        :param float capacity: Maximum number of tokens; defaults to `rate`, i.e. one second worth of requests.
+        :param BucketStore store: Where the bucket state is kept; defaults to memory. Use a `FileBucketStore` to share
+            the bucket between processes.
+        :param float min_rate_factor: Lowest fraction of `rate` that `slow_down()` reduces the rate to.
+        :param float recovery: Fraction of `rate` the reduced rate recovers per second.
+        """
+        if rate <= 0:
+            raise ValueError('rate must be positive')
+
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._store = store if store is not None else MemoryBucketStore()
+        self._min_rate_factor = min_rate_factor
+        self._recovery = recovery
+
+    def acquire(self, tokens: float = 1, blocking: bool = True, timeout: float = None) -> bool:
+        """
+        Take tokens from the bucket.
+
+        :param bool blocking: Wait until the tokens are available; otherwise return immediately.
+        :param float timeout: Maximum number of seconds to wait.
+        :return: Whether the tokens were taken.
+        """
+        deadline = time.monotonic() + timeout if timeout is not None else None
+
+        while True:
+            wait = self._store.update(lambda state: self._take(state, tokens))
+            if wait <= 0:
+                return True
+
+            if not blocking:
+                return False
+
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining < wait:
+                    return False
+
+            time.sleep(wait)
+
+    def try_acquire(self, tokens: float = 1) -> bool:
+        return self.acquire(tokens, blocking=False)
+
+    def slow_down(self, retry_after: float = None) -> None:
+        """
+        Reduce the rate after the API reported that the rate limit was exceeded.
+        """
+        def update(state: Optional[BucketState]) -> Tuple[BucketState, None]:
+            now = self._store.now()
+            state = self._refill(state, now)
+            paused_until = max(state.paused_until, now + retry_after) if retry_after else state.paused_until
+
+            return BucketState(0.0, now, max(self._min_rate_factor, state.rate_factor / 2), paused_until), None
+
+        self._store.update(update)
+
+    def _take(self, state: Optional[BucketState], tokens: float) -> Tuple[BucketState, float]:
+        now = self._store.now()
+        state = self._refill(state, now)
+
+        if now < state.paused_until:
+            return state, state.paused_until - now
+
+        if state.tokens >= tokens:
+            return state._replace(tokens=state.tokens - tokens), 0.0
+
+        return state, (tokens - state.tokens) / (self.rate * state.rate_factor)
+
+    def _refill(self, state: Optional[BucketState], now: float) -> BucketState:
+        if state is None:
+            return BucketState(self.capacity, now, 1.0, 0.0)
+
+        elapsed = max(0.0, now - state.updated)
+        tokens = min(self.capacity, state.tokens + elapsed * self.rate * state.rate_factor)
+        rate_factor = min(1.0, state.rate_factor + elapsed * self._recovery)
+
+        return BucketState(tokens, now, rate_factor, state.paused_until)
+
+
+class RateLimiter(object):
+    """
+    Picks the token bucket that applies to a request: the first rule matching its method and path template (see
+    `ginger_sdk.hooks.path_template`), or the default bucket.
+    """
+    _default: Optional[TokenBucket]
+    _rules: List[Tuple[Optional[str], Optional[str], TokenBucket]]
+
+    def __init__(self, default: TokenBucket = None) -> None:
+        self._default = default
+        self._rules = []
+
+    def limit(self, bucket: TokenBucket, method: str = None, path: str = None) -> 'RateLimiter':
+        """
+        Apply `bucket` to requests with the given method and/or path template, e.g. `limit(bucket, 'POST', '/orders/')`.
+        """
+        self._rules.append((method, path, bucket))
+        return self
+
+    def bucket_for(self, method: str, path: str) -> Optional[TokenBucket]:
+        template = path_template(path)
+
+        for rule_method, rule_path, bucket in self._rules:
+            if (rule_method is None or rule_method == method) and (rule_path is None or rule_path == template):
+                return bucket
+
+        return self._default
+
+
+class RateLimitedHttpClient(HttpClient):
+    """
+    Wraps another HTTP client and takes a token from the matching bucket of a `RateLimiter` before every request.
+
+    When `blocking` is false, or no token becomes available within the request's timeout, `RateLimitExceeded` is
+    raised instead of sending the request. Responses with HTTP status 429 slow the bucket down.
+    """
+    _http_client: HttpClient
+    _limiter: RateLimiter
+    _blocking: bool
+
+    def __init__(self, http_client: HttpClient, limiter: Union[RateLimiter, TokenBucket],
+                 blocking: bool = True) -> None:
+        self._http_client = http_client
+        self._limiter = limiter if isinstance(limiter, RateLimiter) else RateLimiter(limiter)
+        self._blocking = blocking
+
+    def request(self, method: str, path: str, headers: dict = {}, data: Union[str, bytes] = None,
+                timeout: float = None) -> Union[str, bytes, None]:
+        return self._send(self._http_client.request, method, path, headers, data, timeout)
+
+    def stream(self, method: str, path: str, headers: dict = {}, data: Union[str, bytes] = None,
+               timeout: float = None) -> HttpStream:
+        return self._send(self._http_client.stream, method, path, headers, data, timeout)
+
+    def close(self) -> None:
+        self._http_client.close()
+
+    def _send(self, send: Callable[..., Response], method: str, path: str, headers: dict,
+              data: Union[str, bytes, None], timeout: Optional[float]) -> Response:
+        bucket = self._limiter.bucket_for(method, path)
+        options = {}
+
+        if bucket is not None:
+            start = time.monotonic()
+
+            if not bucket.acquire(blocking=self._blocking, timeout=timeout):
+                raise RateLimitExceeded('Rate limit exceeded; not sending {} {}'.format(method, path))
+
+            if timeout is not None:
+                timeout = max(0.0, timeout - (time.monotonic() - start))
+
+        if timeout is not None:
+            options['timeout'] = timeout
+
+        response = send(method, path, headers, data, **options)
+
+        if bucket is not None and response_status(response) == 429:
+            bucket.slow_down(response_retry_after(response))
+
+        return response
@@ -0,0 +1,177 @@
+import random
+import threading
+import time
+
+from typing import Callable
+from typing import FrozenSet
+from typing import Optional
+from typing import Tuple
+from typing import Type
+from typing import Union
+
+from .http_client import HttpClient
+from .http_client import HttpException
+from .http_client import HttpStream
+from .http_client import Response
+from .http_client import response_retry_after
+from .http_client import response_status
+
+
+class RetryBudget(object):
+    """
+    Limits retries to a fraction of the requests sent, so retries cannot multiply the load on a failing API.
+
+    Every request deposits `ratio` tokens and every retry withdraws one; the balance is capped at `max_tokens`.
+    """
+    _ratio: float
+    _max_tokens: float
+    _tokens: float
+
+    def __init__(self, ratio: float = 0.2, max_tokens: float = 100) -> None:
+        """
+        :param float ratio: Number of retries allowed per request in the long run.
+        :param float max_tokens: Number of retries that may be spent in a burst.
+        """
+        self._ratio = ratio
+        self._max_tokens = max_tokens
+        self._tokens = max_tokens
+        self._lock = threading.Lock()
+
+    def deposit(self) -> None:
+        with self._lock:
+            self._tokens = min(self._max_tokens, self._tokens + self._ratio)
+
+    def withdraw(self) -> bool:
+        """
+        :return: Whether a retry may be made.
+        """
+        with self._lock:
+            if self._tokens < 1:
+                return False
+
+            self._tokens -= 1
+            return True
+
+
+class RetryPolicy(object):
+    DEFAULT_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+    max_attempts: int
+    backoff_base: float
+    backoff_max: float
+    retry_statuses: FrozenSet[int]
+    retry_exceptions: Tuple[Type[BaseException], ...]
+    budget: RetryBudget
+    idempotency_header: Optional[str]
+
+    def __init__(self, max_attempts: int = 3, backoff_base: float = 0.1, backoff_max: float = 10.0,
+                 retry_statuses: FrozenSet[int] = DEFAULT_RETRY_STATUSES,
+                 retry_exceptions: Tuple[Type[BaseException], ...] = (HttpException, OSError),
+                 budget: Optional[RetryBudget] = None,
+                 idempotency_header: Optional[str] = 'Idempotency-Key') -> None:
+        """
+        :param int max_attempts: Maximum number of attempts per request, including the first one.
+        :param float backoff_base: Backoff in seconds before the first retry; doubled for every next retry.
+        :param float backoff_max: Maximum backoff in seconds, also applied to `Retry-After`.
+        :param retry_statuses: Response statuses that are retried.
+        :param retry_exceptions: Exceptions raised by the HTTP client (connection errors, timeouts) that are retried.
+        :param RetryBudget budget: Budget shared by all requests; defaults to a new `RetryBudget`.
+        :param str idempotency_header: Header used to send an idempotency key with POST requests; None to disable.
+        """
+        if max_attempts < 1:
+            raise ValueError('max_attempts must be at least 1')
+
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.retry_statuses = retry_statuses
+        self.retry_exceptions = retry_exceptions
+        self.budget = budget if budget is not None else RetryBudget()
+        self.idempotency_header = idempotency_header
+
+    def backoff(self, retry: int, retry_after: Optional[float] = None) -> float:
+        """
+        Number of seconds to wait before the given retry (starting at 1), using exponential backoff with full jitter.
+        """
+        if retry_after is not None:
+            return min(self.backoff_max, retry_after)
+
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** (retry - 1)))
+
+
+class RetryingHttpClient(HttpClient):
+    """
+    Wraps another HTTP client and retries failed requests according to a `RetryPolicy`.
+    """
+    _http_client: HttpClient
+    _policy: RetryPolicy
+
+    def __init__(self, http_client: HttpClient, policy: RetryPolicy = None) -> None:
+        self._http_client = http_client
+        self._policy = policy if policy is not None else RetryPolicy()
+
+    def request(self, method: str, path: str, headers: dict = {}, data: Union[str, bytes] = None,
+                timeout: float = None) -> Union[str, bytes, None]:
+        """
+        :param float timeout: Seconds all attempts together may take; no retry is made that cannot finish in time.
+        """
+        return self._send(self._http_client.request, method, path, headers, data, timeout)
+
+    def stream(self, method: str, path: str, headers: dict = {}, data: Union[str, bytes] = None,
+               timeout: float = None) -> HttpStream:
+        """
+        Like `request`, but a request is only retried until the response headers arrive: errors while the body is
+        read are not retried.
+        """
+        return self._send(self._http_client.stream, method, path, headers, data, timeout)
+
+    def close(self) -> None:
+        self._http_client.close()
+
+    def _send(self, send: Callable[..., Response], method: str, path: str, headers: dict,
+              data: Union[str, bytes, None], timeout: Optional[float]) -> Response:
+        policy = self._policy
+
+        if method == 'POST' and policy.idempotency_header and policy.idempotency_header not in headers:
+            # The same key is sent with every attempt, so the API can recognise a retried request. uuid is imported here
+            # because it imports `platform`, which makes importing the SDK noticeably slower.
+            import uuid
+
+            headers = {**headers, policy.idempotency_header: str(uuid.uuid4())}
+
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        policy.budget.deposit()
+        attempt = 1
+
+        while True:
+            options = {} if deadline is None else {'timeout': max(0.0, deadline - time.monotonic())}
+
+            try:
+                response = send(method, path, headers, data, **options)
+            except policy.retry_exceptions:
+                backoff = policy.backoff(attempt)
+                if not self._may_retry(attempt, backoff, deadline):
+                    raise
+            else:
+                status = response_status(response)
+                if status is None or status not in policy.retry_statuses:
+                    return response
+
+                backoff = policy.backoff(attempt, response_retry_after(response))
+                if not self._may_retry(attempt, backoff, deadline):
+                    return response
+
+                if isinstance(response, HttpStream):
+                    response.close()
+
+            time.sleep(backoff)
+            attempt += 1
+
+    def _may_retry(self, attempt: int, backoff: float, deadline: Optional[float]) -> bool:
+        if attempt >= self._policy.max_attempts:
+            return False
+
+        if deadline is not None and time.monotonic() + backoff >= deadline:
+            return False
+
+        return self._policy.budget.withdraw()
@@ -0,0 +1,117 @@
+import threading
+
+from typing import Any
+from typing import Awaitable
+from typing import Callable
+from typing import Dict
+from typing import Hashable
+from typing import Optional
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:  # pragma: no cover
+    import asyncio
+
+
+class _Flight(object):
+    """
+    A call in progress that concurrent callers with the same key wait on.
+    """
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight(object):
+    """
+    Runs only one call per key at a time: callers that ask for a key while a call for it is in progress wait for that
+    call, and get its result or exception. Keys are forgotten as soon as their call completes.
+    """
+    _flights: Dict[Hashable, _Flight]
+
+    def __init__(self) -> None:
+        self._flights = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._flights)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._flights
+
+    def do(self, key: Hashable, call: Callable[[], Any], timeout: float = None) -> Any:
+        """
+        Call `call`, unless a call for `key` is in progress; then wait for its outcome instead.
+
+        :param float timeout: Maximum number of seconds to wait for a call in progress.
+        :raises TimeoutError: When the call in progress did not complete within `timeout`.
+        :raises Exception: Whatever the call raised.
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if flight is None:
+                flight = self._flights[key] = _Flight()
+
+        if not leader:
+            if not flight.done.wait(timeout):
+                raise TimeoutError('Timed out waiting for a request in progress')
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            flight.value = call()
+            return flight.value
+        except BaseException as exception:
+            flight.error = exception
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+
+class AsyncSingleFlight(object):
+    """
+    Coroutine-based counterpart of `SingleFlight`, for callers on a single event loop.
+    """
+    _flights: Dict[Hashable, 'asyncio.Future']
+
+    def __init__(self) -> None:
+        self._flights = {}
+
+    def __len__(self) -> int:
+        return len(self._flights)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._flights
+
+    async def do(self, key: Hashable, call: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Await `call()`, unless a call for `key` is in progress; then wait for its outcome instead.
+
+        The call runs in a task of its own, so cancelling any of the callers waiting for it (including the one that
+        started it) neither cancels the call nor the other callers.
+
+        :raises Exception: Whatever the call raised.
+        """
+        import asyncio
+
+        flight = self._flights.get(key)
+
+        if flight is None:
+            flight = self._flights[key] = asyncio.ensure_future(call())
+
+            def land(task: 'asyncio.Future') -> None:
+                if self._flights.get(key) is task:
+                    del self._flights[key]
+
+                # Mark the exception as retrieved, so asyncio does not log it when nobody was waiting anymore.
+                if not task.cancelled():
+                    task.exception()
+
+            flight.add_done_callback(land)
+
+        return await asyncio.shield(flight)
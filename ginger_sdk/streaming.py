@@ -0,0 +1,158 @@
+import codecs
+import json
+import re
+
+from typing import Any
+from typing import Iterable
+from typing import Iterator
+from typing import Optional
+from typing import Union
+
+_DECODER = json.JSONDecoder()
+_WHITESPACE = re.compile(r'[ \t\n\r]+')
+_AFTER_NUMBER = frozenset(' \t\n\r,]')
+
+
+class JsonItemParser(Iterator[Any]):
+    """
+    Parses a JSON document from chunks as they arrive, yielding the elements of a top-level array one at a time, so only
+    the element being parsed and the unparsed rest of the last chunk are kept in memory.
+
+    Any other document (e.g. an API error object) is yielded as a single item once it has been read completely.
+    `is_array` tells which of the two it is, from the first item on; it is None before, and for an empty document.
+    """
+    is_array: Optional[bool]
+
+    _chunks: Iterator[Union[bytes, str]]
+    _buffer: str
+    _position: int
+    _end_of_input: bool
+
+    def __init__(self, chunks: Iterable[Union[bytes, str]]) -> None:
+        """
+        :param chunks: The document, in chunks of UTF-8 bytes or of text.
+        """
+        self.is_array = None
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder('utf-8')()
+        self._buffer = ''
+        self._position = 0
+        self._end_of_input = False
+        self._items = self._parse()
+
+    def __iter__(self) -> 'JsonItemParser':
+        return self
+
+    def __next__(self) -> Any:
+        """
+        :raises json.JSONDecodeError: When the document is not valid JSON.
+        """
+        return next(self._items)
+
+    def _parse(self) -> Iterator[Any]:
+        first = self._skip_whitespace()
+        if first is None:
+            return
+
+        self.is_array = first == '['
+
+        if not self.is_array:
+            while self._read():
+                pass
+
+            yield _DECODER.decode(self._buffer[self._position:])
+            return
+
+        self._position += 1
+        expect_item = True
+        empty = True
+
+        while True:
+            char = self._skip_whitespace()
+
+            if char is None:
+                raise json.JSONDecodeError('Unterminated array', self._buffer, self._position)
+
+            if char == ']' and (empty or not expect_item):
+                self._position += 1
+
+                if self._skip_whitespace() is not None:
+                    raise json.JSONDecodeError('Extra data', self._buffer, self._position)
+
+                return
+
+            if not expect_item:
+                if char != ',':
+                    raise json.JSONDecodeError("Expecting ',' delimiter", self._buffer, self._position)
+
+                self._position += 1
+                expect_item = True
+                continue
+
+            yield self._parse_item()
+            expect_item = False
+            empty = False
+
+    def _parse_item(self) -> Any:
+        wanted = 0
+
+        while True:
+            if self._end_of_input or len(self._buffer) - self._position >= wanted:
+                try:
+                    item, end = _DECODER.raw_decode(self._buffer, self._position)
+                except json.JSONDecodeError:
+                    if self._end_of_input:
+                        raise
+                else:
+                    # A number is only complete when something follows it: `12` may continue in the next chunk.
+                    if self._end_of_input or not isinstance(item, (int, float)) or \
+                            (end < len(self._buffer) and self._buffer[end] in _AFTER_NUMBER):
+                        self._position = end
+                        return item
+
+                # Wait for twice as much data before trying again, so a large item is not parsed over and over.
+                wanted = 2 * (len(self._buffer) - self._position)
+
+            self._read()
+
+    def _skip_whitespace(self) -> Optional[str]:
+        """
+        Skip whitespace, and return the next character, or None at the end of the document.
+        """
+        while True:
+            match = _WHITESPACE.match(self._buffer, self._position)
+            if match is not None:
+                self._position = match.end()
+
+            if self._position < len(self._buffer):
+                return self._buffer[self._position]
+
+            if not self._read():
+                return None
+
+    def _read(self) -> bool:
+        """
+        Append the next chunk to the buffer, dropping what has been parsed; return False at the end of the input.
+        """
+        if self._end_of_input:
+            return False
+
+        chunk = next(self._chunks, None)
+
+        if chunk is None:
+            self._end_of_input = True
+            text = self._decoder.decode(b'', final=True)
+        else:
+            text = chunk if isinstance(chunk, str) else self._decoder.decode(chunk)
+
+        self._buffer = self._buffer[self._position:] + text
+        self._position = 0
+
+        return chunk is not None
+
+
+def iter_json_items(chunks: Iterable[Union[bytes, str]]) -> Iterator[Any]:
+    """
+    Parse a JSON document from chunks as they arrive; see `JsonItemParser`.
+    """
+    return JsonItemParser(chunks)
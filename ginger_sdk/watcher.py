@@ -0,0 +1,306 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import threading
+import time
+
+from typing import AsyncIterator
+from typing import Callable
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import NamedTuple
+from typing import Optional
+from typing import Tuple
+from typing import Union
+
+from .api_client import ApiClient
+from .api_client import HttpRequestError
+from .api_client import OrderResult
+from .cache import OrderCache
+from .models import Order
+
+logger = logging.getLogger(__name__)
+
+
+class StatusChange(NamedTuple):
+    """
+    An order that was seen in a new status. `previous_status` is None the first time an order is seen.
+    """
+    order_id: str
+    previous_status: Optional[str]
+    status: Optional[str]
+    order: Union[dict, Order]
+
+
+class _Watch(object):
+    __slots__ = ('status', 'interval', 'due')
+
+    status: Optional[str]
+    interval: float
+    due: Optional[float]
+
+    def __init__(self, status: Optional[str], interval: float) -> None:
+        self.status = status
+        self.interval = interval
+        self.due = None
+
+
+class OrderWatcher(object):
+    """
+    Polls many pending orders until they reach a terminal status, reporting every status change.
+
+    All orders are scheduled on a single heap. An order is polled again after `min_interval` seconds; every poll that
+    finds the same status multiplies the interval by `backoff`, up to `max_interval`, and a status change resets it. So
+    orders that change quickly are followed closely, while orders that wait for the customer cost few calls. Orders
+    that are due at the same time are fetched concurrently with `ApiClient.get_orders`.
+
+    Run the watcher with `run()` (or in the background with `start()`) and receive changes in the `on_change`
+    callback, or iterate over `changes()` from asyncio code.
+    """
+    TERMINAL_STATUSES = OrderCache.TERMINAL_STATUSES
+
+    _api_client: ApiClient
+    _on_change: Optional[Callable[[StatusChange], None]]
+    _on_error: Optional[Callable[[str, Exception], None]]
+    _min_interval: float
+    _max_interval: float
+    _backoff: float
+    _max_concurrency: int
+    _terminal_statuses: frozenset
+    _watches: Dict[str, _Watch]
+    _schedule: List[Tuple[float, int, str]]
+    _stopped: bool
+    _thread: Optional[threading.Thread]
+
+    def __init__(self, api_client: ApiClient, on_change: Callable[[StatusChange], None] = None,
+                 on_error: Callable[[str, Exception], None] = None, min_interval: float = 1.0,
+                 max_interval: float = 60.0, backoff: float = 1.5, max_concurrency: int = 10,
+                 terminal_statuses: Iterable[str] = TERMINAL_STATUSES) -> None:
+        """
+        :param ApiClient api_client: The client to fetch orders with.
+        :param on_change: Called with a `StatusChange` whenever an order is seen in a new status.
+        :param on_error: Called with the order ID and the exception when polling an order failed; the order is polled
+            again later.
+        :param float min_interval: Seconds between polls of an order that just changed.
+        :param float max_interval: Maximum number of seconds between polls of an order.
+        :param float backoff: Factor to grow the interval by after each poll without a change.
+        :param int max_concurrency: Maximum number of orders to fetch at the same time.
+        :param terminal_statuses: Statuses after which an order is no longer watched.
+        """
+        if min_interval <= 0 or max_interval < min_interval:
+            raise ValueError('Intervals must be positive, and max_interval at least min_interval')
+
+        self._api_client = api_client
+        self._on_change = on_change
+        self._on_error = on_error
+        self._min_interval = min_interval
+        self._max_interval = max_interval
+        self._backoff = backoff
+        self._max_concurrency = max_concurrency
+        self._terminal_statuses = frozenset(terminal_statuses)
+        self._watches = {}
+        self._schedule = []
+        self._sequence = itertools.count()
+        self._stopped = False
+        self._thread = None
+        self._condition = threading.Condition()
+
+    def __len__(self) -> int:
+        return len(self._watches)
+
+    def __contains__(self, order_id: str) -> bool:
+        return order_id in self._watches
+
+    def watch(self, order_id: str, status: str = None, delay: float = 0.0) -> None:
+        """
+        Start watching an order; it is first polled after `delay` seconds.
+
+        :param str status: The status the order is known to have, so the first poll only reports a change from it.
+        """
+        with self._condition:
+            if order_id in self._watches:
+                return
+
+            watch = self._watches[order_id] = _Watch(status, self._min_interval)
+            self._schedule_poll(order_id, watch, time.monotonic() + delay)
+            self._condition.notify_all()
+
+    def unwatch(self, order_id: str) -> None:
+        with self._condition:
+            self._watches.pop(order_id, None)
+
+    def poll_due(self) -> List[StatusChange]:
+        """
+        Fetch all orders that are due, and return their status changes.
+        """
+        now = time.monotonic()
+        due = []
+
+        with self._condition:
+            while self._schedule and self._schedule[0][0] <= now:
+                due_at, _, order_id = heapq.heappop(self._schedule)
+                watch = self._watches.get(order_id)
+
+                # Entries of unwatched orders are left on the heap, and skipped when they come up.
+                if watch is not None and watch.due == due_at:
+                    watch.due = None
+                    due.append(order_id)
+
+        if not due:
+            return []
+
+        changes = []
+        pending = set(due)
+
+        try:
+            for result in self._api_client.get_orders(due, max_concurrency=self._max_concurrency, ordered=False):
+                pending.discard(result.id)
+                change = self._record(result)
+                if change is not None:
+                    changes.append(change)
+        finally:
+            # Orders whose poll was cut short by an unexpected error are polled again later.
+            with self._condition:
+                for order_id in pending:
+                    watch = self._watches.get(order_id)
+                    if watch is not None and watch.due is None:
+                        self._schedule_poll(order_id, watch, time.monotonic() + watch.interval)
+
+        return changes
+
+    def next_poll_in(self) -> Optional[float]:
+        """
+        Get the number of seconds until the next poll is due, or None when no orders are watched.
+        """
+        with self._condition:
+            return self._next_poll_in()
+
+    def run(self, until_idle: bool = True) -> None:
+        """
+        Poll orders until `stop()` is called, or until no orders are left when `until_idle` is set.
+        """
+        while True:
+            with self._condition:
+                if self._stopped:
+                    return
+
+                delay = self._next_poll_in()
+                if delay is None and until_idle:
+                    return
+
+                if delay is None or delay > 0:
+                    self._condition.wait(delay)
+                    continue
+
+            self.poll_due()
+
+    def start(self) -> threading.Thread:
+        """
+        Poll orders in a background thread until `stop()` is called.
+        """
+        self._stopped = False
+        self._thread = threading.Thread(target=self.run, args=(False,), name='ginger-order-watcher', daemon=True)
+        self._thread.start()
+
+        return self._thread
+
+    def stop(self) -> None:
+        with self._condition:
+            self._stopped = True
+            self._condition.notify_all()
+
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+            self._thread = None
+
+    async def changes(self) -> AsyncIterator[StatusChange]:
+        """
+        Iterate over status changes until no orders are left. Orders are fetched in the default executor, so the event
+        loop is not blocked.
+        """
+        loop = asyncio.get_event_loop()
+
+        while True:
+            delay = self.next_poll_in()
+            if delay is None:
+                return
+
+            if delay > 0:
+                await asyncio.sleep(delay)
+                continue
+
+            for change in await loop.run_in_executor(None, self.poll_due):
+                yield change
+
+    def _next_poll_in(self) -> Optional[float]:
+        while self._schedule:
+            due_at, _, order_id = self._schedule[0]
+            watch = self._watches.get(order_id)
+
+            if watch is not None and watch.due == due_at:
+                return max(0.0, due_at - time.monotonic())
+
+            heapq.heappop(self._schedule)
+
+        return None
+
+    def _schedule_poll(self, order_id: str, watch: _Watch, due_at: float) -> None:
+        watch.due = due_at
+        heapq.heappush(self._schedule, (due_at, next(self._sequence), order_id))
+
+    def _record(self, result: OrderResult) -> Optional[StatusChange]:
+        change = None
+        order_id, order, error = result
+
+        # Only lookups by ID are polled, so a result without an ID cannot belong to a watch.
+        if order_id is None:
+            return None
+
+        if error is None and order is None:
+            # An empty response tells nothing about the order, so it is handled like a failed poll.
+            error = HttpRequestError('No order in the response')
+
+        with self._condition:
+            watch = self._watches.get(order_id)
+            if watch is None:
+                return None
+
+            if error is not None or order is None:
+                watch.interval = min(self._max_interval, watch.interval * self._backoff)
+            else:
+                status = order.get('status')
+
+                if status != watch.status:
+                    change = StatusChange(order_id, watch.status, status, order)
+                    watch.status = status
+                    watch.interval = self._min_interval
+                else:
+                    watch.interval = min(self._max_interval, watch.interval * self._backoff)
+
+            if error is None and watch.status in self._terminal_statuses:
+                del self._watches[order_id]
+            else:
+                self._schedule_poll(order_id, watch, time.monotonic() + watch.interval)
+
+            self._condition.notify_all()
+
+        if error is not None and self._on_error is None:
+            logger.warning('Polling order %s failed: %s', order_id, error)
+        elif error is not None:
+            self._notify(self._on_error, order_id, error)
+        elif change is not None:
+            self._notify(self._on_change, change)
+
+        return change
+
+    @staticmethod
+    def _notify(callback: Optional[Callable], *args) -> None:
+        if callback is None:
+            return
+
+        try:
+            callback(*args)
+        except Exception:
+            logger.exception('Order watcher callback %r failed', callback)
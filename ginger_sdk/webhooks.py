@@ -0,0 +1,196 @@
+import hashlib
+import hmac
+import threading
+import time
+
+from collections import OrderedDict
+from typing import NamedTuple
+from typing import Optional
+from typing import TYPE_CHECKING
+from typing import Tuple
+from typing import Union
+
+from .api_client import ApiClient
+from .codec import JsonCodec
+from .codec import StdlibJsonCodec
+from .models import Order
+
+if TYPE_CHECKING:  # pragma: no cover
+    from concurrent.futures import Future
+
+
+class WebhookError(Exception):
+    """
+    Raised for a notification that is not signed correctly or cannot be parsed.
+    """
+    pass
+
+
+class Notification(NamedTuple):
+    """
+    An order notification as posted by the API, e.g. `{"event": "status_changed", "order_id": "...",
+    "project_id": "..."}`.
+    """
+    event: str
+    order_id: str
+    project_id: Optional[str] = None
+
+
+class WebhookEvent(NamedTuple):
+    """
+    A handled notification with the current state of its order.
+
+    `duplicate` is set when the order was already fetched for an earlier notification within the handler's window, so
+    side effects of the notification have most likely been triggered already.
+    """
+    notification: Notification
+    order: Union[dict, Order]
+    duplicate: bool
+
+
+def verify_signature(body: Union[str, bytes], signature: str, secret: Union[str, bytes]) -> bool:
+    """
+    Check the hex encoded HMAC-SHA256 signature of a notification body, optionally prefixed with `sha256=`.
+
+    This only hashes the body, so it is cheap enough to run before parsing it.
+    """
+    if isinstance(body, str):
+        body = body.encode('utf-8')
+    if isinstance(secret, str):
+        secret = secret.encode('utf-8')
+    if signature.startswith('sha256='):
+        signature = signature[7:]
+
+    expected = hmac.new(secret, body, hashlib.sha256).hexdigest()
+    # Compared as bytes: the signature comes from the sender, and comparing non-ASCII text raises a TypeError.
+    return hmac.compare_digest(expected.encode('ascii'), signature.strip().lower().encode('utf-8', 'replace'))
+
+
+def parse_notification(body: Union[str, bytes], codec: JsonCodec = None) -> Notification:
+    """
+    Parse a notification body.
+
+    :raises WebhookError: When the body is not a notification about an order.
+    """
+    try:
+        payload = (codec if codec is not None else StdlibJsonCodec()).decode(body)
+    except ValueError as exception:
+        raise WebhookError('Notification is not valid JSON: {}'.format(exception)) from exception
+
+    if not isinstance(payload, dict) or not isinstance(payload.get('order_id'), str) or not payload['order_id']:
+        raise WebhookError('Notification does not contain an order ID')
+
+    return Notification(payload.get('event') or '', payload['order_id'], payload.get('project_id'))
+
+
+class WebhookHandler(object):
+    """
+    Turns order notifications into current orders, fetching each order at most once per `window` seconds.
+
+    The API often posts several notifications for the same order in quick succession, and retries notifications that
+    were not acknowledged in time. Notifications for an order whose fetch is in progress wait for that fetch, and
+    notifications arriving within `window` seconds after it reuse its result, so a burst costs one `get_order` call.
+    The `max_orders` most recently notified orders are remembered. The handler is safe to use from multiple threads.
+    """
+    received: int
+    duplicates: int
+    fetches: int
+
+    _api_client: ApiClient
+    _secret: Optional[Union[str, bytes]]
+    _window: float
+    _max_orders: int
+    _codec: JsonCodec
+    _orders: 'OrderedDict[str, Tuple[float, Future]]'
+
+    def __init__(self, api_client: ApiClient, secret: Union[str, bytes] = None, window: float = 5.0,
+                 max_orders: int = 10000, codec: JsonCodec = None) -> None:
+        """
+        :param ApiClient api_client: The client to fetch orders with.
+        :param secret: Shared secret the notifications are signed with; without it, signatures are not checked.
+        :param float window: Number of seconds a fetched order is reused for later notifications.
+        :param int max_orders: Maximum number of orders to remember.
+        :param JsonCodec codec: Codec to parse notifications with; defaults to the standard library.
+        """
+        self._api_client = api_client
+        self._secret = secret
+        self._window = window
+        self._max_orders = max_orders
+        self._codec = codec if codec is not None else StdlibJsonCodec()
+        self._orders = OrderedDict()
+        self._lock = threading.Lock()
+        self.received = 0
+        self.duplicates = 0
+        self.fetches = 0
+
+    @property
+    def stats(self) -> dict:
+        return {
+            'received': self.received,
+            'duplicates': self.duplicates,
+            'fetches': self.fetches,
+        }
+
+    def handle(self, body: Union[str, bytes], signature: str = None) -> WebhookEvent:
+        """
+        Verify and parse a notification, and get the current state of its order.
+
+        :param body: The raw request body of the notification.
+        :param str signature: The signature sent with the notification; required when the handler has a secret.
+        :raises WebhookError: When the notification is not signed correctly or cannot be parsed.
+        :raises HttpRequestError: When an error occurred while fetching the order.
+        """
+        if self._secret is not None and (not signature or not verify_signature(body, signature, self._secret)):
+            raise WebhookError('Invalid notification signature')
+
+        notification = parse_notification(body, self._codec)
+        future, duplicate = self._claim(notification.order_id)
+
+        if not duplicate:
+            try:
+                future.set_result(self._api_client.get_order(notification.order_id))
+            except BaseException as exception:
+                self._forget(notification.order_id, future)
+                future.set_exception(exception)
+
+        return WebhookEvent(notification, future.result(), duplicate)
+
+    def forget(self, order_id: str) -> None:
+        """
+        Make the next notification for an order fetch it again, e.g. after changing the order.
+        """
+        with self._lock:
+            self._orders.pop(order_id, None)
+
+    def _claim(self, order_id: str) -> Tuple['Future', bool]:
+        """
+        Get the fetch for an order that later notifications can reuse, or a new one when the caller must fetch it.
+        """
+        now = time.monotonic()
+
+        with self._lock:
+            self.received += 1
+            entry = self._orders.get(order_id)
+
+            if entry is not None and (not entry[1].done() or now - entry[0] < self._window):
+                self._orders.move_to_end(order_id)
+                self.duplicates += 1
+                return entry[1], True
+
+            from concurrent.futures import Future
+
+            future: Future = Future()
+            self._orders[order_id] = (now, future)
+            self._orders.move_to_end(order_id)
+            self.fetches += 1
+
+            while len(self._orders) > self._max_orders:
+                self._orders.popitem(last=False)
+
+            return future, False
+
+    def _forget(self, order_id: str, future: 'Future') -> None:
+        with self._lock:
+            entry = self._orders.get(order_id)
+            if entry is not None and entry[1] is future:
+                del self._orders[order_id]
@@ -12,7 +12,7 @@ setuptools.setup(
     long_description=long_description,
     long_description_content_type="text/markdown",
     url="https://github.com/gingerpayments/ginger-python",
-    packages=setuptools.find_packages(exclude=('tests', 'examples')),
+    packages=setuptools.find_packages(exclude=('tests', 'examples', 'benchmarks')),
     classifiers=[
         "Programming Language :: Python :: 3",
         "Programming Language :: Python :: 3.6",
@@ -24,5 +24,9 @@ setuptools.setup(
         "Topic :: Software Development :: Libraries :: Python Modules",
     ],
     install_requires=['requests>=2.20.0'],
+    extras_require={
+        'async': ['aiohttp>=3.6.0'],
+        'fast-json': ['orjson>=3.0.0'],
+    },
     python_requires='>=3.6',
 )
@@ -1,4 +1,7 @@
+import gzip
 import json
+import threading
+import time
 import unittest
 
 from unittest import mock
@@ -6,7 +9,15 @@ from unittest import mock
 from ginger_sdk.api_client import ApiClient
 from ginger_sdk.api_client import HttpRequestError
 from ginger_sdk.api_client import ServerError
+from ginger_sdk.cache import OrderCache
+from ginger_sdk.cache import TtlCache
+from ginger_sdk.circuit_breaker import CircuitOpenError
 from ginger_sdk.http_client import HttpClient
+from ginger_sdk.http_client import HttpResponse
+from ginger_sdk.http_client import HttpStream
+from ginger_sdk.models import Issuer
+from ginger_sdk.models import Order
+from ginger_sdk.models import Refund
 
 
 class ApiClientTest(unittest.TestCase):
@@ -84,6 +95,19 @@ class ApiClientTest(unittest.TestCase):
         )
         self.assertEqual(expected_order, order)
 
+    def test_it_lets_http_clients_add_headers(self) -> None:
+        class AuthenticatingHttpClient(HttpClient):
+            def request(self, method, path, headers={}, data=None, timeout=None):
+                headers['Authorization'] = 'Basic YWJjOg=='
+                headers.update({'X-Client': 'custom'})
+                return json.dumps(headers)
+
+        api_client = ApiClient(AuthenticatingHttpClient())
+
+        self.assertEqual({'Authorization': 'Basic YWJjOg==', 'X-Client': 'custom'}, api_client.get_order('abc'))
+        self.assertEqual('application/json', api_client.create_order({'amount': 995})['Content-Type'])
+        self.assertEqual({'Authorization': 'Basic YWJjOg==', 'X-Client': 'custom'}, api_client.get_order('def'))
+
     def test_it_updates_an_order(self) -> None:
         expected_order = {
             'id': 'fcbfdd3a-ea2c-4240-96b2-613d49b79a55',
@@ -167,6 +191,12 @@ class ApiClientTest(unittest.TestCase):
         with self.assertRaises(HttpRequestError):
             self._api_client.get_ideal_issuers()
 
+    def test_it_throws_an_exception_on_unserialisable_request_data(self) -> None:
+        with self.assertRaises(HttpRequestError):
+            self._api_client.create_order({'description': object()})
+
+        self._http_client.request.assert_not_called()
+
     def test_it_throws_an_exception_on_json_decode_error(self) -> None:
         self._http_client.request.return_value = 'definitely not json'
 
@@ -180,3 +210,483 @@ class ApiClientTest(unittest.TestCase):
 
         with self.assertRaises(ServerError):
             self._api_client.get_ideal_issuers()
+
+    def test_it_closes_the_http_client(self) -> None:
+        with self._api_client:
+            pass
+
+        self._http_client.close.assert_called_once_with()
+
+    def test_it_gets_orders_in_input_order(self) -> None:
+        def request(method, path, headers, data):
+            order_id = path.split('/')[2]
+            time.sleep(0.02 if order_id == 'a' else 0)
+            return json.dumps({'id': order_id})
+
+        self._http_client.request.side_effect = request
+
+        results = list(self._api_client.get_orders(['a', 'b', 'c'], max_concurrency=3))
+
+        self.assertEqual(['a', 'b', 'c'], [result.id for result in results])
+        self.assertEqual([{'id': 'a'}, {'id': 'b'}, {'id': 'c'}], [result.order for result in results])
+
+    def test_it_gets_orders_as_they_complete(self) -> None:
+        def request(method, path, headers, data):
+            order_id = path.split('/')[2]
+            time.sleep(0.05 if order_id == 'a' else 0)
+            return json.dumps({'id': order_id})
+
+        self._http_client.request.side_effect = request
+
+        results = list(self._api_client.get_orders(['a', 'b', 'c'], max_concurrency=3, ordered=False))
+
+        self.assertEqual('a', results[-1].id)
+        self.assertEqual({'a', 'b', 'c'}, {result.id for result in results})
+
+    def test_it_bounds_concurrent_order_lookups(self) -> None:
+        lock = threading.Lock()
+        in_flight = [0]
+        peak = [0]
+
+        def request(method, path, headers, data):
+            with lock:
+                in_flight[0] += 1
+                peak[0] = max(peak[0], in_flight[0])
+            time.sleep(0.005)
+            with lock:
+                in_flight[0] -= 1
+            return json.dumps({'id': path})
+
+        self._http_client.request.side_effect = request
+
+        results = list(self._api_client.get_orders((str(i) for i in range(20)), max_concurrency=4))
+
+        self.assertEqual(20, len(results))
+        self.assertLessEqual(peak[0], 4)
+
+    def test_it_reports_errors_next_to_orders(self) -> None:
+        def request(method, path, headers, data):
+            if path == '/orders/missing/':
+                return json.dumps({'error': {'status': '404', 'type': 'NotFound', 'value': 'No such order'}})
+            if path == '/orders/broken/':
+                raise Exception('Whoops!')
+            return json.dumps({'id': 'found'})
+
+        self._http_client.request.side_effect = request
+
+        results = list(self._api_client.get_orders(['found', 'missing', 'broken']))
+
+        self.assertEqual({'id': 'found'}, results[0].order)
+        self.assertIsNone(results[0].error)
+        self.assertIsInstance(results[1].error, ServerError)
+        self.assertIsInstance(results[2].error, HttpRequestError)
+
+    def test_it_reports_missing_ids_without_ending_the_batch(self) -> None:
+        self._http_client.request.return_value = json.dumps({'id': 'found'})
+
+        results = list(self._api_client.get_orders(['found', None, 'found']))
+
+        self.assertEqual(3, len(results))
+        self.assertIsInstance(results[1].error, ValueError)
+        self.assertEqual({'id': 'found'}, results[2].order)
+        self.assertEqual(2, self._http_client.request.call_count)
+
+    def test_it_caches_ideal_issuers(self) -> None:
+        api_client = ApiClient(self._http_client, cache=TtlCache(ttl=60))
+        self._http_client.request.return_value = json.dumps([{'id': 'INGBNL2A'}])
+
+        api_client.get_ideal_issuers()
+        issuers = api_client.get_ideal_issuers()
+
+        self._http_client.request.assert_called_once_with('GET', '/ideal/issuers/', {}, None)
+        self.assertEqual([{'id': 'INGBNL2A'}], issuers)
+
+    def test_it_passes_the_timeout_to_the_http_client(self) -> None:
+        self._http_client.request.return_value = json.dumps({'id': 'abc'})
+
+        self._api_client.get_order('abc', timeout=2.5)
+
+        self._http_client.request.assert_called_with('GET', '/orders/abc/', {}, None, timeout=2.5)
+
+    def test_it_does_not_wrap_request_errors_twice(self) -> None:
+        self._http_client.request.side_effect = CircuitOpenError('Circuit breaker is open')
+
+        with self.assertRaises(CircuitOpenError):
+            self._api_client.get_order('abc')
+
+    def test_it_uses_the_given_codec(self) -> None:
+        codec = mock.MagicMock()
+        codec.encode.return_value = b'encoded'
+        codec.decode.return_value = {'id': 'abc'}
+        api_client = ApiClient(self._http_client, codec=codec)
+        self._http_client.request.return_value = b'{"id": "abc"}'
+
+        order = api_client.create_order({'amount': 995})
+
+        self._http_client.request.assert_called_with(
+            'POST',
+            '/orders/',
+            {'Content-Type': 'application/json'},
+            b'encoded'
+        )
+        codec.decode.assert_called_once_with(b'{"id": "abc"}')
+        self.assertEqual({'id': 'abc'}, order)
+
+    def test_it_decodes_bytes_responses(self) -> None:
+        self._http_client.request.return_value = json.dumps({'id': 'abc'}).encode()
+
+        self.assertEqual({'id': 'abc'}, self._api_client.get_order('abc'))
+
+    def test_it_iterates_over_orders(self) -> None:
+        pages = {
+            0: [{'id': 'a'}, {'id': 'b'}],
+            2: [{'id': 'c'}],
+            3: [],
+        }
+
+        def request(method, path, headers, data):
+            offset = int(path.split('offset=')[1])
+            return json.dumps(pages[offset])
+
+        self._http_client.request.side_effect = request
+
+        orders = list(self._api_client.iter_orders({'status': 'completed'}, page_size=2, prefetch=False))
+
+        self.assertEqual([{'id': 'a'}, {'id': 'b'}, {'id': 'c'}], orders)
+        self._http_client.request.assert_any_call('GET', '/orders/?status=completed&limit=2&offset=0', {}, None)
+        self._http_client.request.assert_any_call('GET', '/orders/?status=completed&limit=2&offset=2', {}, None)
+        self._http_client.request.assert_called_with('GET', '/orders/?status=completed&limit=2&offset=3', {}, None)
+
+    def test_it_returns_models_when_enabled(self) -> None:
+        api_client = ApiClient(self._http_client, models=True)
+
+        self._http_client.request.return_value = json.dumps({'id': 'abc', 'transactions': [{'id': 'def'}]})
+        order = api_client.get_order('abc')
+
+        self.assertIsInstance(order, Order)
+        self.assertEqual('def', order.transactions[0].id)
+
+        self._http_client.request.return_value = json.dumps({'id': 'ghi'})
+        self.assertIsInstance(api_client.refund_order('abc', {'amount': 123}), Refund)
+
+        self._http_client.request.return_value = json.dumps([{'id': 'INGBNL2A'}])
+        self.assertIsInstance(api_client.get_ideal_issuers()[0], Issuer)
+
+    def test_it_calls_hooks(self) -> None:
+        hook = mock.MagicMock()
+        self._api_client.add_hook(hook)
+        self._http_client.request.return_value = HttpResponse(b'{"id": "abc"}', 200, {}, 0.01)
+
+        self._api_client.get_order('fcbfdd3a-ea2c-4240-96b2-613d49b79a55')
+
+        hook.before_request.assert_called_once()
+        hook.after_response.assert_called_once()
+        hook.on_error.assert_not_called()
+
+        event = hook.after_response.call_args[0][0]
+        self.assertEqual('GET', event.method)
+        self.assertEqual('/orders/{id}/', event.path_template)
+        self.assertEqual(200, event.status)
+        self.assertEqual(13, event.response_bytes)
+        self.assertEqual(0.01, event.ttfb)
+        self.assertGreaterEqual(event.total, 0)
+
+    def test_it_calls_error_hooks(self) -> None:
+        hook = mock.MagicMock()
+        self._api_client.add_hook(hook)
+        self._http_client.request.return_value = json.dumps(
+            {'error': {'status': '503', 'type': 'ConnectionError', 'value': 'The server made a boo-boo'}}
+        )
+
+        with self.assertRaises(ServerError):
+            self._api_client.get_ideal_issuers()
+
+        event, exception = hook.on_error.call_args[0]
+        self.assertEqual(503, event.status)
+        self.assertIsInstance(exception, ServerError)
+        hook.after_response.assert_not_called()
+
+    def test_it_ignores_failing_hooks(self) -> None:
+        hook = mock.MagicMock()
+        hook.before_request.side_effect = Exception('Broken hook')
+        self._api_client.add_hook(hook)
+        self._http_client.request.return_value = json.dumps({'id': 'abc'})
+
+        with self.assertLogs('ginger_sdk.hooks'):
+            self.assertEqual({'id': 'abc'}, self._api_client.get_order('abc'))
+
+    def test_it_creates_orders_in_a_batch(self) -> None:
+        def request(method, path, headers, data):
+            order_data = json.loads(data)
+            time.sleep(0.02 if order_data['merchant_order_id'] == 'm-0' else 0)
+            return json.dumps({'id': 'id-' + order_data['merchant_order_id'], **order_data})
+
+        self._http_client.request.side_effect = request
+
+        results = list(self._api_client.create_orders(
+            ({'merchant_order_id': 'm-{}'.format(i), 'amount': 995} for i in range(5)),
+            max_in_flight=5
+        ))
+
+        self.assertEqual({'m-0', 'm-1', 'm-2', 'm-3', 'm-4'}, {result.id for result in results})
+        self.assertEqual('m-0', results[-1].id)
+        for result in results:
+            self.assertEqual('id-' + result.id, result.order['id'])
+
+    def test_it_sends_idempotency_keys_when_creating_orders(self) -> None:
+        self._http_client.request.return_value = json.dumps({'id': 'abc'})
+
+        list(self._api_client.create_orders([{'merchant_order_id': 'm-1', 'amount': 995}]))
+
+        self._http_client.request.assert_called_once_with(
+            'POST',
+            '/orders/',
+            {'Content-Type': 'application/json', 'Idempotency-Key': 'order-m-1'},
+            json.dumps({'merchant_order_id': 'm-1', 'amount': 995})
+        )
+
+    def test_it_applies_backpressure_to_the_order_producer(self) -> None:
+        produced = []
+
+        def producer():
+            for i in range(100):
+                produced.append(i)
+                yield {'merchant_order_id': 'm-{}'.format(i)}
+
+        self._http_client.request.return_value = json.dumps({'id': 'abc'})
+
+        results = self._api_client.create_orders(producer(), max_in_flight=3)
+        next(results)
+
+        self.assertLessEqual(len(produced), 4)
+        results.close()
+
+    def test_it_reports_errors_when_creating_orders(self) -> None:
+        self._http_client.request.return_value = json.dumps(
+            {'error': {'status': '400', 'type': 'ValidationError', 'value': 'Invalid amount'}}
+        )
+
+        results = list(self._api_client.create_orders([{'merchant_order_id': 'm-1', 'amount': -1}]))
+
+        self.assertEqual('m-1', results[0].id)
+        self.assertIsInstance(results[0].error, ServerError)
+
+    def test_it_reports_missing_orders_without_ending_the_batch(self) -> None:
+        self._http_client.request.return_value = json.dumps({'id': 'abc'})
+
+        results = list(self._api_client.create_orders([None, {'merchant_order_id': 'm-1'}], ordered=True))
+
+        self.assertEqual(2, len(results))
+        self.assertIsInstance(results[0].error, ValueError)
+        self.assertEqual('m-1', results[1].id)
+        self.assertEqual({'id': 'abc'}, results[1].order)
+
+    def test_it_limits_the_order_creation_rate(self) -> None:
+        self._http_client.request.return_value = json.dumps({'id': 'abc'})
+
+        start = time.monotonic()
+        list(self._api_client.create_orders(
+            ({'merchant_order_id': 'm-{}'.format(i)} for i in range(5)),
+            max_rate=50
+        ))
+
+        self.assertGreaterEqual(time.monotonic() - start, 0.08)
+
+    def test_it_revalidates_cached_orders(self) -> None:
+        order_id = 'fcbfdd3a-ea2c-4240-96b2-613d49b79a55'
+        self._http_client.request.side_effect = [
+            HttpResponse(b'{"id": "abc", "status": "new"}', 200, {'ETag': '"v1"', 'Last-Modified': 'Wed, 1 Jan'}),
+            None,
+        ]
+        api_client = ApiClient(self._http_client, order_cache=OrderCache())
+
+        first = api_client.get_order(order_id)
+        second = api_client.get_order(order_id)
+
+        self.assertEqual({'id': 'abc', 'status': 'new'}, second)
+        self.assertIs(first, second)
+        self._http_client.request.assert_called_with(
+            'GET',
+            '/orders/{}/'.format(order_id),
+            {'If-None-Match': '"v1"', 'If-Modified-Since': 'Wed, 1 Jan'},
+            None
+        )
+        self.assertEqual({'hits': 0, 'revalidations': 1, 'misses': 1}, api_client._order_cache.stats)
+
+    def test_it_does_not_refetch_immutable_orders(self) -> None:
+        self._http_client.request.return_value = '{"id": "abc", "status": "completed"}'
+        api_client = ApiClient(
+            self._http_client,
+            order_cache=OrderCache(immutable_statuses=OrderCache.TERMINAL_STATUSES),
+            models=True
+        )
+
+        api_client.get_order('abc')
+        order = api_client.get_order('abc')
+
+        self.assertIsInstance(order, Order)
+        self.assertEqual('completed', order.status)
+        self.assertEqual(1, self._http_client.request.call_count)
+
+    def test_it_invalidates_cached_orders_it_changes(self) -> None:
+        self._http_client.request.return_value = '{"id": "abc", "status": "completed"}'
+        api_client = ApiClient(
+            self._http_client,
+            order_cache=OrderCache(immutable_statuses=OrderCache.TERMINAL_STATUSES)
+        )
+
+        for change in [
+            lambda: api_client.update_order('abc', {'description': 'New'}),
+            lambda: api_client.refund_order('abc', {'amount': 100}),
+            lambda: api_client.capture_order_transaction('abc', 'def'),
+        ]:
+            api_client.get_order('abc')
+            change()
+            self._http_client.request.reset_mock()
+
+            api_client.get_order('abc')
+
+            self._http_client.request.assert_called_once_with('GET', '/orders/abc/', {}, None)
+
+    def test_it_coalesces_identical_get_requests(self) -> None:
+        started = threading.Event()
+        release = threading.Event()
+
+        def request(*_):
+            started.set()
+            release.wait(1)
+            return '{"id": "abc"}'
+
+        self._http_client.request.side_effect = request
+        api_client = ApiClient(self._http_client, coalesce_gets=True)
+        results = []
+
+        threads = [threading.Thread(target=lambda: results.append(api_client.get_order('abc'))) for _ in range(4)]
+        threads[0].start()
+        started.wait(1)
+        for thread in threads[1:]:
+            thread.start()
+        time.sleep(0.1)  # Let the other threads join the request in progress.
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual([{'id': 'abc'}] * 4, results)
+        self.assertEqual(1, self._http_client.request.call_count)
+
+    def test_it_does_not_coalesce_other_requests(self) -> None:
+        self._http_client.request.return_value = '{"id": "abc"}'
+        api_client = ApiClient(self._http_client, coalesce_gets=True)
+
+        api_client.get_order('abc')
+        api_client.get_order('abc')
+        api_client.update_order('abc', {'description': 'New'})
+
+        self.assertEqual(3, self._http_client.request.call_count)
+
+    def test_it_does_not_coalesce_get_requests_with_a_body(self) -> None:
+        started = threading.Event()
+        release = threading.Event()
+
+        def request(method, path, headers, data):
+            started.set()
+            release.wait(1)
+            return data
+
+        self._http_client.request.side_effect = request
+        api_client = ApiClient(self._http_client, coalesce_gets=True)
+        results = []
+
+        def send(page):
+            results.append(api_client.send('GET', '/orders/', {'page': page}))
+
+        threads = [threading.Thread(target=send, args=(page,)) for page in range(2)]
+        threads[0].start()
+        started.wait(1)
+        threads[1].start()
+        time.sleep(0.1)  # Give the second thread the chance to join the request in progress.
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertCountEqual([{'page': 0}, {'page': 1}], results)
+        self.assertEqual(2, self._http_client.request.call_count)
+
+    def test_it_compresses_large_request_bodies(self) -> None:
+        hook = mock.MagicMock()
+        self._http_client.request.return_value = HttpResponse(b'{"id": "abc"}', 201, {}, wire_size=9)
+        api_client = ApiClient(self._http_client, hooks=[hook], compress_requests_above=100)
+        order_data = {'description': 'x' * 200}
+
+        api_client.create_order(order_data)
+
+        _, _, headers, body = self._http_client.request.call_args[0]
+        self.assertEqual({'Content-Type': 'application/json', 'Content-Encoding': 'gzip'}, headers)
+        self.assertEqual(order_data, json.loads(gzip.decompress(body)))
+
+        event = hook.after_response.call_args[0][0]
+        self.assertEqual(len(json.dumps(order_data)), event.request_bytes)
+        self.assertEqual(len(body), event.request_wire_bytes)
+        self.assertEqual(13, event.response_bytes)
+        self.assertEqual(9, event.response_wire_bytes)
+
+    def test_it_does_not_compress_small_request_bodies(self) -> None:
+        self._http_client.request.return_value = '{"id": "abc"}'
+        api_client = ApiClient(self._http_client, compress_requests_above=100)
+
+        api_client.create_order({'amount': 995})
+
+        self._http_client.request.assert_called_with(
+            'POST', '/orders/', {'Content-Type': 'application/json'}, '{"amount": 995}'
+        )
+
+
+    def test_it_streams_the_elements_of_a_response(self) -> None:
+        close = mock.MagicMock()
+        self._http_client.stream.return_value = HttpStream([b'[{"id": "abc"},', b' {"id": "def"}]'], 200, close=close)
+
+        items = self._api_client.stream('GET', '/orders/', timeout=5)
+
+        self._http_client.stream.assert_not_called()
+        self.assertEqual([{'id': 'abc'}, {'id': 'def'}], list(items))
+        self._http_client.stream.assert_called_once_with('GET', '/orders/', {}, None, timeout=5)
+        close.assert_called_once_with()
+
+    def test_it_detects_errors_in_streamed_responses(self) -> None:
+        self._http_client.stream.return_value = HttpStream(
+            [b'{"error": {"status": "404", "type": "NotFound", "value": "Not found"}}'], 404
+        )
+
+        with self.assertRaises(ServerError):
+            list(self._api_client.stream('GET', '/orders/'))
+
+    def test_it_wraps_errors_while_streaming(self) -> None:
+        def chunks():
+            yield b'[{"id": "abc"},'
+            raise OSError('Connection reset')
+
+        self._http_client.stream.return_value = HttpStream(chunks(), 200)
+
+        with self.assertRaises(HttpRequestError):
+            list(self._api_client.stream('GET', '/orders/'))
+
+    def test_it_calls_hooks_for_streamed_requests(self) -> None:
+        hook = mock.MagicMock()
+        self._api_client.add_hook(hook)
+        self._http_client.stream.return_value = HttpStream([b'[1,', b' 2]'], 200, {}, 0.01)
+
+        self.assertEqual([1, 2], list(self._api_client.stream('POST', '/orders/', {'amount': 995})))
+
+        event = hook.after_response.call_args[0][0]
+        self.assertEqual((200, 15, 6, 0.01), (event.status, event.request_bytes, event.response_bytes, event.ttfb))
+        hook.on_error.assert_not_called()
+
+    def test_it_releases_a_stream_that_is_not_read_to_the_end(self) -> None:
+        close = mock.MagicMock()
+        self._http_client.stream.return_value = HttpStream([b'[1,', b' 2]'], 200, close=close)
+
+        items = self._api_client.stream('GET', '/orders/')
+        next(items)
+        items.close()
+
+        close.assert_called_once_with()
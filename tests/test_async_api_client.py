@@ -0,0 +1,145 @@
+import asyncio
+import json
+import unittest
+
+from unittest import mock
+
+from ginger_sdk.api_client import HttpRequestError
+from ginger_sdk.api_client import ServerError
+from ginger_sdk.async_api_client import AsyncApiClient
+
+
+def run(coroutine):
+    loop = asyncio.new_event_loop()
+
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+def returning(value):
+    async def request(*_):
+        return value
+
+    return request
+
+
+def raising(exception):
+    async def request(*_):
+        raise exception
+
+    return request
+
+
+class AsyncApiClientTest(unittest.TestCase):
+    _http_client: mock.MagicMock
+    _api_client: AsyncApiClient
+
+    def setUp(self) -> None:
+        self._http_client = mock.MagicMock()
+        self._api_client = AsyncApiClient(self._http_client)
+
+    def test_it_gets_an_order(self) -> None:
+        expected_order = {'id': 'fcbfdd3a-ea2c-4240-96b2-613d49b79a55', 'transactions': []}
+        self._http_client.request.side_effect = returning(json.dumps(expected_order))
+
+        order = run(self._api_client.get_order('fcbfdd3a-ea2c-4240-96b2-613d49b79a55'))
+
+        self._http_client.request.assert_called_with('GET', '/orders/fcbfdd3a-ea2c-4240-96b2-613d49b79a55/', {}, None)
+        self.assertEqual(expected_order, order)
+
+    def test_it_creates_an_order(self) -> None:
+        expected_order = {'amount': 995, 'currency': 'EUR'}
+        self._http_client.request.side_effect = returning(json.dumps(expected_order))
+
+        order = run(self._api_client.create_order(expected_order))
+
+        self._http_client.request.assert_called_with(
+            'POST',
+            '/orders/',
+            {'Content-Type': 'application/json'},
+            json.dumps(expected_order)
+        )
+        self.assertEqual(expected_order, order)
+
+    def test_it_refunds_an_order(self) -> None:
+        self._http_client.request.side_effect = returning(json.dumps({'id': 'abc'}))
+
+        refund = run(self._api_client.refund_order('abc', {'amount': 123}))
+
+        self._http_client.request.assert_called_with(
+            'POST',
+            '/orders/abc/refunds/',
+            {'Content-Type': 'application/json'},
+            json.dumps({'amount': 123})
+        )
+        self.assertEqual({'id': 'abc'}, refund)
+
+    def test_it_captures_an_order_transaction(self) -> None:
+        self._http_client.request.side_effect = returning(None)
+
+        run(self._api_client.capture_order_transaction('abc', 'def'))
+
+        self._http_client.request.assert_called_with('POST', '/orders/abc/transactions/def/captures/', {}, None)
+
+    def test_it_runs_requests_concurrently(self) -> None:
+        in_flight = []
+        peak = []
+
+        async def request(method, path, headers, data):
+            in_flight.append(path)
+            peak.append(len(in_flight))
+            await asyncio.sleep(0.01)
+            in_flight.remove(path)
+            return json.dumps({'id': path})
+
+        self._http_client.request.side_effect = request
+
+        async def get_orders():
+            return await asyncio.gather(*(self._api_client.get_order(str(i)) for i in range(10)))
+
+        orders = run(get_orders())
+
+        self.assertEqual(10, len(orders))
+        self.assertEqual(10, max(peak))
+
+    def test_it_throws_an_exception_on_http_client_error(self) -> None:
+        self._http_client.request.side_effect = raising(Exception('Whoops!'))
+
+        with self.assertRaises(HttpRequestError):
+            run(self._api_client.get_ideal_issuers())
+
+    def test_it_throws_an_exception_on_server_error(self) -> None:
+        self._http_client.request.side_effect = returning(json.dumps(
+            {'error': {'status': '503', 'type': 'ConnectionError', 'value': 'The server made a boo-boo'}}
+        ))
+
+        with self.assertRaises(ServerError):
+            run(self._api_client.get_ideal_issuers())
+
+    def test_it_closes_the_http_client(self) -> None:
+        self._http_client.close.side_effect = returning(None)
+
+        async def use_client():
+            async with self._api_client:
+                pass
+
+        run(use_client())
+
+        self._http_client.close.assert_called_once_with()
+
+    def test_it_coalesces_identical_get_requests(self) -> None:
+        async def request(*_):
+            await asyncio.sleep(0.01)
+            return '{"id": "abc"}'
+
+        self._http_client.request.side_effect = request
+        api_client = AsyncApiClient(self._http_client, coalesce_gets=True)
+
+        async def main():
+            return await asyncio.gather(*(api_client.get_order('abc') for _ in range(5)))
+
+        self.assertEqual([{'id': 'abc'}] * 5, run(main()))
+        self.assertEqual(1, self._http_client.request.call_count)
+
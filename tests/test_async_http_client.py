@@ -0,0 +1,93 @@
+import asyncio
+import json
+import unittest
+
+from aiohttp import web
+
+from ginger_sdk.async_http_client import AiohttpHttpClient
+from ginger_sdk.http_client import HttpException
+
+
+class AiohttpHttpClientTest(unittest.TestCase):
+    _loop: asyncio.AbstractEventLoop
+    _runner: web.AppRunner
+    _endpoint: str
+
+    def setUp(self) -> None:
+        async def echo(request: web.Request) -> web.Response:
+            if request.path == '/empty/response':
+                return web.Response(text='')
+
+            return web.json_response({
+                'url': str(request.url),
+                'method': request.method,
+                'data': await request.text(),
+                'authorization': request.headers.get('Authorization'),
+                'custom_header': request.headers.get('X-Custom-Header'),
+            })
+
+        app = web.Application()
+        app.router.add_route('*', '/{tail:.*}', echo)
+
+        self._loop = asyncio.new_event_loop()
+        self._runner = web.AppRunner(app)
+        self._loop.run_until_complete(self._runner.setup())
+        site = web.TCPSite(self._runner, '127.0.0.1', 0)
+        self._loop.run_until_complete(site.start())
+        self._endpoint = 'http://127.0.0.1:{}'.format(self._runner.addresses[0][1])
+
+    def tearDown(self) -> None:
+        self._loop.run_until_complete(self._runner.cleanup())
+        self._loop.close()
+
+    def test_it_sends_a_request(self) -> None:
+        client = AiohttpHttpClient(self._endpoint, '1a1b2e63c55e', {'X-Custom-Header': 'foobar'})
+
+        async def send():
+            async with client:
+                return await client.request('POST', '/foo/bar', {'Content-Type': 'text/plain'}, 'request data')
+
+        response = json.loads(self._loop.run_until_complete(send()))
+
+        self.assertEqual(self._endpoint + '/foo/bar', response['url'])
+        self.assertEqual('POST', response['method'])
+        self.assertEqual('request data', response['data'])
+        self.assertEqual('Basic MWExYjJlNjNjNTVlOg==', response['authorization'])
+        self.assertEqual('foobar', response['custom_header'])
+
+    def test_it_reuses_the_session(self) -> None:
+        client = AiohttpHttpClient(self._endpoint, '1a1b2e63c55e')
+
+        async def send():
+            await client.request('GET', '/foo')
+            session = client._session
+            await client.request('GET', '/bar')
+            await client.close()
+            return session
+
+        session = self._loop.run_until_complete(send())
+
+        self.assertIsNotNone(session)
+        self.assertTrue(session.closed)
+
+    def test_it_keeps_the_status_of_an_empty_response_body(self) -> None:
+        client = AiohttpHttpClient(self._endpoint, '1a1b2e63c55e')
+
+        async def send():
+            async with client:
+                return await client.request('GET', '/empty/response')
+
+        response = self._loop.run_until_complete(send())
+
+        self.assertEqual(b'', response)
+        self.assertEqual(200, response.status_code)
+
+    def test_it_raises_an_exception_on_connection_error(self) -> None:
+        client = AiohttpHttpClient('http://127.0.0.1:1', '1a1b2e63c55e')
+
+        async def send():
+            async with client:
+                return await client.request('GET', '/error')
+
+        with self.assertRaises(HttpException):
+            self._loop.run_until_complete(send())
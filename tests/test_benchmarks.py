@@ -0,0 +1,111 @@
+import sys
+import unittest
+
+from benchmarks.bench_client import benchmark
+from benchmarks.bench_client import find_regressions
+from benchmarks.bench_import import LAZY_MODULES
+from benchmarks.bench_import import measure_import
+from benchmarks.bench_requests import OPERATIONS
+from benchmarks.bench_requests import create_client
+from benchmarks.bench_requests import measure
+from benchmarks.fake_psp import FakePsp
+from ginger_sdk import Ginger
+from ginger_sdk.api_client import ServerError
+from ginger_sdk.metrics import MetricsCollector
+
+
+class FakePspTest(unittest.TestCase):
+    def test_it_serves_the_api(self) -> None:
+        with FakePsp(transactions=2, issuers=3) as psp:
+            with Ginger.create_client(psp.endpoint, 'abc123') as client:
+                order = client.create_order({'amount': 995, 'currency': 'EUR'})
+
+                self.assertEqual(995, order['amount'])
+                self.assertEqual(2, len(order['transactions']))
+                self.assertEqual(order['id'], client.get_order(order['id'])['id'])
+                self.assertEqual(3, len(client.get_ideal_issuers()))
+                self.assertIsNone(client.capture_order_transaction(order['id'], order['transactions'][0]['id']))
+                self.assertEqual(['is-refund'], client.refund_order(order['id'], {'amount': 100})['flags'])
+
+    def test_it_lists_a_finite_number_of_orders(self) -> None:
+        with FakePsp(orders=25) as psp:
+            with Ginger.create_client(psp.endpoint, 'abc123') as client:
+                created = client.create_order({'amount': 995, 'currency': 'EUR'})
+                orders = list(client.iter_orders(page_size=10))
+
+                self.assertEqual(26, len(orders))
+                self.assertEqual(created['id'], orders[-1]['id'])
+                self.assertEqual(26, len({order['id'] for order in orders}))
+
+    def test_it_simulates_errors(self) -> None:
+        with FakePsp(error_rate=1.0) as psp:
+            with Ginger.create_client(psp.endpoint, 'abc123') as client:
+                with self.assertRaises(ServerError):
+                    client.get_ideal_issuers()
+
+    def test_it_compresses_in_both_directions(self) -> None:
+        with FakePsp(transactions=20, compress=True) as psp:
+            for transport in ['requests', 'urllib3']:
+                metrics = MetricsCollector()
+                client = Ginger.create_client(
+                    psp.endpoint, 'abc123', transport=transport, hooks=[metrics], compress_requests_above=100
+                )
+
+                with client:
+                    order = client.create_order({'amount': 995, 'description': 'x' * 500})
+
+                self.assertEqual(20, len(order['transactions']))
+                stats = metrics.snapshot()[('POST', '/orders/')]
+                self.assertLess(stats['wire_bytes_sent'], stats['bytes_sent'])
+                self.assertLess(stats['wire_bytes_received'], stats['bytes_received'] / 2)
+
+
+class BenchmarkTest(unittest.TestCase):
+    def test_it_measures_each_mode(self) -> None:
+        with FakePsp() as psp:
+            for mode in ['sequential', 'threaded', 'async']:
+                result = benchmark(mode, psp.endpoint, 'get_order', 20, 4)
+
+                self.assertEqual(20, result['requests'])
+                self.assertEqual(0, result['errors'])
+                self.assertGreater(result['throughput'], 0)
+                self.assertGreaterEqual(result['p99_ms'], result['p50_ms'])
+
+    def test_it_measures_each_transport(self) -> None:
+        with FakePsp() as psp:
+            for transport in ['requests', 'urllib3']:
+                result = benchmark('sequential', psp.endpoint, 'create_order', 10, 1, transport)
+
+                self.assertEqual(0, result['errors'])
+                self.assertGreater(result['cpu_us'], 0)
+
+    def test_it_finds_regressions(self) -> None:
+        baseline = {'threaded': {'throughput': 1000.0, 'p99_ms': 10.0}}
+
+        self.assertEqual([], find_regressions({'threaded': {'throughput': 900.0, 'p99_ms': 11.0}}, baseline, 0.2))
+        self.assertEqual(2, len(find_regressions({'threaded': {'throughput': 700.0, 'p99_ms': 13.0}}, baseline, 0.2)))
+
+
+@unittest.skipIf(sys.version_info < (3, 7), 'python -X importtime needs Python 3.7')
+class ImportBenchmarkTest(unittest.TestCase):
+    def test_it_imports_http_libraries_lazily(self) -> None:
+        times = measure_import()
+
+        self.assertIn('ginger_sdk', times)
+        for module in LAZY_MODULES:
+            self.assertNotIn(module, times)
+
+
+class RequestBenchmarkTest(unittest.TestCase):
+    def test_it_measures_each_operation_without_a_network(self) -> None:
+        for transport in sorted(Ginger.TRANSPORTS):
+            with self.subTest(transport=transport):
+                client = create_client(transport)
+
+                self.assertEqual('new', client.get_order('abc')['status'])
+
+                for operation in OPERATIONS.values():
+                    result = measure(operation, client, 10)
+
+                    self.assertGreater(result['us_per_call'], 0)
+                    self.assertGreater(result['bytes_per_call'], 0)
@@ -0,0 +1,137 @@
+import threading
+import time
+import unittest
+
+from ginger_sdk.cache import CacheEntry
+from ginger_sdk.cache import MemoryCacheBackend
+from ginger_sdk.cache import OrderCache
+from ginger_sdk.cache import OrderSnapshot
+from ginger_sdk.cache import TtlCache
+
+
+class TtlCacheTest(unittest.TestCase):
+    def test_it_serves_fresh_entries_from_the_cache(self) -> None:
+        cache = TtlCache(ttl=60)
+        calls = []
+
+        def loader():
+            calls.append(1)
+            return ['issuer']
+
+        self.assertEqual(['issuer'], cache.get_or_load('key', loader))
+        self.assertEqual(['issuer'], cache.get_or_load('key', loader))
+
+        self.assertEqual(1, len(calls))
+        self.assertEqual({'hits': 1, 'stale_hits': 0, 'misses': 1, 'refreshes': 0}, cache.stats)
+
+    def test_it_reloads_expired_entries(self) -> None:
+        backend = MemoryCacheBackend()
+        backend.set('key', CacheEntry('old', time.time() - 120))
+        cache = TtlCache(ttl=60, backend=backend)
+
+        self.assertEqual('new', cache.get_or_load('key', lambda: 'new'))
+        self.assertEqual(1, cache.misses)
+
+    def test_it_serves_stale_entries_while_refreshing_in_the_background(self) -> None:
+        backend = MemoryCacheBackend()
+        backend.set('key', CacheEntry('old', time.time() - 90))
+        cache = TtlCache(ttl=60, stale_ttl=60, backend=backend)
+        refreshed = threading.Event()
+
+        def loader():
+            refreshed.set()
+            return 'new'
+
+        self.assertEqual('old', cache.get_or_load('key', loader))
+        self.assertTrue(refreshed.wait(1))
+
+        for _ in range(100):
+            if backend.get('key').value == 'new':
+                break
+            time.sleep(0.01)
+
+        self.assertEqual('new', cache.get_or_load('key', loader))
+        self.assertEqual(1, cache.refreshes)
+
+    def test_it_shares_one_load_between_concurrent_misses(self) -> None:
+        cache = TtlCache(ttl=60)
+        calls = []
+        release = threading.Event()
+
+        def loader():
+            calls.append(1)
+            release.wait(1)
+            return 'value'
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(cache.get_or_load('key', loader)))
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.05)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(['value'] * 5, results)
+        self.assertEqual(1, len(calls))
+
+    def test_it_does_not_cache_errors(self) -> None:
+        cache = TtlCache(ttl=60)
+
+        def failing_loader():
+            raise ValueError('Whoops!')
+
+        with self.assertRaises(ValueError):
+            cache.get_or_load('key', failing_loader)
+
+        self.assertEqual('value', cache.get_or_load('key', lambda: 'value'))
+
+    def test_it_invalidates_entries(self) -> None:
+        cache = TtlCache(ttl=60)
+        cache.get_or_load('key', lambda: 'old')
+
+        cache.invalidate('key')
+
+        self.assertEqual('new', cache.get_or_load('key', lambda: 'new'))
+
+
+class OrderCacheTest(unittest.TestCase):
+    def test_it_stores_fetched_orders(self) -> None:
+        cache = OrderCache()
+        requests = []
+
+        def fetch(headers):
+            requests.append(headers)
+            return OrderSnapshot({'id': 'a'}, '"v1"') if len(requests) == 1 else None
+
+        self.assertEqual({'id': 'a'}, cache.get_or_fetch('a', fetch))
+        self.assertEqual({'id': 'a'}, cache.get_or_fetch('a', fetch))
+        self.assertEqual([{}, {'If-None-Match': '"v1"'}], requests)
+
+    def test_it_evicts_the_least_recently_used_orders(self) -> None:
+        cache = OrderCache(max_size=2)
+
+        for id in ['a', 'b', 'a', 'c']:
+            cache.get_or_fetch(id, lambda headers, id=id: None if headers else OrderSnapshot({'id': id}, '"v1"'))
+
+        requests = []
+        for id in ['a', 'b']:
+            cache.get_or_fetch(id, lambda headers, id=id: requests.append(headers) or OrderSnapshot({'id': id}))
+
+        self.assertEqual([{'If-None-Match': '"v1"'}, {}], requests)
+        self.assertEqual(2, len(cache))
+
+    def test_it_does_not_store_orders_invalidated_while_fetching(self) -> None:
+        cache = OrderCache()
+
+        def fetch(headers):
+            cache.invalidate('a')
+            return OrderSnapshot({'id': 'a', 'status': 'new'})
+
+        cache.get_or_fetch('a', fetch)
+
+        self.assertEqual(0, len(cache))
+
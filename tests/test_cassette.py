@@ -0,0 +1,143 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+
+from unittest import mock
+
+from ginger_sdk.api_client import ApiClient
+from ginger_sdk.cassette import RecordingHttpClient
+from ginger_sdk.cassette import ReplayHttpClient
+from ginger_sdk.cassette import read_cassette
+from ginger_sdk.http_client import HttpException
+from ginger_sdk.http_client import HttpResponse
+
+
+class CassetteTest(unittest.TestCase):
+    def setUp(self) -> None:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self._path = os.path.join(directory.name, 'orders.cassette')
+
+        self._http_client = mock.MagicMock()
+        self._http_client.request.side_effect = [
+            HttpResponse(b'{"id": "abc", "status": "new"}', 200, {'ETag': '"v1"'}, 0.05),
+            HttpResponse(b'{"id": "abc", "status": "completed"}', 200, {}, 0.04),
+            '{"id": "def"}',
+            None,
+        ]
+
+    def _record(self) -> None:
+        with ApiClient(RecordingHttpClient(self._http_client, self._path)) as api_client:
+            api_client.get_order('abc')
+            api_client.get_order('abc')
+            api_client.create_order({'amount': 995})
+            api_client.capture_order_transaction('abc', 'def')
+
+    def test_it_records_interactions(self) -> None:
+        self._record()
+
+        interactions = list(read_cassette(self._path))
+
+        self.assertEqual(4, len(interactions))
+        self.assertEqual(('GET', '/orders/abc/', b''), interactions[0][:3])
+        self.assertEqual((200, {'ETag': '"v1"'}, b'{"id": "abc", "status": "new"}', 0.05), interactions[0][3:])
+        self.assertEqual(('POST', '/orders/', b'{"amount": 995}'), interactions[2][:3])
+        self.assertEqual((None, {}, b'{"id": "def"}', None), interactions[2][3:])
+        self.assertIsNone(interactions[3].body)
+
+    def test_it_replays_responses_in_turn(self) -> None:
+        self._record()
+
+        with ApiClient(ReplayHttpClient(self._path)) as api_client:
+            self.assertEqual('new', api_client.get_order('abc')['status'])
+            self.assertEqual('completed', api_client.get_order('abc')['status'])
+            self.assertEqual('new', api_client.get_order('abc')['status'])
+            self.assertEqual({'id': 'def'}, api_client.create_order({'amount': 100}))
+            self.assertIsNone(api_client.capture_order_transaction('abc', 'def'))
+
+    def test_it_replays_headers_and_status(self) -> None:
+        self._record()
+        replay = ReplayHttpClient(self._path)
+        self.addCleanup(replay.close)
+
+        response = replay.request('GET', '/orders/abc/')
+
+        self.assertEqual(200, response.status_code)
+        self.assertEqual('"v1"', response.headers['ETag'])
+
+    def test_it_matches_path_templates(self) -> None:
+        self._http_client.request.side_effect = None
+        self._http_client.request.return_value = b'{"id": "fcbfdd3a-ea2c-4240-96b2-613d49b79a55"}'
+
+        with RecordingHttpClient(self._http_client, self._path) as recorder:
+            recorder.request('GET', '/orders/fcbfdd3a-ea2c-4240-96b2-613d49b79a55/')
+
+        exact = ReplayHttpClient(self._path)
+        templated = ReplayHttpClient(self._path, match_templates=True)
+        self.addCleanup(exact.close)
+        self.addCleanup(templated.close)
+
+        with self.assertRaises(HttpException):
+            exact.request('GET', '/orders/ca3dfa6f-3dd3-4942-a358-b6852a407333/')
+
+        self.assertIsNotNone(templated.request('GET', '/orders/ca3dfa6f-3dd3-4942-a358-b6852a407333/'))
+
+    def test_it_appends_to_a_cassette(self) -> None:
+        self._record()
+        self._http_client.request.side_effect = None
+        self._http_client.request.return_value = b'{}'
+
+        with RecordingHttpClient(self._http_client, self._path) as recorder:
+            recorder.request('GET', '/ideal/issuers/')
+
+        self.assertEqual(5, len(list(read_cassette(self._path))))
+
+    def test_it_ignores_a_truncated_last_interaction(self) -> None:
+        self._record()
+
+        with open(self._path, 'r+b') as file:
+            file.truncate(os.path.getsize(self._path) - 3)
+
+        self.assertEqual(3, len(list(read_cassette(self._path))))
+
+    def test_it_simulates_latency(self) -> None:
+        self._record()
+        replay = ReplayHttpClient(self._path, recorded_latency=True)
+        self.addCleanup(replay.close)
+
+        start = time.monotonic()
+        replay.request('GET', '/orders/abc/')
+        self.assertGreaterEqual(time.monotonic() - start, 0.05)
+
+        with self.assertRaises(HttpException):
+            replay.request('GET', '/orders/abc/', timeout=0.01)
+
+    def test_it_rejects_other_files(self) -> None:
+        with open(self._path, 'wb') as file:
+            file.write(b'not a cassette')
+
+        with self.assertRaises(ValueError):
+            ReplayHttpClient(self._path)
+
+    def test_it_replays_from_many_threads(self) -> None:
+        self._record()
+        replay = ReplayHttpClient(self._path)
+        self.addCleanup(replay.close)
+        errors = []
+
+        def replay_orders():
+            try:
+                for _ in range(1000):
+                    replay.request('GET', '/orders/abc/')
+            except Exception as exception:
+                errors.append(exception)
+
+        threads = [threading.Thread(target=replay_orders) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual([], errors)
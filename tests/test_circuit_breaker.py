@@ -0,0 +1,167 @@
+import unittest
+
+from unittest import mock
+
+from ginger_sdk.circuit_breaker import CircuitBreaker
+from ginger_sdk.circuit_breaker import CircuitBreakerHttpClient
+from ginger_sdk.circuit_breaker import CircuitOpenError
+from ginger_sdk.http_client import HttpException
+from ginger_sdk.http_client import HttpResponse
+from ginger_sdk.rate_limit import RateLimitExceeded
+
+
+class CircuitBreakerTest(unittest.TestCase):
+    _now: list
+
+    def setUp(self) -> None:
+        self._now = [1000.0]
+
+        patcher = mock.patch('ginger_sdk.circuit_breaker.time.monotonic', side_effect=lambda: self._now[0])
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_it_stays_closed_below_the_failure_rate_threshold(self) -> None:
+        breaker = CircuitBreaker(failure_rate_threshold=0.5, window_size=10, minimum_calls=4)
+
+        for _ in range(6):
+            breaker.record_success()
+        for _ in range(4):
+            breaker.record_failure()
+
+        self.assertEqual(CircuitBreaker.CLOSED, breaker.state)
+        self.assertTrue(breaker.allow_request())
+
+    def test_it_waits_for_the_minimum_number_of_calls(self) -> None:
+        breaker = CircuitBreaker(failure_rate_threshold=0.5, window_size=10, minimum_calls=4)
+
+        for _ in range(3):
+            breaker.record_failure()
+
+        self.assertEqual(CircuitBreaker.CLOSED, breaker.state)
+
+    def test_it_opens_when_the_failure_rate_is_exceeded(self) -> None:
+        breaker = CircuitBreaker(failure_rate_threshold=0.5, window_size=10, minimum_calls=4)
+
+        for _ in range(2):
+            breaker.record_success()
+        for _ in range(2):
+            breaker.record_failure()
+
+        self.assertEqual(CircuitBreaker.OPEN, breaker.state)
+        self.assertFalse(breaker.allow_request())
+
+    def test_it_only_looks_at_the_sliding_window(self) -> None:
+        breaker = CircuitBreaker(failure_rate_threshold=0.5, window_size=4, minimum_calls=4)
+
+        for _ in range(3):
+            breaker.record_success()
+        breaker.record_failure()
+
+        self.assertEqual(CircuitBreaker.CLOSED, breaker.state)
+
+        breaker.record_failure()
+
+        self.assertEqual(CircuitBreaker.OPEN, breaker.state)
+
+    def test_it_closes_after_successful_trial_requests(self) -> None:
+        breaker = CircuitBreaker(minimum_calls=1, open_timeout=30, half_open_max_calls=2)
+        breaker.record_failure()
+
+        self._now[0] += 30
+
+        self.assertEqual(CircuitBreaker.HALF_OPEN, breaker.state)
+        self.assertTrue(breaker.allow_request())
+        self.assertTrue(breaker.allow_request())
+        self.assertFalse(breaker.allow_request())
+
+        breaker.record_success()
+        breaker.record_success()
+
+        self.assertEqual(CircuitBreaker.CLOSED, breaker.state)
+
+    def test_it_reopens_when_a_trial_request_fails(self) -> None:
+        breaker = CircuitBreaker(minimum_calls=1, open_timeout=30)
+        breaker.record_failure()
+        self._now[0] += 30
+        breaker.allow_request()
+
+        breaker.record_failure()
+
+        self.assertEqual(CircuitBreaker.OPEN, breaker.state)
+
+    def test_it_gives_back_the_trial_request_of_an_ignored_outcome(self) -> None:
+        breaker = CircuitBreaker(minimum_calls=1, open_timeout=30)
+        breaker.record_failure()
+        self._now[0] += 30
+        breaker.allow_request()
+
+        breaker.record_ignored()
+
+        self.assertEqual(CircuitBreaker.HALF_OPEN, breaker.state)
+        self.assertTrue(breaker.allow_request())
+
+
+class CircuitBreakerHttpClientTest(unittest.TestCase):
+    _http_client: mock.MagicMock
+
+    def setUp(self) -> None:
+        self._http_client = mock.MagicMock()
+
+    def test_it_fails_fast_while_the_circuit_is_open(self) -> None:
+        self._http_client.request.side_effect = HttpException('Read timed out')
+        client = CircuitBreakerHttpClient(self._http_client, CircuitBreaker(minimum_calls=2))
+
+        for _ in range(2):
+            with self.assertRaises(HttpException):
+                client.request('GET', '/orders/abc/')
+
+        with self.assertRaises(CircuitOpenError):
+            client.request('GET', '/orders/abc/')
+
+        self.assertEqual(2, self._http_client.request.call_count)
+
+    def test_it_counts_server_errors_as_failures(self) -> None:
+        self._http_client.request.return_value = HttpResponse(b'{"error": {"status": 503}}', 503)
+        breaker = CircuitBreaker(minimum_calls=1)
+        client = CircuitBreakerHttpClient(self._http_client, breaker)
+
+        client.request('GET', '/orders/abc/')
+
+        self.assertEqual(CircuitBreaker.OPEN, breaker.state)
+
+    def test_it_counts_server_errors_without_a_body_as_failures(self) -> None:
+        self._http_client.request.return_value = HttpResponse(b'', 502)
+        breaker = CircuitBreaker(minimum_calls=1)
+        client = CircuitBreakerHttpClient(self._http_client, breaker)
+
+        client.request('GET', '/orders/abc/')
+
+        self.assertEqual(CircuitBreaker.OPEN, breaker.state)
+
+    def test_it_does_not_count_client_errors_as_failures(self) -> None:
+        self._http_client.request.return_value = HttpResponse(b'{"error": {"status": 404}}', 404)
+        breaker = CircuitBreaker(minimum_calls=1)
+        client = CircuitBreakerHttpClient(self._http_client, breaker)
+
+        client.request('GET', '/orders/abc/')
+
+        self.assertEqual(CircuitBreaker.CLOSED, breaker.state)
+
+    def test_it_does_not_count_other_exceptions_as_failures(self) -> None:
+        self._http_client.request.side_effect = RateLimitExceeded('Rate limit exceeded')
+        breaker = CircuitBreaker(minimum_calls=1)
+        client = CircuitBreakerHttpClient(self._http_client, breaker)
+
+        for _ in range(3):
+            with self.assertRaises(RateLimitExceeded):
+                client.request('GET', '/orders/abc/')
+
+        self.assertEqual(CircuitBreaker.CLOSED, breaker.state)
+
+    def test_it_passes_the_timeout_on(self) -> None:
+        self._http_client.request.return_value = '{}'
+        client = CircuitBreakerHttpClient(self._http_client)
+
+        client.request('GET', '/orders/abc/', {}, None, timeout=2)
+
+        self._http_client.request.assert_called_once_with('GET', '/orders/abc/', {}, None, timeout=2)
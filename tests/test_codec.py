@@ -0,0 +1,59 @@
+import importlib.util
+import json
+import unittest
+
+from unittest import mock
+
+from ginger_sdk.codec import OrjsonCodec
+from ginger_sdk.codec import StdlibJsonCodec
+from ginger_sdk.codec import default_codec
+from ginger_sdk.http_client import HttpResponse
+
+
+class JsonCodecTest(unittest.TestCase):
+    _order = {
+        'id': 'fcbfdd3a-ea2c-4240-96b2-613d49b79a55',
+        'description': 'Bestelling café',
+        'transactions': [{'id': 'ddc76c84-3fc2-4a16-85b9-a895f6bdc696', 'amount': 995}],
+    }
+
+    def test_it_encodes_and_decodes_with_the_standard_library(self) -> None:
+        stdlib_codec = StdlibJsonCodec()
+
+        self.assertEqual(json.dumps(self._order), stdlib_codec.encode(self._order))
+        self.assertEqual(self._order, stdlib_codec.decode(stdlib_codec.encode(self._order)))
+        self.assertEqual(self._order, stdlib_codec.decode(json.dumps(self._order).encode()))
+
+    @unittest.skipIf(importlib.util.find_spec('orjson') is None, 'orjson is not installed')
+    def test_it_encodes_and_decodes_with_orjson(self) -> None:
+        orjson_codec = OrjsonCodec()
+
+        encoded = orjson_codec.encode(self._order)
+
+        self.assertIsInstance(encoded, bytes)
+        self.assertEqual(self._order, orjson_codec.decode(encoded))
+        self.assertEqual(self._order, orjson_codec.decode(json.dumps(self._order)))
+
+    @unittest.skipIf(importlib.util.find_spec('orjson') is None, 'orjson is not installed')
+    def test_it_decodes_http_responses_with_orjson(self) -> None:
+        response = HttpResponse(json.dumps(self._order).encode(), 200)
+
+        self.assertEqual(self._order, OrjsonCodec().decode(response))
+
+    @unittest.skipIf(importlib.util.find_spec('orjson') is None, 'orjson is not installed')
+    def test_it_raises_json_decode_errors_with_orjson(self) -> None:
+        with self.assertRaises(json.JSONDecodeError):
+            OrjsonCodec().decode(b'definitely not json')
+
+    def test_it_prefers_orjson_when_it_is_installed(self) -> None:
+        with mock.patch.dict('sys.modules', {'orjson': mock.MagicMock()}), \
+                mock.patch('ginger_sdk.codec.importlib.util.find_spec', return_value=mock.MagicMock()):
+            self.assertIsInstance(default_codec(), OrjsonCodec)
+
+        with mock.patch('ginger_sdk.codec.importlib.util.find_spec', return_value=None):
+            self.assertIsInstance(default_codec(), StdlibJsonCodec)
+
+    def test_it_explains_how_to_install_orjson(self) -> None:
+        with mock.patch.dict('sys.modules', {'orjson': None}):
+            with self.assertRaisesRegex(ImportError, 'fast-json'):
+                OrjsonCodec()
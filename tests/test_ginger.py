@@ -1,7 +1,21 @@
 import unittest
 
+from unittest import mock
+
 from ginger_sdk import Ginger
 from ginger_sdk.api_client import ApiClient
+from ginger_sdk.async_api_client import AsyncApiClient
+from ginger_sdk.circuit_breaker import CircuitBreaker
+from ginger_sdk.circuit_breaker import CircuitBreakerHttpClient
+from ginger_sdk.client_pool import ClientPool
+from ginger_sdk.http_client import RequestsHttpClient
+from ginger_sdk.http_client import Urllib3HttpClient
+from ginger_sdk.rate_limit import RateLimitedHttpClient
+from ginger_sdk.rate_limit import RateLimitExceeded
+from ginger_sdk.rate_limit import RateLimiter
+from ginger_sdk.rate_limit import TokenBucket
+from ginger_sdk.retry import RetryingHttpClient
+from ginger_sdk.retry import RetryPolicy
 
 
 class GingerTest(unittest.TestCase):
@@ -10,3 +24,66 @@ class GingerTest(unittest.TestCase):
             Ginger.create_client('https://www.example.com', 'abc123'),
             ApiClient
         )
+
+    def test_it_creates_an_async_client(self) -> None:
+        self.assertIsInstance(
+            Ginger.create_async_client('https://www.example.com', 'abc123'),
+            AsyncApiClient
+        )
+
+    def test_it_creates_a_client_with_a_retry_policy(self) -> None:
+        client = Ginger.create_client('https://www.example.com', 'abc123', retry_policy=RetryPolicy())
+
+        self.assertIsInstance(client._http_client, RetryingHttpClient)
+
+    def test_it_creates_a_client_with_a_rate_limiter(self) -> None:
+        client = Ginger.create_client(
+            'https://www.example.com', 'abc123', rate_limiter=RateLimiter(TokenBucket(rate=10))
+        )
+
+        self.assertIsInstance(client._http_client, RateLimitedHttpClient)
+
+    def test_it_does_not_count_rate_limited_requests_as_circuit_breaker_failures(self) -> None:
+        breaker = CircuitBreaker(minimum_calls=2)
+        client = Ginger.create_client(
+            'https://www.example.com',
+            'abc123',
+            rate_limiter=RateLimiter(TokenBucket(rate=0.001, capacity=1)),
+            circuit_breaker=breaker,
+        )
+
+        self.assertIsInstance(client._http_client, RateLimitedHttpClient)
+        self.assertIsInstance(client._http_client._http_client, CircuitBreakerHttpClient)
+
+        with mock.patch.object(RequestsHttpClient, 'request', return_value='{"id": "abc"}'):
+            client.get_order('abc')
+
+            for _ in range(3):
+                with self.assertRaises(RateLimitExceeded):
+                    client.get_order('abc', timeout=0.01)
+
+        self.assertEqual(CircuitBreaker.CLOSED, breaker.state)
+
+    def test_it_computes_the_user_agent_once(self) -> None:
+        user_agent = Ginger._user_agent()
+
+        self.assertTrue(user_agent.startswith('Ginger-Python/' + Ginger.CLIENT_VERSION))
+        self.assertIs(user_agent, Ginger._user_agent())
+
+    def test_it_creates_a_client_with_the_urllib3_transport(self) -> None:
+        client = Ginger.create_client('https://www.example.com', 'abc123', transport='urllib3')
+
+        self.assertIsInstance(client._http_client, Urllib3HttpClient)
+
+    def test_it_rejects_unknown_transports(self) -> None:
+        with self.assertRaises(ValueError):
+            Ginger.create_client('https://www.example.com', 'abc123', transport='curl')
+
+    def test_it_creates_a_client_pool_without_an_api_key(self) -> None:
+        pool = Ginger.create_client_pool('https://www.example.com', transport='urllib3', max_clients=10)
+        self.addCleanup(pool.close)
+
+        self.assertIsInstance(pool, ClientPool)
+        self.assertIsInstance(pool._http_client, Urllib3HttpClient)
+        self.assertNotIn('authorization', pool._http_client._default_headers)
+        self.assertIsInstance(pool.client('merchant-1', 'abc123'), ApiClient)
@@ -0,0 +1,21 @@
+import unittest
+
+from ginger_sdk.hooks import path_template
+
+
+class PathTemplateTest(unittest.TestCase):
+    def test_it_replaces_ids(self) -> None:
+        self.assertEqual('/orders/{id}/', path_template('/orders/fcbfdd3a-ea2c-4240-96b2-613d49b79a55/'))
+        self.assertEqual(
+            '/orders/{id}/transactions/{id}/captures/',
+            path_template(
+                '/orders/fcbfdd3a-ea2c-4240-96b2-613d49b79a55'
+                '/transactions/ca3dfa6f-3dd3-4942-a358-b6852a407333/captures/'
+            )
+        )
+
+    def test_it_removes_the_query_string(self) -> None:
+        self.assertEqual('/orders/', path_template('/orders/?limit=10&offset=20'))
+
+    def test_it_keeps_static_paths(self) -> None:
+        self.assertEqual('/ideal/issuers/', path_template('/ideal/issuers/'))
@@ -0,0 +1,68 @@
+import unittest
+
+from ginger_sdk.hooks import RequestEvent
+from ginger_sdk.metrics import LatencyHistogram
+from ginger_sdk.metrics import MetricsCollector
+
+
+def event(path: str, total: float, request_bytes: int = 0, response_bytes: int = 0) -> RequestEvent:
+    request_event = RequestEvent('GET', path, request_bytes)
+    request_event.total = total
+    request_event.response_bytes = response_bytes
+    return request_event
+
+
+class LatencyHistogramTest(unittest.TestCase):
+    def test_it_estimates_quantiles(self) -> None:
+        histogram = LatencyHistogram((0.1, 0.5, 1.0))
+
+        for value in [0.05] * 90 + [0.3] * 9 + [2.0]:
+            histogram.observe(value)
+
+        self.assertEqual(100, histogram.count)
+        self.assertEqual(0.1, histogram.quantile(0.5))
+        self.assertEqual(0.5, histogram.quantile(0.99))
+        self.assertEqual(float('inf'), histogram.quantile(1.0))
+
+
+class MetricsCollectorTest(unittest.TestCase):
+    def test_it_collects_metrics_per_endpoint(self) -> None:
+        collector = MetricsCollector()
+
+        collector.after_response(event('/orders/fcbfdd3a-ea2c-4240-96b2-613d49b79a55/', 0.02, response_bytes=100))
+        collector.after_response(event('/orders/ca3dfa6f-3dd3-4942-a358-b6852a407333/', 0.04, response_bytes=50))
+        collector.on_error(event('/orders/ca3dfa6f-3dd3-4942-a358-b6852a407333/', 0.3), Exception('Whoops!'))
+        collector.after_response(event('/ideal/issuers/', 0.01))
+
+        snapshot = collector.snapshot()
+
+        self.assertEqual({('GET', '/orders/{id}/'), ('GET', '/ideal/issuers/')}, set(snapshot))
+        self.assertEqual(3, snapshot[('GET', '/orders/{id}/')]['count'])
+        self.assertEqual(1, snapshot[('GET', '/orders/{id}/')]['errors'])
+        self.assertEqual(150, snapshot[('GET', '/orders/{id}/')]['bytes_received'])
+        self.assertEqual(0, snapshot[('GET', '/ideal/issuers/')]['errors'])
+
+    def test_it_exports_prometheus_metrics(self) -> None:
+        collector = MetricsCollector(buckets=(0.1, 1.0))
+        collector.after_response(event('/ideal/issuers/', 0.05))
+        collector.on_error(event('/ideal/issuers/', 0.5), Exception('Whoops!'))
+
+        exported = collector.to_prometheus()
+
+        labels = 'method="GET",path="/ideal/issuers/"'
+        self.assertIn('ginger_client_request_duration_seconds_bucket{' + labels + ',le="0.1"} 1', exported)
+        self.assertIn('ginger_client_request_duration_seconds_bucket{' + labels + ',le="+Inf"} 2', exported)
+        self.assertIn('ginger_client_request_errors_total{' + labels + '} 1', exported)
+
+    def test_it_counts_compressed_and_uncompressed_bytes(self) -> None:
+        collector = MetricsCollector()
+        request_event = RequestEvent('POST', '/orders/', 1000, 200)
+        request_event.response_bytes = 3000
+        request_event.response_wire_bytes = 600
+        collector.after_response(request_event)
+
+        endpoint = collector.snapshot()[('POST', '/orders/')]
+
+        self.assertEqual((1000, 200), (endpoint['bytes_sent'], endpoint['wire_bytes_sent']))
+        self.assertEqual((3000, 600), (endpoint['bytes_received'], endpoint['wire_bytes_received']))
+
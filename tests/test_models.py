@@ -0,0 +1,83 @@
+import unittest
+
+from ginger_sdk.models import Issuer
+from ginger_sdk.models import Order
+from ginger_sdk.models import Refund
+from ginger_sdk.models import Transaction
+
+
+class ModelTest(unittest.TestCase):
+    _order_data = {
+        'id': 'fcbfdd3a-ea2c-4240-96b2-613d49b79a55',
+        'amount': 995,
+        'currency': 'EUR',
+        'status': 'completed',
+        'extra': {'my-custom-data': 'Foobar'},
+        'some_new_field': 'surprise',
+        'transactions': [
+            {
+                'id': 'ddc76c84-3fc2-4a16-85b9-a895f6bdc696',
+                'amount': 995,
+                'payment_method': 'ideal',
+                'another_new_field': 42,
+            },
+        ],
+    }
+
+    def test_it_exposes_known_fields_as_attributes(self) -> None:
+        order = Order(self._order_data)
+
+        self.assertEqual('fcbfdd3a-ea2c-4240-96b2-613d49b79a55', order.id)
+        self.assertEqual(995, order.amount)
+        self.assertEqual({'my-custom-data': 'Foobar'}, order.extra)
+        self.assertIsNone(order.description)
+
+    def test_it_keeps_unknown_fields(self) -> None:
+        order = Order(self._order_data)
+
+        self.assertEqual({'some_new_field': 'surprise'}, order.unknown_fields)
+        self.assertEqual('surprise', order['some_new_field'])
+
+    def test_it_supports_access_by_key(self) -> None:
+        order = Order(self._order_data)
+
+        self.assertEqual(995, order['amount'])
+        self.assertEqual('EUR', order.get('currency'))
+        self.assertIsNone(order.get('description'))
+        self.assertNotIn('description', order)
+
+        with self.assertRaises(KeyError):
+            order['description']
+
+    def test_it_converts_transactions_lazily(self) -> None:
+        order = Order(self._order_data)
+
+        self.assertIs(self._order_data['transactions'], order._transactions)
+
+        transaction = order.transactions[0]
+
+        self.assertIsInstance(transaction, Transaction)
+        self.assertEqual('ideal', transaction.payment_method)
+        self.assertEqual(42, transaction['another_new_field'])
+        self.assertIs(order.transactions, order.transactions)
+
+    def test_it_returns_the_original_data(self) -> None:
+        order = Order(self._order_data)
+
+        self.assertEqual(self._order_data, order.to_dict())
+
+        order.transactions
+
+        self.assertEqual(self._order_data, order.to_dict())
+
+    def test_it_has_no_instance_dict(self) -> None:
+        for model in [Order({}), Refund({}), Transaction({}), Issuer({})]:
+            self.assertFalse(hasattr(model, '__dict__'))
+
+    def test_it_compares_by_data(self) -> None:
+        self.assertEqual(Order(self._order_data), Order(dict(self._order_data)))
+        self.assertNotEqual(Order(self._order_data), Refund(self._order_data))
+
+    def test_it_raises_attribute_errors_for_unknown_attributes(self) -> None:
+        with self.assertRaises(AttributeError):
+            Issuer({'id': 'INGBNL2A'}).some_new_field
@@ -0,0 +1,78 @@
+import threading
+import unittest
+
+from ginger_sdk.pagination import PageIterator
+
+
+class PageIteratorTest(unittest.TestCase):
+    _items: list
+    _fetches: list
+
+    def setUp(self) -> None:
+        self._items = [{'id': str(i)} for i in range(25)]
+        self._fetches = []
+
+    def _fetch_page(self, offset: int, limit: int) -> list:
+        self._fetches.append((offset, limit))
+        return self._items[offset:offset + limit]
+
+    def test_it_iterates_over_all_pages(self) -> None:
+        iterator = PageIterator(self._fetch_page, page_size=10)
+
+        self.assertEqual(self._items, list(iterator))
+        self.assertEqual([(0, 10), (10, 10), (20, 10), (25, 10)], sorted(self._fetches))
+        self.assertEqual(25, iterator.offset)
+
+    def test_it_continues_after_a_page_shorter_than_asked_for(self) -> None:
+        def fetch_page(offset: int, limit: int) -> list:
+            return self._fetch_page(offset, min(limit, 7))
+
+        iterator = PageIterator(fetch_page, page_size=10, prefetch=False)
+
+        self.assertEqual(self._items, list(iterator))
+        self.assertEqual([0, 7, 14, 21, 25], [offset for offset, _ in self._fetches])
+
+    def test_it_fetches_pages_lazily(self) -> None:
+        iterator = PageIterator(self._fetch_page, page_size=10, prefetch=False)
+
+        next(iterator)
+
+        self.assertEqual([(0, 10)], self._fetches)
+
+    def test_it_prefetches_the_next_page(self) -> None:
+        fetched = threading.Event()
+
+        def fetch_page(offset: int, limit: int) -> list:
+            if offset == 10:
+                fetched.set()
+            return self._fetch_page(offset, limit)
+
+        iterator = PageIterator(fetch_page, page_size=10)
+        next(iterator)
+
+        self.assertTrue(fetched.wait(1))
+
+    def test_it_resumes_from_an_offset(self) -> None:
+        iterator = PageIterator(self._fetch_page, page_size=10, prefetch=False)
+        for _ in range(13):
+            next(iterator)
+
+        resumed = PageIterator(self._fetch_page, page_size=10, offset=iterator.offset)
+
+        self.assertEqual(self._items[13:], list(resumed))
+
+    def test_it_raises_page_errors_when_the_page_is_reached(self) -> None:
+        def fetch_page(offset: int, limit: int) -> list:
+            if offset == 10:
+                raise ValueError('Whoops!')
+            return self._fetch_page(offset, limit)
+
+        iterator = PageIterator(fetch_page, page_size=10)
+
+        for _ in range(10):
+            next(iterator)
+
+        with self.assertRaises(ValueError):
+            next(iterator)
+
+        self.assertEqual(10, iterator.offset)
@@ -0,0 +1,191 @@
+import multiprocessing
+import os
+import tempfile
+import time
+import unittest
+
+from unittest import mock
+
+from ginger_sdk.api_client import HttpRequestError
+from ginger_sdk.http_client import HttpResponse
+from ginger_sdk.rate_limit import FileBucketStore
+from ginger_sdk.rate_limit import RateLimitedHttpClient
+from ginger_sdk.rate_limit import RateLimiter
+from ginger_sdk.rate_limit import RateLimitExceeded
+from ginger_sdk.rate_limit import TokenBucket
+
+
+def _take_tokens(path: str, count: int, results) -> None:
+    bucket = TokenBucket(rate=0.001, capacity=10, store=FileBucketStore(path))
+    results.put(sum(bucket.try_acquire() for _ in range(count)))
+
+
+class TokenBucketTest(unittest.TestCase):
+    _now: list
+
+    def setUp(self) -> None:
+        self._now = [1000.0]
+
+        patcher = mock.patch('ginger_sdk.rate_limit.time.monotonic', side_effect=lambda: self._now[0])
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        patcher = mock.patch('ginger_sdk.rate_limit.time.sleep', side_effect=self._sleep)
+        self._sleep_mock = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _sleep(self, seconds: float) -> None:
+        self._now[0] += seconds
+
+    def test_it_allows_bursts_up_to_the_capacity(self) -> None:
+        bucket = TokenBucket(rate=1, capacity=3)
+
+        self.assertEqual([True, True, True, False], [bucket.try_acquire() for _ in range(4)])
+
+    def test_it_refills_at_the_configured_rate(self) -> None:
+        bucket = TokenBucket(rate=2, capacity=2)
+        bucket.acquire(2)
+
+        self._now[0] += 0.5
+
+        self.assertTrue(bucket.try_acquire())
+        self.assertFalse(bucket.try_acquire())
+
+    def test_it_waits_for_a_token(self) -> None:
+        bucket = TokenBucket(rate=4, capacity=1)
+        bucket.acquire()
+
+        self.assertTrue(bucket.acquire())
+        self._sleep_mock.assert_called_once_with(0.25)
+
+    def test_it_gives_up_when_the_timeout_is_too_short(self) -> None:
+        bucket = TokenBucket(rate=1, capacity=1)
+        bucket.acquire()
+
+        self.assertFalse(bucket.acquire(timeout=0.5))
+        self._sleep_mock.assert_not_called()
+
+    def test_it_slows_down_and_recovers(self) -> None:
+        bucket = TokenBucket(rate=10, capacity=1, recovery=0.1)
+        bucket.slow_down(retry_after=2)
+
+        self.assertFalse(bucket.try_acquire())
+
+        self._now[0] += 1.9
+        self.assertFalse(bucket.try_acquire())
+
+        self.assertTrue(bucket.acquire())
+        self.assertAlmostEqual(1002.0, self._now[0])
+
+        self._now[0] += 10
+        bucket.acquire()
+        bucket.acquire()
+        self.assertAlmostEqual(1012.1, self._now[0])
+
+    def test_it_rejects_a_non_positive_rate(self) -> None:
+        with self.assertRaises(ValueError):
+            TokenBucket(rate=0)
+
+
+class FileBucketStoreTest(unittest.TestCase):
+    def setUp(self) -> None:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self._path = os.path.join(directory.name, 'bucket')
+
+    def test_it_shares_the_bucket_between_instances(self) -> None:
+        first = TokenBucket(rate=0.001, capacity=2, store=FileBucketStore(self._path))
+        second = TokenBucket(rate=0.001, capacity=2, store=FileBucketStore(self._path))
+
+        self.assertTrue(first.try_acquire())
+        self.assertTrue(second.try_acquire())
+        self.assertFalse(first.try_acquire())
+
+    def test_it_shares_the_bucket_between_processes(self) -> None:
+        context = multiprocessing.get_context('fork')
+        results = context.Queue()
+        processes = [context.Process(target=_take_tokens, args=(self._path, 5, results)) for _ in range(4)]
+
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+
+        self.assertEqual(10, sum(results.get() for _ in processes))
+
+
+class RateLimiterTest(unittest.TestCase):
+    def test_it_picks_the_first_matching_rule(self) -> None:
+        default = TokenBucket(rate=1)
+        orders = TokenBucket(rate=1)
+        refunds = TokenBucket(rate=1)
+        limiter = RateLimiter(default) \
+            .limit(orders, 'POST', '/orders/') \
+            .limit(refunds, path='/orders/{id}/refunds/')
+
+        self.assertIs(orders, limiter.bucket_for('POST', '/orders/'))
+        self.assertIs(refunds, limiter.bucket_for('POST', '/orders/1d6e4e5c-6b6a-4a2b-9f0e-56b2c1f5a3d7/refunds/'))
+        self.assertIs(default, limiter.bucket_for('GET', '/orders/'))
+
+    def test_it_has_no_bucket_without_a_default(self) -> None:
+        self.assertIsNone(RateLimiter().bucket_for('GET', '/orders/'))
+
+
+class RateLimitedHttpClientTest(unittest.TestCase):
+    def test_it_takes_a_token_for_each_request(self) -> None:
+        http_client = mock.MagicMock()
+        http_client.request.return_value = b'{}'
+        bucket = TokenBucket(rate=0.001, capacity=1)
+        client = RateLimitedHttpClient(http_client, bucket, blocking=False)
+
+        self.assertEqual(b'{}', client.request('GET', '/orders/'))
+
+        with self.assertRaises(RateLimitExceeded):
+            client.request('GET', '/orders/')
+
+        http_client.request.assert_called_once_with('GET', '/orders/', {}, None)
+
+    def test_it_is_an_http_request_error(self) -> None:
+        self.assertTrue(issubclass(RateLimitExceeded, HttpRequestError))
+
+    def test_it_slows_down_on_too_many_requests(self) -> None:
+        http_client = mock.MagicMock()
+        http_client.request.return_value = HttpResponse(b'{}', 429, {'Retry-After': '3'})
+        bucket = mock.MagicMock()
+        bucket.acquire.return_value = True
+
+        RateLimitedHttpClient(http_client, bucket).request('GET', '/orders/')
+
+        bucket.slow_down.assert_called_once_with(3.0)
+
+    def test_it_slows_down_on_too_many_requests_without_a_body(self) -> None:
+        http_client = mock.MagicMock()
+        http_client.request.return_value = HttpResponse(b'', 429, {'Retry-After': '3'})
+        bucket = mock.MagicMock()
+        bucket.acquire.return_value = True
+
+        RateLimitedHttpClient(http_client, bucket).request('GET', '/orders/')
+
+        bucket.slow_down.assert_called_once_with(3.0)
+
+    def test_it_deducts_the_wait_from_the_timeout(self) -> None:
+        http_client = mock.MagicMock()
+        http_client.request.return_value = None
+        bucket = mock.MagicMock()
+        bucket.acquire.return_value = True
+
+        RateLimitedHttpClient(http_client, bucket).request('GET', '/orders/', timeout=2.0)
+
+        bucket.acquire.assert_called_once_with(blocking=True, timeout=2.0)
+        self.assertLessEqual(http_client.request.call_args[1]['timeout'], 2.0)
+
+    def test_it_paces_requests_in_real_time(self) -> None:
+        http_client = mock.MagicMock()
+        http_client.request.return_value = None
+        client = RateLimitedHttpClient(http_client, TokenBucket(rate=50, capacity=1))
+
+        start = time.monotonic()
+        for _ in range(5):
+            client.request('GET', '/orders/')
+
+        self.assertGreaterEqual(time.monotonic() - start, 0.07)
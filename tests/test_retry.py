@@ -0,0 +1,164 @@
+import json
+import unittest
+
+from unittest import mock
+
+from ginger_sdk.circuit_breaker import CircuitOpenError
+from ginger_sdk.http_client import HttpException
+from ginger_sdk.http_client import HttpResponse
+from ginger_sdk.http_client import HttpStream
+from ginger_sdk.retry import RetryBudget
+from ginger_sdk.retry import RetryingHttpClient
+from ginger_sdk.retry import RetryPolicy
+
+
+class RetryingHttpClientTest(unittest.TestCase):
+    _http_client: mock.MagicMock
+    _sleep_mock: mock.MagicMock
+
+    def setUp(self) -> None:
+        self._http_client = mock.MagicMock()
+
+        patcher = mock.patch('ginger_sdk.retry.time.sleep')
+        self._sleep_mock = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_it_retries_on_http_client_errors(self) -> None:
+        self._http_client.request.side_effect = [HttpException('Connection refused'), '{"id": "abc"}']
+        client = RetryingHttpClient(self._http_client, RetryPolicy(max_attempts=3))
+
+        response = client.request('GET', '/orders/abc/')
+
+        self.assertEqual('{"id": "abc"}', response)
+        self.assertEqual(2, self._http_client.request.call_count)
+        self.assertEqual(1, self._sleep_mock.call_count)
+
+    def test_it_gives_up_after_max_attempts(self) -> None:
+        self._http_client.request.side_effect = HttpException('Connection refused')
+        client = RetryingHttpClient(self._http_client, RetryPolicy(max_attempts=3))
+
+        with self.assertRaises(HttpException):
+            client.request('GET', '/orders/abc/')
+
+        self.assertEqual(3, self._http_client.request.call_count)
+
+    def test_it_retries_on_retryable_statuses(self) -> None:
+        self._http_client.request.side_effect = [
+            HttpResponse(b'{"error": {"status": 503}}', 503),
+            HttpResponse(b'{"id": "abc"}', 200),
+        ]
+        client = RetryingHttpClient(self._http_client, RetryPolicy(max_attempts=3))
+
+        self.assertEqual(b'{"id": "abc"}', client.request('GET', '/orders/abc/'))
+
+    def test_it_retries_on_retryable_statuses_without_a_body(self) -> None:
+        self._http_client.request.side_effect = [
+            HttpResponse(b'', 503),
+            HttpResponse(b'', 429, {'Retry-After': '2'}),
+            HttpResponse(b'{"id": "abc"}', 200),
+        ]
+        client = RetryingHttpClient(self._http_client, RetryPolicy(max_attempts=3))
+
+        self.assertEqual(b'{"id": "abc"}', client.request('GET', '/orders/abc/'))
+        self.assertEqual(3, self._http_client.request.call_count)
+        self.assertEqual(2.0, self._sleep_mock.call_args_list[1][0][0])
+
+    def test_it_retries_streamed_requests_until_the_headers_arrive(self) -> None:
+        close = mock.MagicMock()
+        unavailable = HttpStream([b'{"error": {"status": 503}}'], 503, close=close)
+        available = HttpStream([b'[]'], 200)
+        self._http_client.stream.side_effect = [unavailable, available]
+        client = RetryingHttpClient(self._http_client, RetryPolicy(max_attempts=3))
+
+        self.assertIs(available, client.stream('GET', '/orders/'))
+        close.assert_called_once_with()
+        self._http_client.request.assert_not_called()
+
+    def test_it_retries_on_api_errors_from_custom_http_clients(self) -> None:
+        self._http_client.request.side_effect = [
+            json.dumps({'error': {'status': '429', 'type': 'TooManyRequests', 'value': 'Slow down'}}),
+            '{"id": "abc"}',
+        ]
+        client = RetryingHttpClient(self._http_client, RetryPolicy(max_attempts=3))
+
+        self.assertEqual('{"id": "abc"}', client.request('GET', '/orders/abc/'))
+
+    def test_it_does_not_retry_client_errors(self) -> None:
+        self._http_client.request.return_value = HttpResponse(b'{"error": {"status": 400}}', 400)
+        client = RetryingHttpClient(self._http_client, RetryPolicy(max_attempts=3))
+
+        client.request('GET', '/orders/abc/')
+
+        self.assertEqual(1, self._http_client.request.call_count)
+
+    def test_it_honours_retry_after(self) -> None:
+        self._http_client.request.side_effect = [
+            HttpResponse(b'{"error": {"status": 429}}', 429, {'Retry-After': '2'}),
+            HttpResponse(b'{"id": "abc"}', 200),
+        ]
+        client = RetryingHttpClient(self._http_client, RetryPolicy(max_attempts=3, backoff_max=10))
+
+        client.request('GET', '/orders/abc/')
+
+        self._sleep_mock.assert_called_once_with(2.0)
+
+    def test_it_backs_off_exponentially_with_jitter(self) -> None:
+        policy = RetryPolicy(backoff_base=0.5, backoff_max=3)
+
+        for retry, limit in [(1, 0.5), (2, 1.0), (3, 2.0), (4, 3.0), (10, 3.0)]:
+            backoff = policy.backoff(retry)
+            self.assertGreaterEqual(backoff, 0)
+            self.assertLessEqual(backoff, limit)
+
+    def test_it_stops_retrying_when_the_budget_is_spent(self) -> None:
+        self._http_client.request.side_effect = HttpException('Connection refused')
+        client = RetryingHttpClient(
+            self._http_client,
+            RetryPolicy(max_attempts=5, budget=RetryBudget(ratio=0, max_tokens=2))
+        )
+
+        with self.assertRaises(HttpException):
+            client.request('GET', '/orders/abc/')
+
+        self.assertEqual(3, self._http_client.request.call_count)
+
+    def test_it_sends_the_same_idempotency_key_with_every_post_attempt(self) -> None:
+        self._http_client.request.side_effect = [HttpException('Read timed out'), '{"id": "abc"}']
+        client = RetryingHttpClient(self._http_client, RetryPolicy(max_attempts=3))
+
+        client.request('POST', '/orders/', {'Content-Type': 'application/json'}, '{}')
+
+        first_headers = self._http_client.request.call_args_list[0][0][2]
+        second_headers = self._http_client.request.call_args_list[1][0][2]
+        self.assertIn('Idempotency-Key', first_headers)
+        self.assertEqual(first_headers, second_headers)
+
+    def test_it_does_not_add_idempotency_keys_to_get_requests(self) -> None:
+        self._http_client.request.return_value = '{"id": "abc"}'
+        client = RetryingHttpClient(self._http_client, RetryPolicy())
+
+        client.request('GET', '/orders/abc/', {})
+
+        self._http_client.request.assert_called_once_with('GET', '/orders/abc/', {}, None)
+
+    def test_it_does_not_retry_beyond_the_deadline(self) -> None:
+        self._http_client.request.side_effect = [
+            HttpResponse(b'{"error": {"status": 503}}', 503, {'Retry-After': '5'}),
+            HttpResponse(b'{"id": "abc"}', 200),
+        ]
+        client = RetryingHttpClient(self._http_client, RetryPolicy(max_attempts=3))
+
+        response = client.request('GET', '/orders/abc/', {}, None, timeout=2)
+
+        self.assertEqual(503, response.status_code)
+        self.assertEqual(1, self._http_client.request.call_count)
+        self.assertLessEqual(self._http_client.request.call_args[1]['timeout'], 2)
+
+    def test_it_does_not_retry_when_the_circuit_is_open(self) -> None:
+        self._http_client.request.side_effect = CircuitOpenError('Circuit breaker is open')
+        client = RetryingHttpClient(self._http_client, RetryPolicy(max_attempts=3))
+
+        with self.assertRaises(CircuitOpenError):
+            client.request('GET', '/orders/abc/')
+
+        self.assertEqual(1, self._http_client.request.call_count)
@@ -0,0 +1,145 @@
+import asyncio
+import threading
+import unittest
+
+from ginger_sdk.single_flight import AsyncSingleFlight
+from ginger_sdk.single_flight import SingleFlight
+
+
+class SingleFlightTest(unittest.TestCase):
+    def test_it_shares_a_call_in_progress(self) -> None:
+        single_flight = SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+        results = []
+
+        def call():
+            calls.append(1)
+            started.set()
+            release.wait(1)
+            return 'result'
+
+        leader = threading.Thread(target=lambda: results.append(single_flight.do('key', call)))
+        leader.start()
+        started.wait(1)
+        followers = [
+            threading.Thread(target=lambda: results.append(single_flight.do('key', call))) for _ in range(3)
+        ]
+        for follower in followers:
+            follower.start()
+        release.set()
+        for thread in [leader] + followers:
+            thread.join()
+
+        self.assertEqual(1, len(calls))
+        self.assertEqual(['result'] * 4, results)
+        self.assertEqual(0, len(single_flight))
+
+    def test_it_forgets_failed_calls(self) -> None:
+        single_flight = SingleFlight()
+
+        def call():
+            raise ValueError('failed')
+
+        with self.assertRaises(ValueError):
+            single_flight.do('key', call)
+
+        self.assertNotIn('key', single_flight)
+        self.assertEqual('again', single_flight.do('key', lambda: 'again'))
+
+    def test_it_times_out_waiting(self) -> None:
+        single_flight = SingleFlight()
+        release = threading.Event()
+        leader = threading.Thread(target=lambda: single_flight.do('key', lambda: release.wait(1)))
+        leader.start()
+
+        while 'key' not in single_flight:
+            pass
+
+        with self.assertRaises(TimeoutError):
+            single_flight.do('key', lambda: None, timeout=0.01)
+
+        release.set()
+        leader.join()
+
+
+class AsyncSingleFlightTest(unittest.TestCase):
+    def _run(self, coroutine):
+        loop = asyncio.new_event_loop()
+        self.addCleanup(loop.close)
+
+        return loop.run_until_complete(coroutine)
+
+    def test_it_shares_a_call_in_progress(self) -> None:
+        single_flight = AsyncSingleFlight()
+        calls = []
+
+        async def call():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return 'result'
+
+        async def main():
+            return await asyncio.gather(*(single_flight.do('key', call) for _ in range(5)))
+
+        self.assertEqual(['result'] * 5, self._run(main()))
+        self.assertEqual(1, len(calls))
+        self.assertEqual(0, len(single_flight))
+
+    def test_it_shares_exceptions(self) -> None:
+        single_flight = AsyncSingleFlight()
+
+        async def call():
+            await asyncio.sleep(0.01)
+            raise ValueError('failed')
+
+        async def main():
+            return await asyncio.gather(*(single_flight.do('key', call) for _ in range(3)), return_exceptions=True)
+
+        results = self._run(main())
+
+        self.assertEqual(3, len(results))
+        self.assertTrue(all(isinstance(result, ValueError) for result in results))
+
+    def test_it_keeps_the_call_going_when_a_waiter_is_cancelled(self) -> None:
+        single_flight = AsyncSingleFlight()
+
+        async def call():
+            await asyncio.sleep(0.02)
+            return 'result'
+
+        async def main():
+            leader = asyncio.ensure_future(single_flight.do('key', call))
+            await asyncio.sleep(0)
+            follower = asyncio.ensure_future(single_flight.do('key', call))
+            await asyncio.sleep(0)
+            follower.cancel()
+            return await leader
+
+        self.assertEqual('result', self._run(main()))
+
+    def test_it_keeps_the_call_going_when_the_first_caller_is_cancelled(self) -> None:
+        single_flight = AsyncSingleFlight()
+        calls = []
+
+        async def call():
+            calls.append(1)
+            await asyncio.sleep(0.02)
+            return 'result'
+
+        async def main():
+            leader = asyncio.ensure_future(single_flight.do('key', call))
+            await asyncio.sleep(0)
+            waiter = asyncio.ensure_future(single_flight.do('key', call))
+            await asyncio.sleep(0)
+            leader.cancel()
+
+            result = await waiter
+            await asyncio.sleep(0)
+
+            return leader.cancelled(), waiter.cancelled(), result
+
+        self.assertEqual((True, False, 'result'), self._run(main()))
+        self.assertEqual(1, len(calls))
+        self.assertEqual(0, len(single_flight))
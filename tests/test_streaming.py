@@ -0,0 +1,63 @@
+import json
+import unittest
+
+from ginger_sdk.streaming import JsonItemParser
+from ginger_sdk.streaming import iter_json_items
+
+
+def _chunked(document: bytes, size: int) -> list:
+    return [document[i:i + size] for i in range(0, len(document), size)]
+
+
+class JsonItemParserTest(unittest.TestCase):
+    def test_it_yields_the_elements_of_an_array(self) -> None:
+        items = [{'id': 'abc', 'amount': 995}, 'café ☃', -1.5e10, 12345, True, None, [], {}]
+        document = json.dumps(items, ensure_ascii=False).encode('utf-8')
+
+        for size in range(1, len(document) + 1):
+            with self.subTest(chunk_size=size):
+                parser = JsonItemParser(_chunked(document, size))
+                self.assertEqual(items, list(parser))
+                self.assertTrue(parser.is_array)
+
+    def test_it_yields_other_documents_as_a_single_item(self) -> None:
+        parser = JsonItemParser([b'{"error": ', b'{"status": 400}}'])
+
+        self.assertEqual([{'error': {'status': 400}}], list(parser))
+        self.assertFalse(parser.is_array)
+
+    def test_it_accepts_text_chunks(self) -> None:
+        self.assertEqual([1, 2], list(iter_json_items(['[1', ', 2]'])))
+
+    def test_it_yields_nothing_for_an_empty_document(self) -> None:
+        parser = JsonItemParser([b'', b'  '])
+
+        self.assertEqual([], list(parser))
+        self.assertIsNone(parser.is_array)
+
+    def test_it_yields_items_before_the_document_is_read(self) -> None:
+        read = []
+
+        def chunks():
+            for chunk in [b'[{"id": 1},', b' {"id": 2},', b' {"id": 3}]']:
+                read.append(chunk)
+                yield chunk
+
+        parser = JsonItemParser(chunks())
+
+        self.assertEqual({'id': 1}, next(parser))
+        self.assertEqual(1, len(read))
+
+    def test_it_only_keeps_the_current_item_in_memory(self) -> None:
+        parser = JsonItemParser(_chunked(json.dumps([{'id': i, 'status': 'new'} for i in range(10000)]).encode(), 1024))
+
+        for item in parser:
+            self.assertLess(len(parser._buffer), 2048)
+
+        self.assertEqual(9999, item['id'])
+
+    def test_it_rejects_invalid_documents(self) -> None:
+        for document in [b'[1,]', b'[1 2]', b'[1', b'[1]x', b'[,1]', b'{"a": 1', b'[{"a": 1}']:
+            with self.subTest(document=document):
+                with self.assertRaises(json.JSONDecodeError):
+                    list(JsonItemParser(_chunked(document, 2)))
@@ -0,0 +1,176 @@
+import asyncio
+import json
+import time
+import unittest
+
+from unittest import mock
+
+from ginger_sdk.api_client import ApiClient
+from ginger_sdk.api_client import HttpRequestError
+from ginger_sdk.watcher import OrderWatcher
+from ginger_sdk.watcher import StatusChange
+
+
+class OrderWatcherTest(unittest.TestCase):
+    _now: list
+    _statuses: dict
+
+    def setUp(self) -> None:
+        self._now = [1000.0]
+
+        patcher = mock.patch('ginger_sdk.watcher.time.monotonic', side_effect=lambda: self._now[0])
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self._statuses = {}
+        self._http_client = mock.MagicMock()
+        self._http_client.request.side_effect = self._respond
+        self._api_client = ApiClient(self._http_client)
+
+    def _respond(self, method, path, *_):
+        order_id = path.split('/')[2]
+        status = self._statuses[order_id]
+        if isinstance(status, Exception):
+            raise status
+        if status is None:
+            return None
+        return json.dumps({'id': order_id, 'status': status})
+
+    def test_it_reports_status_changes_until_a_terminal_status(self) -> None:
+        changes = []
+        watcher = OrderWatcher(self._api_client, on_change=changes.append)
+        self._statuses = {'a': 'new', 'b': 'new'}
+        watcher.watch('a', 'new')
+        watcher.watch('b')
+
+        self.assertEqual([('b', None, 'new')], [change[:3] for change in watcher.poll_due()])
+
+        self._now[0] += 2
+        self._statuses = {'a': 'processing', 'b': 'completed'}
+        watcher.poll_due()
+
+        self.assertEqual(
+            [('a', 'new', 'processing'), ('b', None, 'new'), ('b', 'new', 'completed')],
+            sorted([change[:3] for change in changes], key=lambda change: (change[0], change[1] or ''))
+        )
+        self.assertIn('a', watcher)
+        self.assertNotIn('b', watcher)
+        self.assertIsInstance(changes[0], StatusChange)
+
+    def test_it_backs_off_while_the_status_does_not_change(self) -> None:
+        watcher = OrderWatcher(self._api_client, min_interval=1, max_interval=3, backoff=2)
+        self._statuses = {'a': 'new'}
+        watcher.watch('a', 'new')
+
+        delays = []
+        for _ in range(4):
+            watcher.poll_due()
+            delays.append(watcher.next_poll_in())
+            self._now[0] += delays[-1]
+
+        self.assertEqual([2, 3, 3, 3], delays)
+
+        self._statuses = {'a': 'processing'}
+        watcher.poll_due()
+
+        self.assertEqual(1, watcher.next_poll_in())
+
+    def test_it_only_polls_due_orders(self) -> None:
+        watcher = OrderWatcher(self._api_client)
+        self._statuses = {'a': 'new', 'b': 'new'}
+        watcher.watch('a', 'new')
+        watcher.watch('b', 'new', delay=5)
+
+        watcher.poll_due()
+        watcher.poll_due()
+
+        self._http_client.request.assert_called_once_with('GET', '/orders/a/', {}, None)
+
+    def test_it_reports_errors_and_polls_again(self) -> None:
+        errors = []
+        watcher = OrderWatcher(self._api_client, on_error=lambda id, error: errors.append(id))
+        self._statuses = {'a': HttpRequestError('timeout')}
+        watcher.watch('a')
+
+        watcher.poll_due()
+
+        self.assertEqual(['a'], errors)
+        self.assertEqual(1.5, watcher.next_poll_in())
+
+    def test_it_handles_an_empty_response_as_an_error(self) -> None:
+        errors = []
+        watcher = OrderWatcher(self._api_client, on_error=lambda id, error: errors.append((id, error)))
+        self._statuses = {'a': None}
+        watcher.watch('a', 'new')
+
+        self.assertEqual([], watcher.poll_due())
+
+        self.assertEqual('a', errors[0][0])
+        self.assertIsInstance(errors[0][1], HttpRequestError)
+        self.assertIn('a', watcher)
+        self.assertEqual(1.5, watcher.next_poll_in())
+
+    def test_it_stops_polling_unwatched_orders(self) -> None:
+        watcher = OrderWatcher(self._api_client)
+        watcher.watch('a')
+        watcher.unwatch('a')
+
+        self.assertEqual([], watcher.poll_due())
+        self.assertIsNone(watcher.next_poll_in())
+        self._http_client.request.assert_not_called()
+
+    def test_it_ignores_failing_callbacks(self) -> None:
+        watcher = OrderWatcher(self._api_client, on_change=mock.MagicMock(side_effect=RuntimeError))
+        self._statuses = {'a': 'completed'}
+        watcher.watch('a')
+
+        self.assertEqual(1, len(watcher.poll_due()))
+        self.assertEqual(0, len(watcher))
+
+
+class OrderWatcherRunTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self._polls = {'a': iter(['new', 'processing', 'completed']), 'b': iter(['cancelled'])}
+        http_client = mock.MagicMock()
+        http_client.request.side_effect = lambda method, path, *_: json.dumps(
+            {'id': path.split('/')[2], 'status': next(self._polls[path.split('/')[2]])}
+        )
+        self._api_client = ApiClient(http_client)
+
+    def test_it_runs_until_no_orders_are_left(self) -> None:
+        changes = []
+        watcher = OrderWatcher(self._api_client, on_change=changes.append, min_interval=0.01)
+        watcher.watch('a')
+        watcher.watch('b')
+
+        watcher.run()
+
+        self.assertEqual(4, len(changes))
+        self.assertEqual(0, len(watcher))
+
+    def test_it_runs_in_the_background(self) -> None:
+        changes = []
+        watcher = OrderWatcher(self._api_client, on_change=changes.append, min_interval=0.01)
+        watcher.start()
+        watcher.watch('b')
+
+        for _ in range(100):
+            if changes:
+                break
+            time.sleep(0.01)
+
+        watcher.stop()
+
+        self.assertEqual(['cancelled'], [change.status for change in changes])
+
+    def test_it_iterates_over_changes_asynchronously(self) -> None:
+        watcher = OrderWatcher(self._api_client, min_interval=0.01)
+        watcher.watch('a', 'new')
+
+        async def collect():
+            return [change.status async for change in watcher.changes()]
+
+        loop = asyncio.new_event_loop()
+        self.addCleanup(loop.close)
+
+        self.assertEqual(['processing', 'completed'], loop.run_until_complete(collect()))
@@ -0,0 +1,135 @@
+import hashlib
+import hmac
+import threading
+import unittest
+
+from unittest import mock
+
+from ginger_sdk.api_client import HttpRequestError
+from ginger_sdk.webhooks import Notification
+from ginger_sdk.webhooks import WebhookError
+from ginger_sdk.webhooks import WebhookHandler
+from ginger_sdk.webhooks import parse_notification
+from ginger_sdk.webhooks import verify_signature
+
+BODY = b'{"event": "status_changed", "order_id": "abc123", "project_id": "p1"}'
+
+
+def sign(body: bytes, secret: bytes = b'secret') -> str:
+    return hmac.new(secret, body, hashlib.sha256).hexdigest()
+
+
+class WebhooksTest(unittest.TestCase):
+    def test_it_verifies_signatures(self) -> None:
+        self.assertTrue(verify_signature(BODY, sign(BODY), 'secret'))
+        self.assertTrue(verify_signature(BODY.decode(), 'sha256=' + sign(BODY).upper(), b'secret'))
+        self.assertFalse(verify_signature(BODY, sign(BODY, b'other'), 'secret'))
+        self.assertFalse(verify_signature(BODY + b' ', sign(BODY), 'secret'))
+
+    def test_it_rejects_non_ascii_signatures(self) -> None:
+        for signature in ['é', 'sha256=' + sign(BODY)[:-1] + 'é', '\ud800']:
+            with self.subTest(signature=signature):
+                self.assertFalse(verify_signature(BODY, signature, 'secret'))
+
+    def test_it_parses_notifications(self) -> None:
+        self.assertEqual(Notification('status_changed', 'abc123', 'p1'), parse_notification(BODY))
+
+    def test_it_rejects_invalid_notifications(self) -> None:
+        for body in [b'not json', b'[]', b'{"event": "status_changed"}', b'{"order_id": 12}']:
+            with self.subTest(body=body), self.assertRaises(WebhookError):
+                parse_notification(body)
+
+
+class WebhookHandlerTest(unittest.TestCase):
+    _now: list
+
+    def setUp(self) -> None:
+        self._now = [1000.0]
+
+        patcher = mock.patch('ginger_sdk.webhooks.time.monotonic', side_effect=lambda: self._now[0])
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self._api_client = mock.MagicMock()
+        self._api_client.get_order.side_effect = lambda id: {'id': id, 'status': 'completed'}
+
+    def test_it_fetches_the_order(self) -> None:
+        event = WebhookHandler(self._api_client).handle(BODY)
+
+        self.assertEqual('abc123', event.notification.order_id)
+        self.assertEqual({'id': 'abc123', 'status': 'completed'}, event.order)
+        self.assertFalse(event.duplicate)
+
+    def test_it_reuses_the_order_within_the_window(self) -> None:
+        handler = WebhookHandler(self._api_client, window=5)
+
+        self.assertFalse(handler.handle(BODY).duplicate)
+        self._now[0] += 4
+        self.assertTrue(handler.handle(BODY).duplicate)
+        self._now[0] += 2
+        self.assertFalse(handler.handle(BODY).duplicate)
+
+        self.assertEqual(2, self._api_client.get_order.call_count)
+        self.assertEqual({'received': 3, 'duplicates': 1, 'fetches': 2}, handler.stats)
+
+    def test_it_coalesces_concurrent_notifications(self) -> None:
+        started = threading.Event()
+        release = threading.Event()
+
+        def get_order(id):
+            started.set()
+            release.wait(1)
+            return {'id': id}
+
+        self._api_client.get_order.side_effect = get_order
+        handler = WebhookHandler(self._api_client)
+        events = []
+
+        first = threading.Thread(target=lambda: events.append(handler.handle(BODY)))
+        first.start()
+        started.wait(1)
+        second = threading.Thread(target=lambda: events.append(handler.handle(BODY)))
+        second.start()
+        release.set()
+        first.join()
+        second.join()
+
+        self.assertEqual(1, self._api_client.get_order.call_count)
+        self.assertEqual([False, True], sorted(event.duplicate for event in events))
+
+    def test_it_refetches_after_a_failure(self) -> None:
+        self._api_client.get_order.side_effect = [HttpRequestError('timeout'), {'id': 'abc123'}]
+        handler = WebhookHandler(self._api_client)
+
+        with self.assertRaises(HttpRequestError):
+            handler.handle(BODY)
+
+        self.assertEqual({'id': 'abc123'}, handler.handle(BODY).order)
+
+    def test_it_remembers_a_bounded_number_of_orders(self) -> None:
+        handler = WebhookHandler(self._api_client, max_orders=2)
+
+        for order_id in ['a', 'b', 'c', 'a']:
+            handler.handle('{"order_id": "%s"}' % order_id)
+
+        self.assertEqual(4, self._api_client.get_order.call_count)
+
+    def test_it_forgets_orders(self) -> None:
+        handler = WebhookHandler(self._api_client)
+        handler.handle(BODY)
+        handler.forget('abc123')
+
+        self.assertFalse(handler.handle(BODY).duplicate)
+
+    def test_it_rejects_unsigned_notifications_when_it_has_a_secret(self) -> None:
+        handler = WebhookHandler(self._api_client, secret='secret')
+
+        with self.assertRaises(WebhookError):
+            handler.handle(BODY)
+        with self.assertRaises(WebhookError):
+            handler.handle(BODY, sign(BODY, b'other'))
+        with self.assertRaises(WebhookError):
+            handler.handle(BODY, 'é')
+
+        self.assertEqual('abc123', handler.handle(BODY, sign(BODY)).notification.order_id)
+        self._api_client.get_order.assert_called_once_with('abc123')